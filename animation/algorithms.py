@@ -0,0 +1,924 @@
+import heapq
+from collections import Counter
+import random
+from animation.registry import register
+from animation.trace import NO_INDEX
+
+PIVOT_STRATEGIES = ["last", "median_of_three", "ninther", "random"]
+PARTITION_SCHEMES = ["lomuto", "hoare", "three_way"]
+# the average number of values bucket sort puts in a bucket.
+BUCKET_SORT_LOAD = 4
+# buckets of this size or smaller are sorted with insertion sort by bucket sort.
+BUCKET_SORT_INSERTION_THRESHOLD = 16
+# the digit widths in bits radix sort supports.
+RADIX_BITS = [8, 11, 16]
+# ranges of this size or smaller are finished with insertion sort by msd radix sort.
+RADIX_SORT_INSERTION_THRESHOLD = 16
+# the number of runs external merge sort splits the array into when its memory is not provided.
+EXTERNAL_MERGE_RUNS = 16
+# the number of runs external merge sort merges at once.
+EXTERNAL_MERGE_FAN_IN = 4
+# the smallest memory, in values, external merge sort works with.
+EXTERNAL_MERGE_MIN_MEMORY = 8
+
+
+@register("Quick Sort", stable=False, in_place=True, complexity="O(n log n), worst O(n^2)")
+def quick_sort(arr, left=0, right=None, pivot_strategy="median_of_three", scheme="hoare", rng=None):
+    """
+    This function sorts the array by using the 'quick sort' algorithm.
+    It recurses into the smaller side of every partition and loops on the larger one, so the recursion depth stays
+    O(log n) whatever the pivots are.
+    :param arr: TracedArray.
+    :param left: int.
+    :param right: int.
+    :param pivot_strategy: str, one of PIVOT_STRATEGIES.
+    :param scheme: str, the partitioning scheme, one of PARTITION_SCHEMES.
+    :param rng: random.Random, used by the 'random' pivot strategy.
+    :return: None.
+    """
+    if pivot_strategy not in PIVOT_STRATEGIES:
+        raise Exception(f"Unknown pivot strategy: {pivot_strategy}")
+    if scheme not in PARTITION_SCHEMES:
+        raise Exception(f"Unknown partition scheme: {scheme}")
+    if right is None:
+        right = len(arr) - 1
+    if rng is None:
+        # a fixed seed keeps the trace of a given input reproducible.
+        rng = random.Random(0)
+    while left < right:
+        pivot = choose_pivot(arr, left, right, pivot_strategy, rng)
+        if scheme == "lomuto":
+            if pivot != right:
+                arr.swap(pivot, right)
+            pivot = partition(arr, left, right)
+            left_end, right_start = pivot - 1, pivot + 1
+        else:
+            if pivot != left:
+                arr.swap(pivot, left)
+            if scheme == "hoare":
+                pivot = hoare_partition(arr, left, right)
+                left_end, right_start = pivot - 1, pivot + 1
+            else:
+                equal_start, equal_end = three_way_partition(arr, left, right)
+                left_end, right_start = equal_start - 1, equal_end + 1
+        arr.enter()
+        if left_end - left < right - right_start:
+            quick_sort(arr, left, left_end, pivot_strategy, scheme, rng)
+            left = right_start
+        else:
+            quick_sort(arr, right_start, right, pivot_strategy, scheme, rng)
+            right = left_end
+        arr.leave()
+
+
+@register("3-Way Quick Sort", stable=False, in_place=True, complexity="O(n log n), O(n) with few unique values")
+def three_way_quick_sort(arr):
+    """
+    This function sorts the array by using the 'quick sort' algorithm with a ninther pivot and three-way
+    (dutch national flag) partitioning, so the values equal to the pivot are never looked at again.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    quick_sort(arr, pivot_strategy="ninther", scheme="three_way")
+
+
+@register("Random Pivot Quick Sort", stable=False, in_place=True, complexity="O(n log n) expected",
+          show_button=False)
+def random_quick_sort(arr):
+    """
+    This function sorts the array by using the 'quick sort' algorithm with a random pivot and hoare partitioning.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    quick_sort(arr, pivot_strategy="random", scheme="hoare")
+
+
+@register("Lomuto Quick Sort", stable=False, in_place=True, complexity="O(n log n), O(n^2) on sorted input",
+          show_button=False)
+def lomuto_quick_sort(arr):
+    """
+    This function sorts the array by using the 'quick sort' algorithm with the last value as the pivot and lomuto
+    partitioning, the classic version that is quadratic on sorted input.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    quick_sort(arr, pivot_strategy="last", scheme="lomuto")
+
+
+def median_of_three(arr, a, b, c):
+    """
+    return the index of the median of the values at three indices.
+    :param arr: TracedArray.
+    :param a: int.
+    :param b: int.
+    :param c: int.
+    :return: int.
+    """
+    if arr.less(a, b):
+        if arr.less(b, c):
+            return b
+        return c if arr.less(a, c) else a
+    if arr.less(a, c):
+        return a
+    return c if arr.less(b, c) else b
+
+
+def sort_two(arr, i, j):
+    """
+    swap the values at two indices if they are out of order.
+    :param arr: TracedArray.
+    :param i: int.
+    :param j: int.
+    :return: None.
+    """
+    if arr.less(j, i):
+        arr.swap(i, j)
+
+
+def sort_three(arr, i, j, k):
+    """
+    sort the values at three indices.
+    :param arr: TracedArray.
+    :param i: int.
+    :param j: int.
+    :param k: int.
+    :return: None.
+    """
+    sort_two(arr, i, j)
+    sort_two(arr, j, k)
+    sort_two(arr, i, j)
+
+
+def choose_pivot(arr, left, right, pivot_strategy, rng):
+    """
+    This is a helper function of quick sort that chooses the index of the pivot of the range.
+    :param arr: TracedArray.
+    :param left: int.
+    :param right: int.
+    :param pivot_strategy: str, one of PIVOT_STRATEGIES.
+    :param rng: random.Random.
+    :return: int.
+    """
+    if pivot_strategy == "last":
+        return right
+    if pivot_strategy == "random":
+        return rng.randint(left, right)
+    middle = (left + right) // 2
+    size = right - left + 1
+    if pivot_strategy == "median_of_three" or size < 9:
+        # the three samples are put in order, otherwise the partitions of a reversed range are left in an order
+        # where the median of three is always one of the smallest values.
+        sort_three(arr, left, middle, right)
+        return middle
+    # the ninther: the median of the medians of three evenly spread triples.
+    step = size // 8
+    return median_of_three(arr, median_of_three(arr, left, left + step, left + 2 * step),
+                           median_of_three(arr, middle - step, middle, middle + step),
+                           median_of_three(arr, right - 2 * step, right - step, right))
+
+
+def partition(arr, left, right):
+    """
+    This is a helper function of quick sort that chooses a partition that all values to the left are smaller
+    than it and all values to the right are larger than it.
+    :param arr: TracedArray.
+    :param left: int.
+    :param right: int.
+    :return: int, the final index of the pivot.
+    """
+    i = left - 1
+    for j in range(left, right):
+        if arr.less(j, right):
+            i += 1
+            arr.swap(i, j)
+    i += 1
+    arr.swap(i, right)
+    return i
+
+
+def hoare_partition(arr, left, right):
+    """
+    This is a helper function of quick sort that partitions the range around the pivot at its first index with two
+    indices that move towards each other. Both stop on values equal to the pivot, so many equal values still split
+    the range in the middle.
+    :param arr: TracedArray.
+    :param left: int.
+    :param right: int.
+    :return: int, the final index of the pivot.
+    """
+    i = left
+    j = right + 1
+    while True:
+        i += 1
+        while i < right and arr.less(i, left):
+            i += 1
+        j -= 1
+        while arr.less(left, j):
+            j -= 1
+        if i >= j:
+            break
+        arr.swap(i, j)
+    arr.swap(left, j)
+    return j
+
+
+def three_way_partition(arr, left, right):
+    """
+    This is a helper function of quick sort that partitions the range around the pivot at its first index into the
+    values smaller than, equal to and larger than the pivot.
+    :param arr: TracedArray.
+    :param left: int.
+    :param right: int.
+    :return: tuple (int, int), the first and last index of the values equal to the pivot.
+    """
+    pivot = arr[left]
+    lower = left
+    i = left + 1
+    upper = right
+    while i <= upper:
+        if arr.less_than_value(i, pivot):
+            arr.swap(lower, i)
+            lower += 1
+            i += 1
+        elif arr.value_less_than(pivot, i):
+            arr.swap(i, upper)
+            upper -= 1
+        else:
+            i += 1
+    return lower, upper
+
+
+@register("Merge Sort", stable=True, in_place=False, complexity="O(n log n)")
+def merge_sort(arr):
+    """
+    This function sorts the array by using the 'merge sort' algorithm.
+    A single auxiliary buffer is allocated for the whole run and shared by all the merges.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    if len(arr) > 1:
+        merge_sort_helper(arr, list(arr.values), 0, len(arr) - 1)
+
+
+def merge_sort_helper(arr, auxiliary_arr, start_index, end_index):
+    """
+    This is a helper function to the merge_sort function, it sorts the range [start_index, end_index].
+    :param arr: TracedArray.
+    :param auxiliary_arr: list, the buffer of the merges, as large as the array.
+    :param start_index: int.
+    :param end_index: int.
+    :return: None.
+    """
+    if start_index == end_index:
+        return
+    arr.enter()
+    middle_index = (start_index + end_index) // 2
+    merge_sort_helper(arr, auxiliary_arr, start_index, middle_index)
+    merge_sort_helper(arr, auxiliary_arr, middle_index + 1, end_index)
+    merge(arr, auxiliary_arr, start_index, middle_index, end_index)
+    arr.leave()
+
+
+def merge(arr, auxiliary_arr, start_index, middle_index, end_index):
+    """
+    This is a helper function to the merge_sort function.
+    It merges the 2 sorted parts of the range by copying them to the auxiliary array and writing them back in order.
+    :param arr: TracedArray.
+    :param auxiliary_arr: list, the buffer of the merges, as large as the array.
+    :param start_index: int.
+    :param middle_index: int.
+    :param end_index: int.
+    :return: None.
+    """
+    for index in range(start_index, end_index + 1):
+        auxiliary_arr[index] = arr[index]
+    merge_runs(arr, auxiliary_arr, arr, start_index, middle_index, end_index)
+
+
+def merge_runs(arr, source, target, start_index, middle_index, end_index):
+    """
+    This is a helper function of the merge sorts, it merges the sorted runs [start_index, middle_index] and
+    [middle_index + 1, end_index] of the source into the same range of the target.
+    One of the source and the target is the array and the other is an auxiliary buffer, only the writes to the array
+    are recorded.
+    :param arr: TracedArray.
+    :param source: TracedArray / list.
+    :param target: TracedArray / list.
+    :param start_index: int.
+    :param middle_index: int.
+    :param end_index: int.
+    :return: None.
+    """
+    if source is arr:
+        less = arr.less
+    else:
+        def less(first, second):
+            return arr.values_less(source[first], source[second])
+    write = arr.write if target is arr else target.__setitem__
+    i = start_index
+    j = middle_index + 1
+    for k in range(start_index, end_index + 1):
+        if i > middle_index:
+            write(k, source[j])
+            j += 1
+        elif j > end_index or not less(j, i):
+            write(k, source[i])
+            i += 1
+        else:
+            write(k, source[j])
+            j += 1
+
+
+def copy_back(arr, source):
+    """
+    This is a helper function of the merge sorts, it writes the values of an auxiliary buffer to the array.
+    :param arr: TracedArray.
+    :param source: list.
+    :return: None.
+    """
+    for index in range(len(arr)):
+        arr.write(index, source[index])
+
+
+@register("Iterative Merge Sort", stable=True, in_place=False, complexity="O(n log n)", show_button=False)
+def iterative_merge_sort(arr):
+    """
+    This function sorts the array by using the bottom up 'merge sort' algorithm, without recursion.
+    Every pass merges from the array into a single auxiliary buffer or back, so the values are never copied
+    between the merges. The passes into the buffer are only visible as comparisons.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    size = len(arr)
+    source, target = arr, list(arr.values)
+    width = 1
+    while width < size:
+        for left in range(0, size, 2 * width):
+            middle = min(left + width - 1, size - 1)
+            right = min(left + 2 * width - 1, size - 1)
+            merge_runs(arr, source, target, left, middle, right)
+        source, target = target, source
+        width *= 2
+    if source is not arr:
+        copy_back(arr, source)
+
+
+@register("Natural Merge Sort", stable=True, in_place=False, complexity="O(n log r), O(n) on sorted input",
+          show_button=False)
+def natural_merge_sort(arr):
+    """
+    This function sorts the array by using the bottom up 'natural merge sort' algorithm: it merges the runs that are
+    already in the input (strictly descending runs are reversed first) instead of runs of a fixed width, ping-ponging
+    between the array and a single auxiliary buffer like iterative_merge_sort.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    size = len(arr)
+    run_ends = []
+    start = 0
+    while start < size:
+        end = start + 1
+        if end < size and arr.less(end, start):
+            while end + 1 < size and arr.less(end + 1, end):
+                end += 1
+            i, j = start, end
+            while i < j:
+                arr.swap(i, j)
+                i += 1
+                j -= 1
+        elif end < size:
+            while end + 1 < size and not arr.less(end + 1, end):
+                end += 1
+        else:
+            end = start
+        run_ends.append(end)
+        start = end + 1
+    source, target = arr, list(arr.values)
+    while len(run_ends) > 1:
+        merged_ends = []
+        start = 0
+        for index in range(0, len(run_ends), 2):
+            # a run without a pair is copied as it is.
+            end = run_ends[min(index + 1, len(run_ends) - 1)]
+            merge_runs(arr, source, target, start, run_ends[index], end)
+            merged_ends.append(end)
+            start = end + 1
+        run_ends = merged_ends
+        source, target = target, source
+    if source is not arr:
+        copy_back(arr, source)
+
+
+@register("External Merge Sort", stable=True, in_place=False, complexity="O(n log n), log_k(r) merge passes")
+def external_merge_sort(arr, memory=None, fan_in=EXTERNAL_MERGE_FAN_IN):
+    """
+    This function sorts the array by using the 'external merge sort' algorithm, as if the array did not fit in the
+    memory (see helper_functions.external_sort for the version that sorts files).
+    Every chunk of memory values is sorted on its own into a run, then every pass merges groups of fan_in runs with a
+    heap until a single run is left. The runs of a group are copied out like runs spilled to the disk and the heap
+    only compares the heads of the runs, and the bars of every run and of every merged group take their own color.
+    :param arr: TracedArray.
+    :param memory: int / None, the number of values sorted at a time, the array is split into EXTERNAL_MERGE_RUNS
+    runs if None.
+    :param fan_in: int, the most runs merged at once.
+    :return: None.
+    """
+    size = len(arr)
+    if memory is None:
+        memory = -(-size // EXTERNAL_MERGE_RUNS)
+    memory = max(EXTERNAL_MERGE_MIN_MEMORY, memory)
+    fan_in = max(2, fan_in)
+    auxiliary_arr = list(arr.values)
+    runs = []
+    for start in range(0, size, memory):
+        end = min(size, start + memory)
+        arr.mark_worker(len(runs))
+        merge_sort_helper(arr, auxiliary_arr, start, end - 1)
+        runs.append((start, end))
+    while len(runs) > 1:
+        merged = []
+        for group in range(0, len(runs), fan_in):
+            start, end = runs[group][0], runs[min(group + fan_in, len(runs)) - 1][1]
+            arr.mark_worker(len(merged))
+            merge_external_runs(arr, auxiliary_arr, runs[group:group + fan_in])
+            merged.append((start, end))
+        runs = merged
+
+
+class MergeCursor:
+    """
+    The MergeCursor is the head of a run in the heap of external_merge_sort, the heads are compared through the
+    array so every comparison of the merge is recorded.
+
+    Parameters
+    ----------
+
+    arr : TracedArray.
+
+    source : list.
+    the buffer the run was copied to.
+
+    run : int.
+    the position of the run in its group, equal values are taken from the earlier run first.
+
+    index : int.
+    the position of the head in the buffer.
+
+    end : int.
+    the end of the run in the buffer (exclusive).
+
+    Attributes
+    ----------
+
+    self.arr : TracedArray.
+    self.source : list.
+    self.run : int.
+    self.index : int.
+    self.end : int.
+    """
+    def __init__(self, arr, source, run, index, end):
+        self.arr = arr
+        self.source = source
+        self.run = run
+        self.index = index
+        self.end = end
+
+    def __lt__(self, other):
+        """
+        compare the heads of two runs.
+        :param other: MergeCursor.
+        :return: bool.
+        """
+        return self.arr.values_less((self.source[self.index], self.run), (other.source[other.index], other.run))
+
+
+def merge_external_runs(arr, auxiliary_arr, runs):
+    """
+    This is a helper function to the external_merge_sort function, it merges the adjacent sorted runs provided with a
+    heap of their heads, by copying them to the auxiliary array and writing them back in order.
+    :param arr: TracedArray.
+    :param auxiliary_arr: list, the buffer of the merges, as large as the array.
+    :param runs: list of tuple (int, int), the start and end (exclusive) of every run.
+    :return: None.
+    """
+    start, end = runs[0][0], runs[-1][1]
+    for index in range(start, end):
+        auxiliary_arr[index] = arr[index]
+    heap = [MergeCursor(arr, auxiliary_arr, run, lo, hi) for run, (lo, hi) in enumerate(runs) if lo < hi]
+    heapq.heapify(heap)
+    for k in range(start, end):
+        cursor = heap[0]
+        arr.write(k, auxiliary_arr[cursor.index])
+        cursor.index += 1
+        if cursor.index < cursor.end:
+            heapq.heapreplace(heap, cursor)
+        else:
+            heapq.heappop(heap)
+
+
+@register("Bubble Sort", stable=True, in_place=True, complexity="O(n^2)")
+def bubble_sort(arr):
+    """
+    This function sorts the array by using the 'bubble sort' algorithm.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    n = len(arr)
+    for i in range(n):
+        for j in range(n - i - 1):
+            if arr.less(j + 1, j):
+                arr.swap(j, j + 1)
+
+
+@register("Selection Sort", stable=False, in_place=True, complexity="O(n^2)")
+def selection_sort(arr):
+    """
+    This function sorts the array by using the 'selection sort' algorithm.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    size = len(arr)
+    for i in range(size):
+        min_index = i
+        for j in range(i + 1, size):
+            if arr.less(j, min_index):
+                min_index = j
+        arr.swap(i, min_index)
+
+
+def sift_down(arr, lo, root, size):
+    """
+    This function moves the value at the root of a heap down until it is larger than its children, without recursion.
+    :param arr: TracedArray.
+    :param lo: int, the index of the first value of the heap.
+    :param root: int, the position of the root inside the heap.
+    :param size: int, the size of the heap.
+    :return: None.
+    """
+    while True:
+        largest = root
+        left = root * 2 + 1
+        right = left + 1
+        if left < size and arr.less(lo + largest, lo + left):
+            largest = left
+        if right < size and arr.less(lo + largest, lo + right):
+            largest = right
+        if largest == root:
+            return
+        arr.swap(lo + root, lo + largest)
+        root = largest
+
+
+def heap_sort_range(arr, lo, hi):
+    """
+    This function sorts the half open range [lo, hi) by using the 'heap sort' algorithm.
+    :param arr: TracedArray.
+    :param lo: int.
+    :param hi: int.
+    :return: None.
+    """
+    size = hi - lo
+    for root in range(size // 2 - 1, -1, -1):
+        sift_down(arr, lo, root, size)
+    for end in range(size - 1, 0, -1):
+        arr.swap(lo, lo + end)
+        sift_down(arr, lo, 0, end)
+
+
+@register("Heap Sort", stable=False, in_place=True, complexity="O(n log n)")
+def heap_sort(arr):
+    """
+    This function sorts the array by using the 'heap sort' algorithm.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    heap_sort_range(arr, 0, len(arr))
+
+
+@register("Insertion Sort", stable=True, in_place=True, complexity="O(n^2)")
+def insertion_sort(arr):
+    """
+    This function sorts the array by using the 'insertion sort' algorithm.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    insertion_sort_range(arr, 0, len(arr))
+
+
+def insertion_sort_range(arr, lo, hi):
+    """
+    This function sorts the half open range [lo, hi) by using the 'insertion sort' algorithm.
+    :param arr: TracedArray.
+    :param lo: int.
+    :param hi: int.
+    :return: None.
+    """
+    for i in range(lo + 1, hi):
+        key = arr[i]
+        j = i - 1
+        while j >= lo and arr.value_less_than(key, j):
+            arr.write(j + 1, arr[j])
+            j -= 1
+        if j + 1 != i:
+            arr.write(j + 1, key)
+
+
+@register("Bucket Sort", stable=True, in_place=False, complexity="O(n + k), worst O(n log n)")
+def bucket_sort(arr, fallback="merge"):
+    """
+    This function sorts the array by using the 'bucket sort' algorithm. The number of buckets comes from the size of
+    the array and the range of its values, so every bucket gets a few values on average whatever the scale of the
+    values is, and it works on floats as well as integers.
+    The values are scattered to the ranges of their buckets in the array, then every bucket is sorted where it is:
+    small buckets with insertion sort and buckets that skewed data made large with the fallback sort, so a bad
+    distribution costs O(n log n) instead of O(n^2).
+    :param arr: TracedArray.
+    :param fallback: str, the sort of the large buckets, one of BUCKET_SORT_FALLBACKS.
+    :return: None.
+    """
+    if fallback not in BUCKET_SORT_FALLBACKS:
+        raise Exception(f"Unknown bucket sort fallback: {fallback}")
+    size = len(arr)
+    if size < 2:
+        return
+    minimum = maximum = 0
+    for i in range(1, size):
+        if arr.less(i, minimum):
+            minimum = i
+        elif arr.less(maximum, i):
+            maximum = i
+    minimum, maximum = arr[minimum], arr[maximum]
+    if minimum == maximum:
+        return
+    num_of_buckets = -(-size // BUCKET_SORT_LOAD)
+    if isinstance(minimum, int) and isinstance(maximum, int):
+        num_of_buckets = min(num_of_buckets, maximum - minimum + 1)
+    scale = num_of_buckets / (maximum - minimum)
+    auxiliary_arr = list(arr.values)
+    buckets = [min(int((value - minimum) * scale), num_of_buckets - 1) for value in auxiliary_arr]
+    # the first index of every bucket in the array.
+    starts = [0] * (num_of_buckets + 1)
+    for bucket in buckets:
+        starts[bucket + 1] += 1
+    for bucket in range(num_of_buckets):
+        starts[bucket + 1] += starts[bucket]
+    # scatter: every value is written to the next free index of its bucket.
+    ends = starts[:-1]
+    for value, bucket in zip(auxiliary_arr, buckets):
+        arr.write(ends[bucket], value)
+        ends[bucket] += 1
+    # gather: the buckets are already in order, so sorting each one sorts the array.
+    for bucket in range(num_of_buckets):
+        lo, hi = starts[bucket], starts[bucket + 1]
+        if hi - lo <= BUCKET_SORT_INSERTION_THRESHOLD:
+            insertion_sort_range(arr, lo, hi)
+        else:
+            BUCKET_SORT_FALLBACKS[fallback](arr, auxiliary_arr, lo, hi)
+
+
+def merge_sort_bucket(arr, auxiliary_arr, lo, hi):
+    """
+    This is a helper function of bucket sort, it sorts the half open range [lo, hi) with merge sort.
+    :param arr: TracedArray.
+    :param auxiliary_arr: list, the buffer of the merges, as large as the array.
+    :param lo: int.
+    :param hi: int.
+    :return: None.
+    """
+    merge_sort_helper(arr, auxiliary_arr, lo, hi - 1)
+
+
+def quick_sort_bucket(arr, auxiliary_arr, lo, hi):
+    """
+    This is a helper function of bucket sort, it sorts the half open range [lo, hi) with quick sort.
+    :param arr: TracedArray.
+    :param auxiliary_arr: list, not used.
+    :param lo: int.
+    :param hi: int.
+    :return: None.
+    """
+    quick_sort(arr, lo, hi - 1)
+
+
+def heap_sort_bucket(arr, auxiliary_arr, lo, hi):
+    """
+    This is a helper function of bucket sort, it sorts the half open range [lo, hi) with heap sort.
+    :param arr: TracedArray.
+    :param auxiliary_arr: list, not used.
+    :param lo: int.
+    :param hi: int.
+    :return: None.
+    """
+    heap_sort_range(arr, lo, hi)
+
+
+# the sorts bucket sort can use for the buckets that are too large for insertion sort, the merge sort keeps it stable.
+BUCKET_SORT_FALLBACKS = {
+    "merge": merge_sort_bucket,
+    "quick": quick_sort_bucket,
+    "heap": heap_sort_bucket,
+}
+
+
+@register("Quick Bucket Sort", stable=False, in_place=False, complexity="O(n + k), worst O(n log n)",
+          show_button=False)
+def quick_bucket_sort(arr):
+    """
+    This function sorts the array by using the 'bucket sort' algorithm with quick sort for the large buckets, it
+    needs no merge buffer for them but it is not stable.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    bucket_sort(arr, fallback="quick")
+
+
+@register("Heap Bucket Sort", stable=False, in_place=False, complexity="O(n + k), worst O(n log n)",
+          show_button=False)
+def heap_bucket_sort(arr):
+    """
+    This function sorts the array by using the 'bucket sort' algorithm with heap sort for the large buckets, their
+    worst case stays O(m log m) whatever the values are, but it is not stable.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    bucket_sort(arr, fallback="heap")
+
+
+@register("Radix Sort", stable=True, in_place=False, complexity="O(w / r * (n + 2^r))")
+def radix_sort(arr, radix_bits=8):
+    """
+    This function sorts an array of integers by using the 'radix sort' algorithm, least significant digit first.
+    The values are biased by the minimum so negative values work, and a digit is radix_bits bits wide, so 32-bit
+    keys take four passes with the default radix of 256.
+    Every pass is a stable counting sort from one buffer to the other, the two buffers are allocated once and
+    ping-pong between the passes.
+    :param arr: TracedArray.
+    :param radix_bits: int, one of RADIX_BITS.
+    :return: None.
+    """
+    minimum, maximum = get_radix_range(arr, radix_bits)
+    if minimum == maximum:
+        return
+    passes = -(-(maximum - minimum).bit_length() // radix_bits)
+    buffers = [list(arr.values), [0] * len(arr)]
+    for digit in range(passes):
+        radix_pass(arr.get_trace(), buffers[digit % 2], buffers[1 - digit % 2], 0, len(arr), minimum,
+                   digit * radix_bits, radix_bits)
+    arr.values[:] = buffers[passes % 2]
+
+
+@register("MSD Radix Sort", stable=True, in_place=False, complexity="O(w / r * (n + 2^r))")
+def msd_radix_sort(arr, radix_bits=8):
+    """
+    This function sorts an array of integers by using the 'radix sort' algorithm, most significant digit first.
+    Every range is distributed by its current digit into the other buffer and its buckets are sorted on the next
+    digit, without recursion, until they are small enough for insertion sort.
+    :param arr: TracedArray.
+    :param radix_bits: int, one of RADIX_BITS.
+    :return: None.
+    """
+    minimum, maximum = get_radix_range(arr, radix_bits)
+    if minimum == maximum:
+        return
+    trace = arr.get_trace()
+    passes = -(-(maximum - minimum).bit_length() // radix_bits)
+    buffers = [list(arr.values), [0] * len(arr)]
+    # ranges that still have to be sorted: (lo, hi, shift of their digit, buffer that holds them).
+    stack = [(0, len(arr), (passes - 1) * radix_bits, 0)]
+    while stack:
+        lo, hi, shift, buffer = stack.pop()
+        values = buffers[buffer]
+        if hi - lo <= RADIX_SORT_INSERTION_THRESHOLD or shift < 0:
+            if shift >= 0:
+                insertion_sort_buffer(trace, values, lo, hi)
+            # the range is done, the array holds the values in their final order.
+            arr.values[lo:hi] = values[lo:hi]
+            continue
+        starts = radix_pass(trace, values, buffers[1 - buffer], lo, hi, minimum, shift, radix_bits)
+        for bucket in range(len(starts) - 1):
+            stack.append((starts[bucket], starts[bucket + 1], shift - radix_bits, 1 - buffer))
+
+
+@register("11-bit Radix Sort", stable=True, in_place=False, complexity="O(w / r * (n + 2^r))", show_button=False)
+def radix_sort_11(arr):
+    """
+    This function sorts an array of integers by using the 'radix sort' algorithm with 11-bit digits, so 32-bit keys
+    take three passes instead of four.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    radix_sort(arr, radix_bits=11)
+
+
+@register("16-bit Radix Sort", stable=True, in_place=False, complexity="O(w / r * (n + 2^r))", show_button=False)
+def radix_sort_16(arr):
+    """
+    This function sorts an array of integers by using the 'radix sort' algorithm with 16-bit digits, so 32-bit keys
+    take two passes over 65536 counters.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    radix_sort(arr, radix_bits=16)
+
+
+@register("11-bit MSD Radix Sort", stable=True, in_place=False, complexity="O(w / r * (n + 2^r))",
+          show_button=False)
+def msd_radix_sort_11(arr):
+    """
+    This function sorts an array of integers by using the most significant digit first 'radix sort' algorithm with
+    11-bit digits.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    msd_radix_sort(arr, radix_bits=11)
+
+
+@register("16-bit MSD Radix Sort", stable=True, in_place=False, complexity="O(w / r * (n + 2^r))",
+          show_button=False)
+def msd_radix_sort_16(arr):
+    """
+    This function sorts an array of integers by using the most significant digit first 'radix sort' algorithm with
+    16-bit digits, most ranges are small enough for insertion sort after the first digit.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    msd_radix_sort(arr, radix_bits=16)
+
+
+def get_radix_range(arr, radix_bits):
+    """
+    This is a helper function of the radix sorts, it checks their arguments and returns the smallest and largest
+    values. radix sort does not compare values, so this is not recorded.
+    :param arr: TracedArray.
+    :param radix_bits: int.
+    :return: tuple (int, int).
+    """
+    if radix_bits not in RADIX_BITS:
+        raise ValueError(f"Unsupported radix: 2^{radix_bits}")
+    if not all(isinstance(value, int) for value in arr.values):
+        raise ValueError("Radix sort can only sort integers")
+    if len(arr) == 0:
+        return 0, 0
+    return min(arr.values), max(arr.values)
+
+
+def radix_pass(trace, source, target, lo, hi, minimum, shift, radix_bits):
+    """
+    This is a helper function of the radix sorts, it is a stable counting sort of the range [lo, hi) of the source
+    buffer into the same range of the target buffer by the digit at the shift provided.
+    The writes are recorded on the array, which always shows the result of the last pass whatever buffer holds it.
+    Only the digits found in the range are counted and accumulated, so the small ranges of msd radix sort do not
+    pay for the 2^radix_bits digits they do not hold.
+    :param trace: Trace / TraceStream.
+    :param source: list.
+    :param target: list.
+    :param lo: int.
+    :param hi: int.
+    :param minimum: int, the bias that makes every key non negative.
+    :param shift: int.
+    :param radix_bits: int.
+    :return: list of int, the first index of every digit found in the range and hi.
+    """
+    mask = (1 << radix_bits) - 1
+    digits = [((source[i] - minimum) >> shift) & mask for i in range(lo, hi)]
+    # counting the amount of times each digit is in the range.
+    counts = Counter(digits)
+    positions = {}
+    starts = []
+    position = lo
+    for digit in sorted(counts):
+        positions[digit] = position
+        starts.append(position)
+        position += counts[digit]
+    starts.append(hi)
+    for i, digit in zip(range(lo, hi), digits):
+        value = source[i]
+        target[positions[digit]] = value
+        trace.write(positions[digit], value)
+        positions[digit] += 1
+    return starts
+
+
+def insertion_sort_buffer(trace, values, lo, hi):
+    """
+    This is a helper function of msd radix sort, it sorts the range [lo, hi) of a buffer by using the
+    'insertion sort' algorithm and records the operations on the array.
+    :param trace: Trace / TraceStream.
+    :param values: list.
+    :param lo: int.
+    :param hi: int.
+    :return: None.
+    """
+    for i in range(lo + 1, hi):
+        key = values[i]
+        j = i - 1
+        while j >= lo:
+            trace.compare(NO_INDEX, j)
+            if not key < values[j]:
+                break
+            values[j + 1] = values[j]
+            trace.write(j + 1, values[j])
+            j -= 1
+        if j + 1 != i:
+            values[j + 1] = key
+            trace.write(j + 1, key)
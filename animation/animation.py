@@ -1,13 +1,20 @@
-import random
 from helper_functions.constants import *
+from animation.registry import get_algorithm
+from animation.trace import TracedArray, Counters, SWAP, WRITE
+from animation.hud import Hud
+from animation.renderer import Renderer
+from animation.array_view import ArrayView
+from animation.race import Race
+from animation.timeline import Timeline, TimelineBar
+from animation.trace_stream import TraceRecorder
 import pygame
-import time
 
 
 class Animation:
     """
     The Animation class takes care of drawing the animation, deciding on which sorting algorithm to run and update
-    the display.
+    the display. The algorithms run on a copy of the values in a worker process and record a trace, which is
+    replayed on the array while it is recorded.
 
     Parameters
     ----------
@@ -18,20 +25,54 @@ class Animation:
     background : Background
     background for the animation.
 
-    array : list.
-    list of lines.
+    array : BarArray.
+    the values of the animation and how to draw them.
+
+    renderer : Renderer.
+    replays the traces of the algorithms frame by frame, a default Renderer is created if None is provided.
+
+    race_algorithms : list of str.
+    the names of the algorithms the race button runs side by side.
+
+    cache : TraceCache / None.
+    where the traces of the algorithms are kept between runs, the algorithms always run if None is provided.
 
     Attributes
     ----------
 
     self.button_handler : ButtonHandler.
     self.background : Background.
-    self.arr : list.
+    self.arr : BarArray.
+    self.renderer : Renderer.
+    self.race_algorithms : list of str.
+    self.cache : TraceCache / None.
+    self.view : ArrayView, draws the array.
+    self.hud : Hud, shows the counters.
+    self.timeline_bar : TimelineBar, shows the position of the replay and seeks in it when clicked.
+    self.counters : Counters, the counters of the last algorithm that ran, updated live while it is replayed.
+    self.playback : generator / None, the replay in progress, advanced one frame at a time by the main loop.
+    self.race : Race / None, the last race, shown instead of the array until another button is clicked.
+    self.timeline : Timeline / None, the timeline of the last trace that was replayed, kept to seek in it after the
+    replay is over.
+    self.recorder : TraceRecorder / None, the recording in progress.
+    self.error : str / None, why the last algorithm failed, shown under the counters.
     """
-    def __init__(self, handler, background, array):
+    def __init__(self, handler, background, array, renderer=None, race_algorithms=race_algorithms, cache=None):
         self.button_handler = handler
         self.background = background
         self.arr = array
+        self.renderer = renderer if renderer is not None else Renderer()
+        self.race_algorithms = race_algorithms
+        self.cache = cache
+        self.view = ArrayView(array, background)
+        self.hud = Hud(hud_x, hud_y, hud_width, hud_line_height, BLACK, background)
+        self.timeline_bar = TimelineBar(x_start, timeline_y, x_end - x_start, timeline_height, BLACK, background)
+        self.counters = Counters()
+        self.playback = None
+        self.race = None
+        self.timeline = None
+        self.recorder = None
+        self.error = None
 
     def update_display(self, win, position):
         """
@@ -42,8 +83,9 @@ class Animation:
         """
         self.background.draw(win)
         self.button_handler.draw_on_board_and_hover(position, win)
-        for line in self.arr:
-            line.draw_on_board(win)
+        self.draw_array(win)
+        self.draw_hud(win)
+        self.draw_timeline(win)
         pygame.display.flip()
 
 
@@ -52,36 +94,16 @@ class Animation:
         Shuffle the array in place.
         :return: None.
         """
-        random.shuffle(self.arr)
-
-    def update_x_start_and_end(self, index):
-        """
-        update the start and end point x-coordinate.
-        :param index: index of the array at which we need to update the start and end point of the line.
-        :return: None.
-        """
-        self.arr[index].get_start().set_x(x_start + index * line_gap)
-        self.arr[index].get_end().set_x(x_start + index * line_gap)
+        self.arr.shuffle()
 
     def swap(self, i, j):
         """
-        Swap two lines in the array.
+        Swap two values in the array.
         :param i: first index.
         :param j: second index.
         :return: None.
         """
-        self.arr[i], self.arr[j] = self.arr[j], self.arr[i]
-        self.update_x_start_and_end(i)
-        self.update_x_start_and_end(j)
-
-    def update_entire_array_and_shuffle(self):
-        """
-        shuffle the array and update the start, end points of the lines.
-        :return: None.
-        """
-        self.shuffle_array()
-        for i in range(len(self.arr)):
-            self.update_x_start_and_end(i)
+        self.arr.swap(i, j)
 
     def print_arr(self, win):
         """
@@ -91,375 +113,311 @@ class Animation:
         """
         self.background.draw(win)
         self.button_handler.draw_on_board(win)
-        for line in self.arr:
-            line.draw_on_board(win)
+        self.draw_array(win)
+        self.draw_hud(win)
+        self.draw_timeline(win)
         pygame.display.flip()
 
-    def bubble_sort(self, win):
+    def get_counters(self):
+        """
+        return the counters of the last algorithm that ran.
+        :return: Counters.
         """
-        This function sorts the array by using the 'bubble sort' algorithm.
+        return self.counters
+
+    def draw_hud(self, win):
+        """
+        This function draws the counters, without updating the display. During a race every lane shows its own
+        counters, so only the state of the scheduler is drawn.
         :param win: pygame.display.
-        :return: None.
+        :return: pygame.Rect, the rectangle of the counters.
         """
-        n = len(self.arr)
-        for i in range(n):
-            for j in range(n - i - 1):
-                if self.arr[j] > self.arr[j + 1]:
-                    self.swap(j, j + 1)
-                    self.print_arr(win)
-                    time.sleep(0.001)
+        counters = self.counters if self.race is None else None
+        return self.hud.draw(win, counters, self.get_status())
 
-    def quick_sort(self, left, right, win):
+    def get_status(self):
         """
-        This function sorts the array by using the 'quick sort' algorithm.
-        :param left: int.
-        :param right: int.
+        This function returns the lines shown under the counters: the state of the replay and why the last algorithm
+        failed, if it did.
+        :return: list of str.
+        """
+        status = self.renderer.get_status(self.timeline)
+        error = self.recorder.get_error() if self.recorder is not None else self.error
+        if error is not None and self.race is None:
+            status.append(f"error: {error}")
+        return status
+
+    def draw_timeline(self, win):
+        """
+        This function draws the timeline of the last trace, without updating the display.
         :param win: pygame.display.
-        :return: None.
+        :return: list, the rectangles that were drawn, empty if there is no timeline to show.
         """
-        if left >= right:
-            return
-        pivot = self.partition(left, right, win)
-        self.quick_sort(left, pivot - 1, win)
-        self.quick_sort(pivot + 1, right, win)
+        if self.timeline is None or self.race is not None:
+            return []
+        return [self.timeline_bar.draw(win, self.renderer.get_position(), len(self.timeline))]
+
+    def use_pixel_backend(self):
+        """
+        check if the array is drawn by the pixel backend instead of bar by bar.
+        :return: bool.
+        """
+        return self.view.use_pixel_backend()
 
-    def partition(self, left, right, win):
+    def draw_array(self, win):
         """
-        This is a helper function of quick sort that chooses a partition that all lines to left are shorter
-        than it and all lines to the right are longer than it.
-        :param left: int.
-        :param right: int.
+        This function draws the whole array, or the lanes of the last race, without updating the display.
         :param win: pygame.display.
-        :return: None.
+        :return: pygame.Rect, the rectangle of the array.
+        """
+        if self.race is not None:
+            return self.race.draw(win)
+        return self.view.draw(win)
+
+    def draw_columns(self, win, indices):
         """
-        pivot = self.arr[right]
-        i = left - 1
-        for j in range(left, right):
-            if self.arr[j] < pivot:
-                i += 1
-                self.swap(i, j)
-                self.print_arr(win)
-                time.sleep(0.01)
-        i += 1
-        self.swap(i, right)
-        self.print_arr(win)
-        return i
-
-    def selection_sort(self, win):
-        """
-        This function sorts the array by using the 'selection sort' algorithm.
+        This function erases and redraws only the columns at the indices provided, without updating the display.
         :param win: pygame.display.
+        :param indices: iterable of int.
+        :return: list, the rectangles that were redrawn.
+        """
+        return self.view.draw_columns(win, indices)
+
+    def get_values(self):
+        """
+        return a copy of the values of the array.
+        :return: list.
+        """
+        return self.arr.get_values()
+
+    def set_values(self, values):
+        """
+        replace the values of the array, the colors of the bars belong to the old values so they are reset.
+        :param values: list.
         :return: None.
         """
-        size = len(self.arr)
-        for i in range(size):
-            min_index = i
-            for j in range(i + 1, size):
-                if self.arr[min_index] > self.arr[j]:
-                    min_index = j
-            self.swap(i, min_index)
-            self.print_arr(win)
-            time.sleep(0.02)
-
-    def merge_sort(self, main_arr, start_index, end_index, auxiliary_arr, win):
-        """
-        This function sorts the array by using the 'merge sort' algorithm with an auxiliary array for the swaps,
-        array updates.
-        :param main_arr: list.
-        :param start_index: int.
-        :param end_index: int.
-        :param auxiliary_arr: list.
-        :param win: pygame.display.
+        self.arr.values[:] = values
+        self.arr.reset_colors()
+
+    def write(self, index, value):
+        """
+        update the value at the index provided.
+        :param index: int.
+        :param value: int / float.
         :return: None.
         """
-        if start_index == end_index:
-            return
-        middle_index = (start_index + end_index) // 2
-        self.merge_sort(auxiliary_arr, start_index, middle_index, main_arr, win)
-        self.merge_sort(auxiliary_arr, middle_index + 1, end_index, main_arr, win)
-        self.merge(main_arr, start_index, middle_index, end_index, auxiliary_arr, win)
-
-    def merge(self, main_arr, start_index, middle_index, end_index, auxiliary_arr, win):
-        """
-        This is a helper function to the merge_sort function.
-        It sorts the array by splitting it into 2 parts, and then updates the array according to the auxiliary array.
-        :param main_arr: list.
-        :param start_index: int.
-        :param middle_index: int.
-        :param end_index: int.
-        :param auxiliary_arr: list.
-        :param win: pygame.display.
+        self.arr[index] = value
+
+    def paint(self, index, worker):
+        """
+        give the bar at the index provided the color of the worker process that changed it.
+        :param index: int.
+        :param worker: int.
         :return: None.
         """
-        k = start_index
-        i = start_index
-        j = middle_index + 1
-        while i <= middle_index and j <= end_index:
-            if auxiliary_arr[i] < auxiliary_arr[j]:
-                main_arr[k] = auxiliary_arr[i]
-                i += 1
-            else:
-                main_arr[k] = auxiliary_arr[j]
-                j += 1
-            self.update_x_start_and_end(k)
-            self.print_arr(win)
-            time.sleep(0.005)
-            k += 1
-        while i <= middle_index:
-            main_arr[k] = auxiliary_arr[i]
-            self.update_x_start_and_end(k)
-            self.print_arr(win)
-            time.sleep(0.005)
-            i += 1
-            k += 1
-        while j <= end_index:
-            main_arr[k] = auxiliary_arr[j]
-            self.update_x_start_and_end(k)
-            self.print_arr(win)
-            time.sleep(0.005)
-            j += 1
-            k += 1
-
-    def iterative_merge_sort(self, win):
-        """
-        This function sorts the array by using 'merge sort' algorithm but instead of recursion, using iteration.
-        :param win: pygame.display.
+        self.arr.set_color(index, WORKER_COLORS[worker % len(WORKER_COLORS)])
+
+    def apply_operation(self, code, first, second):
+        """
+        apply a single swap / write operation of a trace to the array, comparisons are ignored.
+        :param code: int, op code.
+        :param first: int.
+        :param second: int / float.
         :return: None.
         """
-        current_size = 1
-        while current_size < len(self.arr) - 1:
-            left = 0
-            while left < len(self.arr) - 1:
-                mid = min((left + current_size - 1), len(self.arr) - 1)
-                right = ((2 * current_size + left - 1, len(self.arr) - 1)[2 * current_size + left - 1 >
-                                                                          len(self.arr) - 1])
-                self.iterative_merge_helper(left, mid, right, win)
-                left = left + current_size * 2
-
-            current_size = 2 * current_size
-
-    def iterative_merge_helper(self, left_index, mid_index, right_index, win):
-        """
-        This is a helper function to the iterative merge sort function.
-        it splits the segments into to two parts each time and sorts each part before merging them together.
-        :param left_index: int.
-        :param mid_index: int.
-        :param right_index: int.
+        if code == SWAP:
+            self.swap(first, second)
+        elif code == WRITE:
+            self.write(first, second)
+
+    def play_trace(self, trace, win, recorder=None):
+        """
+        This function starts replaying a trace on the array through the renderer, any replay in progress is
+        cancelled. The counters are updated live as the replay advances.
+        :param trace: Trace.
         :param win: pygame.display.
+        :param recorder: TraceRecorder / None, the recorder the trace is growing from.
         :return: None.
         """
-        left_bound = mid_index - left_index + 1
-        right_bound = right_index - mid_index
-        left_side = [0] * left_bound
-        right_side = [0] * right_bound
-        for i in range(0, left_bound):
-            left_side[i] = self.arr[left_index + i]
-        for i in range(0, right_bound):
-            right_side[i] = self.arr[mid_index + i + 1]
-
-        i, j, k = 0, 0, left_index
-        while i < left_bound and j < right_bound:
-            if left_side[i] > right_side[j]:
-                self.arr[k] = right_side[j]
-                self.update_x_start_and_end(k)
-                self.print_arr(win)
-                j += 1
-            else:
-                self.arr[k] = left_side[i]
-                self.update_x_start_and_end(k)
-                self.print_arr(win)
-                i += 1
-            k += 1
-            time.sleep(0.01)
-
-        while i < left_bound:
-            self.arr[k] = left_side[i]
-            self.update_x_start_and_end(k)
-            self.print_arr(win)
-            i += 1
-            k += 1
-            time.sleep(0.01)
-
-        while j < right_bound:
-            self.arr[k] = right_side[j]
-            self.update_x_start_and_end(k)
-            self.print_arr(win)
-            j += 1
-            k += 1
-            time.sleep(0.01)
-
-    def heapify(self, size, root_index, win):
-        """
-        This is a helper function for the 'heap sort' function, it performs the 'heapify' algorithm on the array.
-        :param size: int.
-        :param root_index: int.
+        self.cancel()
+        self.race = None
+        self.recorder = recorder
+        self.arr.reset_colors()
+        self.timeline = Timeline(trace)
+        self.playback = self.renderer.frames(self, trace, win, self.counters, self.timeline, recorder=recorder)
+
+    def run_algorithm(self, algorithm, win, name=None):
+        """
+        This function starts recording the trace of a sorting algorithm on a copy of the array values and replays the
+        trace on the array as it is recorded. A registered algorithm runs in a worker process, so the window keeps
+        handling events however long it takes, and an algorithm without a name runs here before the replay starts.
+        With a cache, a trace that was already recorded for these values is replayed from the disk instead, and a new
+        trace is stored once its recording is finished.
+        :param algorithm: function, the function of a registered algorithm.
         :param win: pygame.display.
+        :param name: str / None, the name the algorithm is registered under.
+        :return: Trace / MappedTrace, a Trace that is still growing if the algorithm runs in a worker process.
+        """
+        self.cancel()
+        self.error = None
+        values = self.arr.get_values()
+        trace = None
+        if self.cache is not None and name is not None:
+            trace = self.cache.get(name, values)
+        # the operations are counted as they are replayed, the recursion depth is only known from the recording.
+        self.counters = Counters()
+        if trace is not None:
+            self.counters.max_depth = trace.get_max_depth()
+            self.play_trace(trace, win)
+        elif name is not None:
+            recorder = TraceRecorder(name, values)
+            recorder.start()
+            trace = recorder.get_trace()
+            self.play_trace(trace, win, recorder)
+        else:
+            traced_arr = TracedArray(values)
+            try:
+                algorithm(traced_arr)
+            except Exception as exception:
+                # the operations before the exception are still replayed, like those of a failed worker.
+                self.error = f"{type(exception).__name__}: {exception}"
+            trace = traced_arr.get_trace()
+            self.counters.max_depth = traced_arr.max_depth
+            self.play_trace(trace, win)
+        return trace
+
+    def finish_recording(self):
+        """
+        This function ends the recording in progress once its worker is done: the recursion depth is known and the
+        trace is stored in the cache, unless the algorithm failed, in which case its error is kept to be shown.
         :return: None.
         """
-        largest_value = root_index
-        left = largest_value * 2 + 1
-        right = largest_value * 2 + 2
-        if left < size and self.arr[root_index] < self.arr[left]:
-            largest_value = left
-        if right < size and self.arr[largest_value] < self.arr[right]:
-            largest_value = right
-        if largest_value != root_index:
-            self.swap(root_index, largest_value)
-            self.print_arr(win)
-            time.sleep(0.01)
-            self.heapify(size, largest_value, win)
-
-    def heap_sort(self, win):
-        """
-        This function sorts the array by using the 'heap sort' algorithm.
+        recorder, self.recorder = self.recorder, None
+        self.counters.max_depth = recorder.get_max_depth()
+        self.error = recorder.get_error()
+        if self.cache is not None and not recorder.has_failed():
+            trace = recorder.get_trace()
+            self.cache.put(recorder.name, trace.get_initial(), trace, recorder.get_max_depth())
+        recorder.stop()
+
+    def run_race(self, win):
+        """
+        This function starts a race of the race algorithms on the values of the array, every algorithm sorts its own
+        copy in a worker process and the lanes are replayed side by side.
         :param win: pygame.display.
-        :return: None.
+        :return: Race.
         """
-        size = len(self.arr)
-        for i in range((size // 2) - 1, -1, -1):
-            self.heapify(size, i, win)
+        self.cancel()
+        self.timeline = None
+        self.race = Race(self.race_algorithms, self.arr.values, self.background, self.arr.get_rect())
+        self.playback = self.race.frames(self, win)
+        return self.race
 
-        for i in range(size - 1, 0, -1):
-            self.swap(i, 0)
-            self.heapify(i, 0, win)
+    def is_playing(self):
+        """
+        check if a replay is in progress.
+        :return: bool.
+        """
+        return self.playback is not None
 
-    def insertion_sort(self, win):
+    def advance(self):
         """
-        This function sorts the array by using the 'inserting sort' algorithm.
-        :param win: pygame.display.
-        :return: None.
+        This function replays the next frame of the replay in progress.
+        :return: bool, False once the replay is over.
         """
-        for i in range(1, len(self.arr)):
-            key = self.arr[i]
-            j = i - 1
-            while j >= 0 and key < self.arr[j]:
-                self.arr[j + 1] = self.arr[j]
-                self.update_x_start_and_end(j + 1)
-                self.print_arr(win)
-                j -= 1
-            self.arr[j + 1] = key
-            self.update_x_start_and_end(j + 1)
-            self.print_arr(win)
-
-    def bucket_sort(self, win):
-        """
-        This function sorts the array by using the 'bucket sort' algorithm.
-        :param win: pygame.display.
-        :return: None.
+        if self.playback is None:
+            return False
+        try:
+            next(self.playback)
+        except StopIteration:
+            self.playback = None
+        if self.recorder is not None and self.recorder.is_finished():
+            self.finish_recording()
+        return self.playback is not None
+
+    def cancel(self):
         """
-        bucket_size = 100
-        minimum = maximum = self.arr[0]
-        for i in range(1, len(self.arr)):
-            if self.arr[i] < minimum:
-                minimum = self.arr[i]
-            elif self.arr[i] > maximum:
-                maximum = self.arr[i]
-        num_of_buckets = ((minimum.get_end().get_y() - maximum.get_end().get_y()) // bucket_size) + 1
-        buckets = []
-        for i in range(num_of_buckets):
-            buckets.append([])
-        for i in range(0, len(self.arr)):
-            # create the buckets.
-            buckets[(self.arr[i].get_end().get_y() - maximum.get_end().get_y()) // bucket_size].append(self.arr[i])
-            time.sleep(0.02)
-        k = 0
-        for i in range(len(buckets) - 1, - 1, -1):
-            # sort each bucket.
-            self.bucket_sort_helper(buckets[i])
-            time.sleep(0.02)
-            for j in range(len(buckets[i]) - 1, - 1, -1):
-                # update the array.
-                self.arr[k] = buckets[i][j]
-                self.update_x_start_and_end(k)
-                self.print_arr(win)
-                k += 1
-                time.sleep(0.02)
-
-    def bucket_sort_helper(self, array):
-        """
-        This is a helper function of the 'bucket sort' function, it sorts an array by using
-        the inserting sort algorithm.
-        :param array: list.
+        This function stops the replay in progress and the recording behind it, the array stays as the replay left
+        it.
         :return: None.
         """
-        for i in range(1, len(array)):
-            key = array[i]
-            j = i - 1
-            while j >= 0 and key.get_end().get_y() < array[j].get_end().get_y():
-                array[j + 1] = array[j]
-                j -= 1
-            array[j + 1] = key
+        if self.playback is not None:
+            self.playback.close()
+            self.playback = None
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
 
-    def radix_sort(self, win):
+    def seek(self, win, position):
         """
-        This function sorts the array by using the 'radix sort' algorithm.
+        This function jumps to a position of the last trace. If its replay was over it starts again paused, so the
+        trace can be stepped through from there.
         :param win: pygame.display.
+        :param position: int, the number of operations replayed after the jump.
         :return: None.
         """
-        max1 = min(self.arr).get_end().get_y()
-        exp = 1
-        while max1 / exp > 1:
-            self.counting_sort(exp, win)
-            exp *= 10
-
-    def counting_sort(self, exp, win):
-        """
-        This is a helper function of the radix sort function, it sorts the array by using 'counting sort'
-        on the array according to the exponent provided.
-        :param exp: int.
+        if self.timeline is None or self.race is not None:
+            return
+        position = min(max(position, 0), len(self.timeline))
+        if self.playback is None:
+            self.playback = self.renderer.frames(self, self.timeline.trace, win, self.counters, self.timeline,
+                                                  position, paused=True)
+        else:
+            self.renderer.seek(position)
+
+    def handle_event(self, event, win):
+        """
+        This function handles a key press or a drag on the timeline: escape cancels the replay, the left arrow steps
+        one operation back, page up / page down jump a tenth of the trace, home / end jump to its start / end and the
+        other keys control the scheduler.
+        :param event: pygame.event.Event.
         :param win: pygame.display.
         :return: None.
         """
-        size = len(self.arr)
-        output = [0] * size
-        count = [0] * 10
-        for i in range(size):
-            # counting the amount of times each digit is in the lines.
-            index = self.arr[i].get_end().get_y() / exp
-            count[9 - int(index % 10)] += 1
-        for i in range(1, 10):
-            # update the counts.
-            count[i] += count[i - 1]
-        for i in range(size - 1, -1, -1):
-            # updating the count, output array.
-            index = self.arr[i].get_end().get_y() / exp
-            output[count[9 - int(index % 10)] - 1] = self.arr[i]
-            count[9 - int(index % 10)] -= 1
-        for i in range(size):
-            # update the array.
-            self.arr[i] = output[i]
-            self.update_x_start_and_end(i)
-            self.print_arr(win)
-            time.sleep(0.01)
+        position = self.renderer.get_position()
+        size = len(self.timeline) if self.timeline is not None else 0
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.cancel()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT:
+            self.seek(win, position - 1)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_PAGEUP:
+            self.seek(win, position - max(1, size // 10))
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_PAGEDOWN:
+            self.seek(win, position + max(1, size // 10))
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_HOME:
+            self.seek(win, 0)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_END:
+            self.seek(win, size)
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+            target = self.timeline_bar.get_position(event.pos, size)
+            if target is not None:
+                self.seek(win, target)
+        else:
+            self.renderer.get_scheduler().handle_event(event)
 
     def choose_algorithm(self, win, position):
         """
         This function is responsible for choosing which sorting algorithm to perform on the array by
-        checking which button got clicked and thus deciding which sorting algorithm to perform.
+        checking which button got clicked and looking its name up in the algorithm registry. A click on the timeline
+        jumps to that position of the last trace.
         :param win: pygame.display.
         :param position: tuple.
         :return: None.
         """
-        for button in self.button_handler.get_buttons():
-            if button.clicked_on(position):
-                name = button.get_name()
-                if name == "Quick Sort":
-                    self.quick_sort(0, len(self.arr) - 1, win)
-                elif name == "Merge Sort":
-                    # self.iterative_merge_sort(win) # you can choose to use the iterative merge sort or
-                    # recursive merge sort.
-                    self.merge_sort(self.arr, 0, len(self.arr) - 1, self.arr.copy(), win)
-                elif name == "Selection Sort":
-                    self.selection_sort(win)
-                elif name == "Heap Sort":
-                    self.heap_sort(win)
-                elif name == "Bubble Sort":
-                    self.bubble_sort(win)
-                elif name == "Shuffle Array":
-                    self.update_entire_array_and_shuffle()
-                elif name == "Bucket Sort":
-                    self.bucket_sort(win)
-                elif name == "Insertion Sort":
-                    self.insertion_sort(win)
-                elif name == "Radix Sort":
-                    self.radix_sort(win)
+        button = self.button_handler.get_hovered(position)
+        if button is None:
+            if self.timeline is not None:
+                target = self.timeline_bar.get_position(position, len(self.timeline))
+                if target is not None:
+                    self.seek(win, target)
+            return
+        if button.get_name() == SHUFFLE_BUTTON:
+            self.cancel()
+            self.race = None
+            self.timeline = None
+            self.arr.reset_colors()
+            self.shuffle_array()
+        elif button.get_name() == RACE_BUTTON:
+            self.run_race(win)
+        else:
+            self.run_algorithm(get_algorithm(button.get_name()).get_function(), win, button.get_name())
@@ -0,0 +1,66 @@
+from helper_functions.constants import pixel_backend_threshold
+from animation.pixel_backend import PixelBackend
+
+
+class ArrayView:
+    """
+    The ArrayView draws a BarArray on the window, either bar by bar or, when the array has too many bars for that,
+    all at once with the pixel backend.
+
+    Parameters
+    ----------
+
+    bar_array : BarArray.
+    the array to draw.
+
+    background : BackGround.
+    used to erase the columns that are redrawn.
+
+    Attributes
+    ----------
+
+    self.bar_array : BarArray.
+    self.background : BackGround.
+    self.pixel_backend : PixelBackend, draws the whole array at once when it has too many bars to draw one by one.
+    """
+    def __init__(self, bar_array, background):
+        self.bar_array = bar_array
+        self.background = background
+        self.pixel_backend = PixelBackend(background.get_color())
+
+    def use_pixel_backend(self):
+        """
+        check if the array is large enough to be drawn by the pixel backend instead of bar by bar, or if its bars are
+        closer than a pixel.
+        :return: bool.
+        """
+        return len(self.bar_array) >= pixel_backend_threshold or self.bar_array.gap < 1
+
+    def draw(self, win):
+        """
+        This function draws the whole array, without updating the display.
+        :param win: pygame.display.
+        :return: pygame.Rect, the rectangle of the array.
+        """
+        if self.use_pixel_backend():
+            return self.pixel_backend.draw(win, self.bar_array)
+        self.bar_array.draw_on_board(win)
+        return self.bar_array.get_rect()
+
+    def draw_columns(self, win, indices):
+        """
+        This function erases and redraws only the columns at the indices provided, without updating the display.
+        With the pixel backend the whole array is redrawn, since that costs the same as a few columns.
+        :param win: pygame.display.
+        :param indices: iterable of int.
+        :return: list, the rectangles that were redrawn.
+        """
+        if self.use_pixel_backend():
+            return [self.draw(win)]
+        rects = []
+        for index in indices:
+            rect = self.bar_array.get_column_rect(index)
+            self.background.draw_rect(win, rect)
+            self.bar_array.draw_bar(win, index)
+            rects.append(rect)
+        return rects
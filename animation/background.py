@@ -18,6 +18,13 @@ class BackGround:
     def __init__(self, color):
         self.color = color
 
+    def get_color(self):
+        """
+        return the background color.
+        :return: tuple.
+        """
+        return self.color
+
     def draw(self, win):
         """
         Draw the background to the screen by filling the screen with the background color.
@@ -25,3 +32,12 @@ class BackGround:
         :return: None.
         """
         win.fill(self.color)
+
+    def draw_rect(self, win, rect):
+        """
+        Draw the background only inside the rectangle provided, used to erase a part of the screen.
+        :param win: pygame.display
+        :param rect: pygame.Rect.
+        :return: None.
+        """
+        win.fill(self.color, rect)
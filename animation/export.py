@@ -0,0 +1,489 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import math
+import multiprocessing
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+import numpy as np
+import pygame
+from helper_functions.constants import WHITE, BLACK, WORKER_COLORS, window_size
+from helper_functions.helpers import fit_bar_array
+from animation.array_view import ArrayView
+from animation.background import BackGround
+from animation.registry import get_algorithm
+from animation.trace import COMPARE, SWAP, WRITE, Counters, TracedArray
+from shapes.button import get_font
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# how many frames every worker may have waiting to be encoded, so the rendering does not run far ahead.
+EXPORT_QUEUE = 2
+# the zlib level of the PNG frames.
+PNG_LEVEL = 6
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# the largest numerator and denominator of the delay of an APNG frame.
+APNG_MAX_DELAY = 0xFFFF
+
+
+def get_png_chunk(kind, data):
+    """
+    return a PNG chunk: its length, type, data and checksum.
+    :param kind: bytes, the four letters of the chunk type.
+    :param data: bytes.
+    :return: bytes.
+    """
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def get_png_header(size):
+    """
+    return the IHDR chunk of an 8-bit RGB image of the size provided.
+    :param size: tuple (int, int).
+    :return: bytes.
+    """
+    return get_png_chunk(b"IHDR", struct.pack(">IIBBBBB", size[0], size[1], 8, 2, 0, 0, 0))
+
+
+def get_frame_delay(length, fps):
+    """
+    return how long an APNG frame is shown as a fraction of seconds that fits the 16-bit fields of its control chunk.
+    The fraction is exact when it fits, a frame held longer is rounded to a coarser denominator, and a frame held
+    for more than APNG_MAX_DELAY seconds is shown for APNG_MAX_DELAY seconds.
+    :param length: int, the number of frames the frame lasts.
+    :param fps: int.
+    :return: tuple (int, int), the numerator and the denominator of the delay.
+    """
+    divisor = math.gcd(length, fps)
+    numerator, denominator = length // divisor, fps // divisor
+    if numerator <= APNG_MAX_DELAY and denominator <= APNG_MAX_DELAY:
+        return numerator, denominator
+    seconds = length / fps
+    denominator = max(1, min(denominator, APNG_MAX_DELAY, int(APNG_MAX_DELAY / seconds)))
+    return min(APNG_MAX_DELAY, max(1, round(seconds * denominator))), denominator
+
+
+def compress_frame(data, size, level=PNG_LEVEL):
+    """
+    This function runs in a worker process: it compresses the pixels of a frame as the image data of a PNG.
+    Every row is stored as its difference from the row above (the PNG "up" filter), which turns the vertical bars
+    into long runs of zeros.
+    :param data: bytes, the RGB pixels of the frame, row by row.
+    :param size: tuple (int, int).
+    :param level: int, the zlib level.
+    :return: bytes.
+    """
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(size[1], size[0] * 3)
+    filtered = np.empty((size[1], size[0] * 3 + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    filtered[0, 1:] = rows[0]
+    np.subtract(rows[1:], rows[:-1], out=filtered[1:, 1:])
+    return zlib.compress(filtered.tobytes(), level)
+
+
+def write_png(path, data, size, level=PNG_LEVEL):
+    """
+    This function runs in a worker process: it encodes a frame and writes it as a PNG file.
+    :param path: str.
+    :param data: bytes, the RGB pixels of the frame, row by row.
+    :param size: tuple (int, int).
+    :param level: int, the zlib level.
+    :return: None.
+    """
+    with open(path, "wb") as file:
+        file.write(PNG_SIGNATURE + get_png_header(size) + get_png_chunk(b"IDAT", compress_frame(data, size, level)) +
+                   get_png_chunk(b"IEND", b""))
+
+
+def quantize_frame(data, size):
+    """
+    This function runs in a worker process: it reduces a frame to the 256 colors of a GIF.
+    :param data: bytes, the RGB pixels of the frame, row by row.
+    :param size: tuple (int, int).
+    :return: PIL.Image.Image.
+    """
+    return Image.frombytes("RGB", size, data).quantize(256)
+
+
+class FrameWriter(ABC):
+    """
+    The FrameWriter is the base of the writers that encode the frames in a pool of worker processes. The frames are
+    encoded in parallel but the results are taken in order, and at most a few frames per worker wait in the pool.
+
+    Parameters
+    ----------
+
+    path : str.
+    the file to write.
+
+    size : tuple (int, int).
+    the resolution of the frames.
+
+    fps : int.
+    the frames per second of the animation.
+
+    workers : int.
+    the number of worker processes.
+
+    Attributes
+    ----------
+
+    self.path : str.
+    self.size : tuple (int, int).
+    self.fps : int.
+    self.pool : ProcessPoolExecutor.
+    self.pending : deque of tuple (Future, int), the frames in the pool and how many frames each one lasts.
+    self.limit : int, the most frames waiting in the pool.
+    """
+    def __init__(self, path, size, fps, workers):
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self.pending = deque()
+        self.limit = workers * EXPORT_QUEUE
+
+    @abstractmethod
+    def submit(self, data):
+        """
+        start encoding a frame in the pool.
+        :param data: bytes, the RGB pixels of the frame.
+        :return: Future.
+        """
+
+    def collect(self, result, length):
+        """
+        take the result of an encoded frame, called in the order the frames were added.
+        :param result: the result of the task of the frame.
+        :param length: int, the number of frames the frame lasts.
+        :return: None.
+        """
+
+    def add(self, data, length=1):
+        """
+        add a frame that is shown for the number of frames provided.
+        :param data: bytes, the RGB pixels of the frame.
+        :param length: int.
+        :return: None.
+        """
+        self.pending.append((self.submit(data), length))
+        while len(self.pending) > self.limit:
+            future, length = self.pending.popleft()
+            self.collect(future.result(), length)
+
+    def finish(self):
+        """
+        complete the file once all the frames were collected.
+        :return: None.
+        """
+
+    def close(self):
+        """
+        wait for the frames still in the pool, complete the file and stop the workers.
+        :return: None.
+        """
+        try:
+            while self.pending:
+                future, length = self.pending.popleft()
+                self.collect(future.result(), length)
+            self.finish()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+class PngSequenceWriter(FrameWriter):
+    """
+    The PngSequenceWriter writes every frame as a numbered PNG file next to the path: frames.png is written as
+    frames_00000.png, frames_00001.png and so on. A sequence has no timing, so a frame that lasts several frames is
+    written once.
+
+    Attributes
+    ----------
+
+    self.count : int, the number of frames added.
+    """
+    def __init__(self, path, size, fps, workers):
+        super().__init__(path, size, fps, workers)
+        self.count = 0
+
+    def submit(self, data):
+        """
+        start writing a frame to the next file of the sequence.
+        :param data: bytes.
+        :return: Future.
+        """
+        stem, extension = os.path.splitext(self.path)
+        path = f"{stem}_{self.count:05d}{extension}"
+        self.count += 1
+        return self.pool.submit(write_png, path, data, self.size)
+
+
+class ApngWriter(FrameWriter):
+    """
+    The ApngWriter writes the frames as an animated PNG, which most browsers play and which keeps every pixel exact.
+    The workers compress the frames and the chunks are written as the frames are collected. The number of frames is
+    only known at the end, so it is written over a placeholder when the file is complete.
+
+    Attributes
+    ----------
+
+    self.file : file, the file being written.
+    self.control : int, the offset of the animation control chunk.
+    self.sequence : int, the sequence number of the next frame chunk.
+    self.count : int, the number of frames collected.
+    """
+    def __init__(self, path, size, fps, workers):
+        super().__init__(path, size, fps, workers)
+        self.file = open(path, "wb")
+        self.file.write(PNG_SIGNATURE + get_png_header(size))
+        self.control = self.file.tell()
+        self.file.write(get_png_chunk(b"acTL", struct.pack(">II", 0, 0)))
+        self.sequence = 0
+        self.count = 0
+
+    def submit(self, data):
+        """
+        start compressing a frame.
+        :param data: bytes.
+        :return: Future.
+        """
+        return self.pool.submit(compress_frame, data, self.size)
+
+    def collect(self, result, length):
+        """
+        write the control chunk and the compressed data of a frame.
+        :param result: bytes, the compressed frame.
+        :param length: int.
+        :return: None.
+        """
+        control = struct.pack(">IIIIIHHBB", self.sequence, self.size[0], self.size[1], 0, 0,
+                              *get_frame_delay(length, self.fps), 0, 0)
+        self.file.write(get_png_chunk(b"fcTL", control))
+        self.sequence += 1
+        if self.count == 0:
+            # the first frame is the default image as well, shown by viewers that do not support animation.
+            self.file.write(get_png_chunk(b"IDAT", result))
+        else:
+            self.file.write(get_png_chunk(b"fdAT", struct.pack(">I", self.sequence) + result))
+            self.sequence += 1
+        self.count += 1
+
+    def finish(self):
+        """
+        end the file and write the number of frames over the placeholder.
+        :return: None.
+        """
+        self.file.write(get_png_chunk(b"IEND", b""))
+        self.file.seek(self.control)
+        self.file.write(get_png_chunk(b"acTL", struct.pack(">II", self.count, 0)))
+
+    def close(self):
+        """
+        complete the file and close it.
+        :return: None.
+        """
+        try:
+            super().close()
+        finally:
+            self.file.close()
+
+
+class GifWriter(FrameWriter):
+    """
+    The GifWriter writes the frames as a GIF with Pillow, for when ffmpeg is not installed. The workers reduce the
+    frames to 256 colors and Pillow writes them at the end.
+
+    Attributes
+    ----------
+
+    self.frames : list of PIL.Image.Image.
+    self.durations : list of int, how long every frame is shown, in milliseconds.
+    """
+    def __init__(self, path, size, fps, workers):
+        if Image is None:
+            raise Exception("Exporting a GIF needs ffmpeg on the PATH or the Pillow package")
+        super().__init__(path, size, fps, workers)
+        self.frames = []
+        self.durations = []
+
+    def submit(self, data):
+        """
+        start reducing the colors of a frame.
+        :param data: bytes.
+        :return: Future.
+        """
+        return self.pool.submit(quantize_frame, data, self.size)
+
+    def collect(self, result, length):
+        """
+        keep a frame and its duration.
+        :param result: PIL.Image.Image.
+        :param length: int.
+        :return: None.
+        """
+        self.frames.append(result)
+        self.durations.append(round(1000 * length / self.fps))
+
+    def finish(self):
+        """
+        write all the frames.
+        :return: None.
+        """
+        if self.frames:
+            self.frames[0].save(self.path, save_all=True, append_images=self.frames[1:], duration=self.durations,
+                                loop=0)
+
+
+class FfmpegWriter:
+    """
+    The FfmpegWriter pipes the raw frames to an ffmpeg process, which encodes them in its own threads into any
+    format it supports (the format follows the extension of the path).
+
+    Parameters
+    ----------
+
+    path : str.
+    size : tuple (int, int).
+    fps : int.
+
+    Attributes
+    ----------
+
+    self.process : subprocess.Popen.
+    """
+    def __init__(self, path, size, fps):
+        command = [shutil.which("ffmpeg"), "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                   "-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-"]
+        if not path.lower().endswith(".gif"):
+            # most players only play yuv420p, which needs an even width and height.
+            command += ["-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+
+    def add(self, data, length=1):
+        """
+        add a frame that is shown for the number of frames provided.
+        :param data: bytes, the RGB pixels of the frame.
+        :param length: int.
+        :return: None.
+        """
+        for _ in range(length):
+            self.process.stdin.write(data)
+
+    def close(self):
+        """
+        wait for ffmpeg to encode the last frames.
+        :return: None.
+        """
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise Exception(f"ffmpeg failed with exit code {self.process.returncode}")
+
+
+def create_writer(path, size, fps, workers):
+    """
+    This function creates the writer of the format of the path: PNG frames and animated PNG are encoded by the
+    workers, GIF and the video formats by ffmpeg, and GIF by Pillow in the workers if ffmpeg is not installed.
+    :param path: str.
+    :param size: tuple (int, int).
+    :param fps: int.
+    :param workers: int.
+    :return: FrameWriter / FfmpegWriter.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".png":
+        return PngSequenceWriter(path, size, fps, workers)
+    if extension == ".apng":
+        return ApngWriter(path, size, fps, workers)
+    if shutil.which("ffmpeg") is not None:
+        return FfmpegWriter(path, size, fps)
+    if extension == ".gif":
+        return GifWriter(path, size, fps, workers)
+    raise Exception(f"Exporting to {extension} needs ffmpeg on the PATH, export to .png, .apng or .gif instead")
+
+
+def draw_frame(surface, view, name, counters, label_height):
+    """
+    This function draws a whole frame: the array and a line with the name of the algorithm and its counters.
+    :param surface: pygame.Surface.
+    :param view: ArrayView.
+    :param name: str.
+    :param counters: Counters.
+    :param label_height: int.
+    :return: bytes, the RGB pixels of the frame.
+    """
+    view.background.draw(surface)
+    view.draw(surface)
+    label = f"{name} - comparisons: {counters.comparisons}  swaps: {counters.swaps}  writes: {counters.writes}"
+    surface.blit(get_font(label_height).render(label, 1, BLACK), (label_height, label_height // 2))
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def export_animation(name, values, path, size=window_size, fps=30, duration=10.0, hold=1.0, workers=None):
+    """
+    This function records an algorithm and renders its replay off-screen into a video, an animated image or PNG
+    frames, as fast as the frames can be drawn: nothing waits for a clock or the display. The operations are spread
+    evenly over the duration, every frame is drawn in full and the frames are encoded in worker processes (or by
+    ffmpeg) while the next ones are drawn.
+    :param name: str, the name of a registered algorithm.
+    :param values: list.
+    :param path: str, the format follows the extension.
+    :param size: tuple (int, int), the resolution of the frames.
+    :param fps: int.
+    :param duration: float, the seconds the replay of the operations takes.
+    :param hold: float, the seconds the sorted array is shown at the end.
+    :param workers: int / None, the number of worker processes that encode the frames, the number of cores if None.
+    :return: int, the number of frames of the animation at fps, the frames of the hold included.
+    """
+    traced_arr = TracedArray(values)
+    get_algorithm(name).get_function()(traced_arr)
+    trace = traced_arr.get_trace()
+    pygame.font.init()
+    surface = pygame.Surface(size)
+    label_height = max(14, size[1] // 30)
+    margin = label_height
+    bar_array = fit_bar_array(np.array(values), margin, size[0] - margin, 2 * label_height, size[1] - margin)
+    view = ArrayView(bar_array, BackGround(WHITE))
+    counters = Counters()
+    counters.max_depth = traced_arr.max_depth
+    marks = trace.get_worker_marks()
+    mark = 0
+    worker = None
+    step = max(1, -(-len(trace) // max(1, round(duration * fps))))
+    writer = create_writer(path, size, fps, workers or os.cpu_count() or 1)
+    frames = 0
+    try:
+        data = draw_frame(surface, view, name, counters, label_height)
+        for start in range(0, len(trace), step):
+            writer.add(data)
+            frames += 1
+            for index in range(start, min(len(trace), start + step)):
+                while mark < len(marks) and marks[mark][0] <= index:
+                    worker = marks[mark][1]
+                    mark += 1
+                code, first, second = trace[index]
+                counters.add_operation(code)
+                if code == COMPARE:
+                    continue
+                if code == SWAP:
+                    bar_array.swap(first, second)
+                elif code == WRITE:
+                    bar_array[first] = second
+                if worker is not None:
+                    color = WORKER_COLORS[worker % len(WORKER_COLORS)]
+                    bar_array.set_color(first, color)
+                    if code == SWAP:
+                        bar_array.set_color(second, color)
+            data = draw_frame(surface, view, name, counters, label_height)
+        # the last frame is shown for all the frames of the hold, so they count like the frames before it.
+        hold_frames = max(1, round(hold * fps))
+        writer.add(data, hold_frames)
+        frames += hold_frames
+    finally:
+        writer.close()
+    return frames
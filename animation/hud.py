@@ -0,0 +1,106 @@
+from shapes.button import get_font
+import pygame
+
+
+class Hud:
+    """
+    The Hud shows the counters of the algorithm that is being replayed as a column of text next to the array.
+
+    Parameters
+    ----------
+
+    x : int.
+    top left point x-coordinate.
+
+    y : int.
+    top left point y-coordinate.
+
+    width : int.
+    width of the text column.
+
+    line_height : int.
+    height of a line of text.
+
+    color : tuple.
+    color of the text.
+
+    background : BackGround.
+    used to erase the previous text.
+
+    Attributes
+    ----------
+
+    self.x : int.
+    self.y : int.
+    self.width : int.
+    self.line_height : int.
+    self.color : tuple.
+    self.background : BackGround.
+    self.size : int, the number of lines drawn last, erased before the next ones are drawn.
+    """
+    def __init__(self, x, y, width, line_height, color, background):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.line_height = line_height
+        self.color = color
+        self.background = background
+        self.size = 0
+
+    def get_lines(self, counters):
+        """
+        return the text lines that describe the counters.
+        :param counters: Counters.
+        :return: list of str.
+        """
+        return [
+            f"comparisons: {counters.comparisons}",
+            f"swaps: {counters.swaps}",
+            f"writes: {counters.writes}",
+            f"max depth: {counters.max_depth}",
+            f"render: {counters.render_seconds * 1000:.0f} ms",
+            f"waiting: {counters.wait_seconds * 1000:.0f} ms",
+        ]
+
+    def wrap(self, line, font):
+        """
+        split a line of text into lines that fit the width of the hud, at spaces when it can.
+        :param line: str.
+        :param font: pygame.font.Font.
+        :return: list of str.
+        """
+        lines = []
+        for word in line.split(" "):
+            if lines and font.size(f"{lines[-1]} {word}")[0] <= self.width:
+                lines[-1] = f"{lines[-1]} {word}"
+            else:
+                lines.append(word)
+        return lines
+
+    def get_rect(self, size):
+        """
+        return the rectangle covered by a hud with the number of lines provided.
+        :param size: int, number of lines.
+        :return: pygame.Rect.
+        """
+        return pygame.Rect(self.x, self.y, self.width, self.line_height * size)
+
+    def draw(self, win, counters, status=()):
+        """
+        erase the previous text and draw the counters, without updating the display.
+        :param win: pygame.display.
+        :param counters: Counters / None, only the status is drawn if None.
+        :param status: list of str, extra lines to show under the counters, wrapped to the width of the hud.
+        :return: pygame.Rect, the rectangle that was drawn.
+        """
+        font = get_font(self.line_height)
+        lines = (self.get_lines(counters) if counters is not None else []) + [
+            part for line in status for part in self.wrap(line, font)]
+        # the status may have fewer lines than the last time, so the lines drawn last are erased too.
+        rect = self.get_rect(max(len(lines), self.size))
+        self.size = len(lines)
+        self.background.draw_rect(win, rect)
+        for i, line in enumerate(lines):
+            win.blit(font.render(line, 1, self.color), (self.x, self.y + i * self.line_height),
+                     (0, 0, self.width, self.line_height))
+        return rect
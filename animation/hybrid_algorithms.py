@@ -0,0 +1,738 @@
+from animation.registry import register
+from animation.algorithms import partition, sort_three, heap_sort_range, insertion_sort_range
+
+# ranges of this size or smaller are finished with insertion sort by introsort.
+INTRO_SORT_THRESHOLD = 16
+# ranges smaller than this are finished with insertion sort by pdqsort.
+PDQ_INSERTION_SORT_THRESHOLD = 24
+# ranges larger than this use the ninther (median of medians of three) as the pdqsort pivot.
+PDQ_NINTHER_THRESHOLD = 128
+# the number of moves after which pdqsort gives up on finishing a range with insertion sort.
+PDQ_PARTIAL_INSERTION_SORT_LIMIT = 8
+# arrays smaller than this are sorted by timsort with a single binary insertion sort.
+TIM_SORT_MIN_MERGE = 32
+# the number of consecutive wins of a run after which timsort starts galloping.
+TIM_SORT_MIN_GALLOP = 7
+
+# The functions in this module work on half open ranges [lo, hi) of the array.
+
+
+@register("Intro Sort", stable=False, in_place=True, complexity="O(n log n)")
+def intro_sort(arr):
+    """
+    This function sorts the array by using the 'introsort' algorithm: quick sort with a median of three pivot that
+    falls back to heap sort when the recursion gets too deep, and finishes small ranges with insertion sort.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    size = len(arr)
+    if size > 1:
+        intro_sort_loop(arr, 0, size, 2 * (size.bit_length() - 1))
+
+
+def intro_sort_loop(arr, lo, hi, depth_limit):
+    """
+    This is a helper function of the introsort function, it sorts the range.
+    It recurses into the smaller side of every partition and loops on the larger one, so the stack stays O(log n).
+    :param arr: TracedArray.
+    :param lo: int.
+    :param hi: int.
+    :param depth_limit: int, the number of partitions left before switching to heap sort.
+    :return: None.
+    """
+    while hi - lo > INTRO_SORT_THRESHOLD:
+        if depth_limit == 0:
+            heap_sort_range(arr, lo, hi)
+            return
+        depth_limit -= 1
+        # the median of the first, middle and last values becomes the pivot at the end of the range.
+        middle = lo + (hi - lo) // 2
+        sort_three(arr, lo, middle, hi - 1)
+        arr.swap(middle, hi - 1)
+        pivot = partition(arr, lo, hi - 1)
+        arr.enter()
+        if pivot - lo < hi - pivot - 1:
+            intro_sort_loop(arr, lo, pivot, depth_limit)
+            lo = pivot + 1
+        else:
+            intro_sort_loop(arr, pivot + 1, hi, depth_limit)
+            hi = pivot
+        arr.leave()
+    insertion_sort_range(arr, lo, hi)
+
+
+@register("Pdq Sort", stable=False, in_place=True, complexity="O(n log n), O(n) on many patterns")
+def pdq_sort(arr):
+    """
+    This function sorts the array by using the 'pattern-defeating quicksort' algorithm.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    size = len(arr)
+    if size > 1:
+        pdq_sort_loop(arr, 0, size, size.bit_length() - 1, True)
+
+
+def pdq_partition_right(arr, lo, hi):
+    """
+    This is a helper function of pdqsort, it partitions the range around the pivot at lo so that the values equal to
+    the pivot go to the right.
+    :param arr: TracedArray.
+    :param lo: int.
+    :param hi: int.
+    :return: tuple (int, bool), the final index of the pivot and True if the range was already partitioned.
+    """
+    first = lo + 1
+    while arr.less(first, lo):
+        first += 1
+    last = hi
+    if first - 1 == lo:
+        while first < last:
+            last -= 1
+            if arr.less(last, lo):
+                break
+    else:
+        # the pivot is a sentinel, so this loop stops at lo at the latest.
+        last -= 1
+        while not arr.less(last, lo):
+            last -= 1
+    already_partitioned = first >= last
+    while first < last:
+        arr.swap(first, last)
+        first += 1
+        while arr.less(first, lo):
+            first += 1
+        last -= 1
+        while not arr.less(last, lo):
+            last -= 1
+    pivot = first - 1
+    arr.swap(lo, pivot)
+    return pivot, already_partitioned
+
+
+def pdq_partition_left(arr, lo, hi):
+    """
+    This is a helper function of pdqsort, it partitions the range around the pivot at lo so that the values equal to
+    the pivot go to the left. It is used when the pivot equals the value before the range, so all of those values are
+    already in their final place.
+    :param arr: TracedArray.
+    :param lo: int.
+    :param hi: int.
+    :return: int, the final index of the pivot.
+    """
+    first = lo
+    last = hi - 1
+    while arr.less(lo, last):
+        last -= 1
+    if last == hi - 1:
+        while first < last:
+            first += 1
+            if arr.less(lo, first):
+                break
+    else:
+        # the value after last is larger than the pivot, so this loop stops there at the latest.
+        first += 1
+        while not arr.less(lo, first):
+            first += 1
+    while first < last:
+        arr.swap(first, last)
+        last -= 1
+        while arr.less(lo, last):
+            last -= 1
+        first += 1
+        while not arr.less(lo, first):
+            first += 1
+    arr.swap(lo, last)
+    return last
+
+
+def pdq_partial_insertion_sort(arr, lo, hi):
+    """
+    This is a helper function of pdqsort, it tries to sort the range with insertion sort but gives up after a few
+    moves, which finishes ranges that are already (almost) sorted in linear time.
+    :param arr: TracedArray.
+    :param lo: int.
+    :param hi: int.
+    :return: bool, True if the range got sorted.
+    """
+    moves = 0
+    for i in range(lo + 1, hi):
+        if moves > PDQ_PARTIAL_INSERTION_SORT_LIMIT:
+            return False
+        if arr.less(i, i - 1):
+            key = arr[i]
+            j = i - 1
+            arr.write(i, arr[j])
+            while j > lo and arr.value_less_than(key, j - 1):
+                arr.write(j, arr[j - 1])
+                j -= 1
+            arr.write(j, key)
+            moves += i - j
+    return True
+
+
+def pdq_break_patterns(arr, lo, pivot, hi):
+    """
+    This is a helper function of pdqsort, after a highly unbalanced partition it swaps a few values around to break
+    the pattern that caused it.
+    :param arr: TracedArray.
+    :param lo: int.
+    :param pivot: int, the final index of the pivot.
+    :param hi: int.
+    :return: None.
+    """
+    left_size = pivot - lo
+    right_size = hi - pivot - 1
+    if left_size >= PDQ_INSERTION_SORT_THRESHOLD:
+        arr.swap(lo, lo + left_size // 4)
+        arr.swap(pivot - 1, pivot - left_size // 4)
+        if left_size > PDQ_NINTHER_THRESHOLD:
+            arr.swap(lo + 1, lo + left_size // 4 + 1)
+            arr.swap(lo + 2, lo + left_size // 4 + 2)
+            arr.swap(pivot - 2, pivot - (left_size // 4 + 1))
+            arr.swap(pivot - 3, pivot - (left_size // 4 + 2))
+    if right_size >= PDQ_INSERTION_SORT_THRESHOLD:
+        arr.swap(pivot + 1, pivot + 1 + right_size // 4)
+        arr.swap(hi - 1, hi - right_size // 4)
+        if right_size > PDQ_NINTHER_THRESHOLD:
+            arr.swap(pivot + 2, pivot + 2 + right_size // 4)
+            arr.swap(pivot + 3, pivot + 3 + right_size // 4)
+            arr.swap(hi - 2, hi - (1 + right_size // 4))
+            arr.swap(hi - 3, hi - (2 + right_size // 4))
+
+
+def pdq_sort_loop(arr, lo, hi, bad_allowed, leftmost):
+    """
+    This is a helper function of pdqsort, it sorts the range.
+    :param arr: TracedArray.
+    :param lo: int.
+    :param hi: int.
+    :param bad_allowed: int, the number of highly unbalanced partitions left before switching to heap sort.
+    :param leftmost: bool, True if the range starts at the beginning of the array (has no value before it).
+    :return: None.
+    """
+    while True:
+        size = hi - lo
+        if size < PDQ_INSERTION_SORT_THRESHOLD:
+            insertion_sort_range(arr, lo, hi)
+            return
+        # choose the pivot and move it to lo.
+        half = size // 2
+        if size > PDQ_NINTHER_THRESHOLD:
+            sort_three(arr, lo, lo + half, hi - 1)
+            sort_three(arr, lo + 1, lo + half - 1, hi - 2)
+            sort_three(arr, lo + 2, lo + half + 1, hi - 3)
+            sort_three(arr, lo + half - 1, lo + half, lo + half + 1)
+            arr.swap(lo, lo + half)
+        else:
+            sort_three(arr, lo + half, lo, hi - 1)
+        # if the pivot equals the value before the range, the values equal to it are already in place.
+        if not leftmost and not arr.less(lo - 1, lo):
+            lo = pdq_partition_left(arr, lo, hi) + 1
+            continue
+        pivot, already_partitioned = pdq_partition_right(arr, lo, hi)
+        left_size = pivot - lo
+        right_size = hi - pivot - 1
+        if left_size < size // 8 or right_size < size // 8:
+            bad_allowed -= 1
+            if bad_allowed == 0:
+                heap_sort_range(arr, lo, hi)
+                return
+            pdq_break_patterns(arr, lo, pivot, hi)
+        elif already_partitioned and pdq_partial_insertion_sort(arr, lo, pivot) and \
+                pdq_partial_insertion_sort(arr, pivot + 1, hi):
+            return
+        arr.enter()
+        pdq_sort_loop(arr, lo, pivot, bad_allowed, leftmost)
+        arr.leave()
+        lo = pivot + 1
+        leftmost = False
+
+
+@register("Tim Sort", stable=True, in_place=False, complexity="O(n log n), O(n) on runs")
+def tim_sort(arr):
+    """
+    This function sorts the array by using the 'timsort' algorithm.
+    :param arr: TracedArray.
+    :return: None.
+    """
+    TimSort(arr).sort()
+
+
+class TimSort:
+    """
+    The TimSort class holds the state of a timsort run: the stack of pending runs and the galloping threshold.
+    Natural runs are found (and extended to a minimum length with binary insertion sort), pushed on the stack and
+    merged while keeping the run lengths balanced. The merges switch to galloping (exponential search) when one run
+    keeps winning, which merges runs with little interleaving in far fewer comparisons.
+
+    Parameters
+    ----------
+
+    arr : TracedArray.
+    the array to sort.
+
+    Attributes
+    ----------
+
+    self.arr : TracedArray.
+    self.runs : list, the pending runs as [start, length] pairs.
+    self.min_gallop : int, the number of consecutive wins after which the merges start galloping.
+    """
+    def __init__(self, arr):
+        self.arr = arr
+        self.runs = []
+        self.min_gallop = TIM_SORT_MIN_GALLOP
+
+    def sort(self):
+        """
+        sort the array.
+        :return: None.
+        """
+        size = len(self.arr)
+        if size < 2:
+            return
+        if size < TIM_SORT_MIN_MERGE:
+            run_length = self.count_run(0, size)
+            self.binary_insertion_sort(0, size, run_length)
+            return
+        min_run = self.get_min_run(size)
+        lo = 0
+        while lo < size:
+            run_length = self.count_run(lo, size)
+            if run_length < min_run:
+                forced = min(size - lo, min_run)
+                self.binary_insertion_sort(lo, lo + forced, lo + run_length)
+                run_length = forced
+            self.runs.append([lo, run_length])
+            self.merge_collapse()
+            lo += run_length
+        self.merge_force_collapse()
+
+    @staticmethod
+    def get_min_run(size):
+        """
+        return the minimum run length, chosen so the number of runs is a power of two or slightly less.
+        :param size: int.
+        :return: int.
+        """
+        remainder = 0
+        while size >= TIM_SORT_MIN_MERGE:
+            remainder |= size & 1
+            size >>= 1
+        return size + remainder
+
+    def count_run(self, lo, hi):
+        """
+        return the length of the run that starts at lo, a strictly descending run is reversed in place.
+        :param lo: int.
+        :param hi: int.
+        :return: int.
+        """
+        arr = self.arr
+        run_hi = lo + 1
+        if run_hi == hi:
+            return 1
+        if arr.less(run_hi, lo):
+            run_hi += 1
+            while run_hi < hi and arr.less(run_hi, run_hi - 1):
+                run_hi += 1
+            i, j = lo, run_hi - 1
+            while i < j:
+                arr.swap(i, j)
+                i += 1
+                j -= 1
+        else:
+            run_hi += 1
+            while run_hi < hi and not arr.less(run_hi, run_hi - 1):
+                run_hi += 1
+        return run_hi - lo
+
+    def binary_insertion_sort(self, lo, hi, start):
+        """
+        sort the range with binary insertion sort, the values in [lo, start) are already sorted.
+        :param lo: int.
+        :param hi: int.
+        :param start: int.
+        :return: None.
+        """
+        arr = self.arr
+        for i in range(start, hi):
+            key = arr[i]
+            left, right = lo, i
+            while left < right:
+                middle = (left + right) // 2
+                if arr.value_less_than(key, middle):
+                    right = middle
+                else:
+                    left = middle + 1
+            for k in range(i, left, -1):
+                arr.write(k, arr[k - 1])
+            if left != i:
+                arr.write(left, key)
+
+    def merge_collapse(self):
+        """
+        merge the runs on the stack until their lengths decrease faster than the fibonacci numbers.
+        :return: None.
+        """
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+                    (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+            elif runs[n][1] > runs[n + 1][1]:
+                return
+            self.merge_at(n)
+
+    def merge_force_collapse(self):
+        """
+        merge all the runs on the stack.
+        :return: None.
+        """
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            self.merge_at(n)
+
+    def merge_at(self, i):
+        """
+        merge the runs at positions i and i + 1 of the stack.
+        :param i: int.
+        :return: None.
+        """
+        arr = self.arr
+        start1, length1 = self.runs[i]
+        start2, length2 = self.runs[i + 1]
+        self.runs[i][1] = length1 + length2
+        del self.runs[i + 1]
+        # the values of the first run that are smaller than the first value of the second run are already in place.
+        k = self.gallop_right(arr[start2], arr, start1, length1, 0)
+        start1 += k
+        length1 -= k
+        if length1 == 0:
+            return
+        # the same goes for the values of the second run that are larger than the last value of the first run.
+        length2 = self.gallop_left(arr[start1 + length1 - 1], arr, start2, length2, length2 - 1)
+        if length2 == 0:
+            return
+        if length1 <= length2:
+            self.merge_low(start1, length1, start2, length2)
+        else:
+            self.merge_high(start1, length1, start2, length2)
+
+    def key_less(self, key, values, index):
+        """
+        compare a key to a value of the array or of the temporary buffer.
+        :param key: int / float.
+        :param values: TracedArray / list.
+        :param index: int.
+        :return: bool, True if the key is smaller than the value at the index.
+        """
+        if values is self.arr:
+            return self.arr.value_less_than(key, index)
+        return self.arr.values_less(key, values[index])
+
+    def less_than_key(self, values, index, key):
+        """
+        compare a value of the array or of the temporary buffer to a key.
+        :param values: TracedArray / list.
+        :param index: int.
+        :param key: int / float.
+        :return: bool, True if the value at the index is smaller than the key.
+        """
+        if values is self.arr:
+            return self.arr.less_than_value(index, key)
+        return self.arr.values_less(values[index], key)
+
+    def gallop_left(self, key, values, base, length, hint):
+        """
+        return the position in the sorted range [base, base + length) where the key would be inserted before all the
+        values equal to it, searching exponentially from the hint.
+        :param key: int / float.
+        :param values: TracedArray / list.
+        :param base: int.
+        :param length: int.
+        :param hint: int, where to start the search, relative to base.
+        :return: int, relative to base.
+        """
+        last_offset = 0
+        offset = 1
+        if self.less_than_key(values, base + hint, key):
+            max_offset = length - hint
+            while offset < max_offset and self.less_than_key(values, base + hint + offset, key):
+                last_offset = offset
+                offset = offset * 2 + 1
+            offset = min(offset, max_offset)
+            last_offset += hint
+            offset += hint
+        else:
+            max_offset = hint + 1
+            while offset < max_offset and not self.less_than_key(values, base + hint - offset, key):
+                last_offset = offset
+                offset = offset * 2 + 1
+            offset = min(offset, max_offset)
+            last_offset, offset = hint - offset, hint - last_offset
+        last_offset += 1
+        while last_offset < offset:
+            middle = last_offset + (offset - last_offset) // 2
+            if self.less_than_key(values, base + middle, key):
+                last_offset = middle + 1
+            else:
+                offset = middle
+        return offset
+
+    def gallop_right(self, key, values, base, length, hint):
+        """
+        return the position in the sorted range [base, base + length) where the key would be inserted after all the
+        values equal to it, searching exponentially from the hint.
+        :param key: int / float.
+        :param values: TracedArray / list.
+        :param base: int.
+        :param length: int.
+        :param hint: int, where to start the search, relative to base.
+        :return: int, relative to base.
+        """
+        last_offset = 0
+        offset = 1
+        if self.key_less(key, values, base + hint):
+            max_offset = hint + 1
+            while offset < max_offset and self.key_less(key, values, base + hint - offset):
+                last_offset = offset
+                offset = offset * 2 + 1
+            offset = min(offset, max_offset)
+            last_offset, offset = hint - offset, hint - last_offset
+        else:
+            max_offset = length - hint
+            while offset < max_offset and not self.key_less(key, values, base + hint + offset):
+                last_offset = offset
+                offset = offset * 2 + 1
+            offset = min(offset, max_offset)
+            last_offset += hint
+            offset += hint
+        last_offset += 1
+        while last_offset < offset:
+            middle = last_offset + (offset - last_offset) // 2
+            if self.key_less(key, values, base + middle):
+                offset = middle
+            else:
+                last_offset = middle + 1
+        return offset
+
+    def merge_low(self, start1, length1, start2, length2):
+        """
+        merge two adjacent runs from left to right, the first (shorter) run is copied to a temporary buffer.
+        :param start1: int.
+        :param length1: int.
+        :param start2: int.
+        :param length2: int.
+        :return: None.
+        """
+        arr = self.arr
+        temp = [arr[i] for i in range(start1, start1 + length1)]
+        cursor1 = 0
+        cursor2 = start2
+        dest = start1
+        arr.write(dest, arr[cursor2])
+        dest += 1
+        cursor2 += 1
+        length2 -= 1
+        if length2 == 0:
+            for i in range(length1):
+                arr.write(dest + i, temp[cursor1 + i])
+            return
+        if length1 == 1:
+            for i in range(length2):
+                arr.write(dest + i, arr[cursor2 + i])
+            arr.write(dest + length2, temp[cursor1])
+            return
+        min_gallop = self.min_gallop
+        done = False
+        while not done:
+            count1 = count2 = 0
+            # merge one value at a time until one run keeps winning.
+            while True:
+                if arr.less_than_value(cursor2, temp[cursor1]):
+                    arr.write(dest, arr[cursor2])
+                    dest += 1
+                    cursor2 += 1
+                    count2 += 1
+                    count1 = 0
+                    length2 -= 1
+                    if length2 == 0:
+                        done = True
+                        break
+                else:
+                    arr.write(dest, temp[cursor1])
+                    dest += 1
+                    cursor1 += 1
+                    count1 += 1
+                    count2 = 0
+                    length1 -= 1
+                    if length1 == 1:
+                        done = True
+                        break
+                if (count1 | count2) >= min_gallop:
+                    break
+            # gallop until neither run wins by a lot anymore.
+            while not done:
+                count1 = self.gallop_right(arr[cursor2], temp, cursor1, length1, 0)
+                if count1:
+                    for i in range(count1):
+                        arr.write(dest + i, temp[cursor1 + i])
+                    dest += count1
+                    cursor1 += count1
+                    length1 -= count1
+                    if length1 <= 1:
+                        done = True
+                        break
+                arr.write(dest, arr[cursor2])
+                dest += 1
+                cursor2 += 1
+                length2 -= 1
+                if length2 == 0:
+                    done = True
+                    break
+                count2 = self.gallop_left(temp[cursor1], arr, cursor2, length2, 0)
+                if count2:
+                    for i in range(count2):
+                        arr.write(dest + i, arr[cursor2 + i])
+                    dest += count2
+                    cursor2 += count2
+                    length2 -= count2
+                    if length2 == 0:
+                        done = True
+                        break
+                arr.write(dest, temp[cursor1])
+                dest += 1
+                cursor1 += 1
+                length1 -= 1
+                if length1 == 1:
+                    done = True
+                    break
+                min_gallop -= 1
+                if count1 < TIM_SORT_MIN_GALLOP and count2 < TIM_SORT_MIN_GALLOP:
+                    break
+            if not done:
+                min_gallop = max(min_gallop, 0) + 2
+        self.min_gallop = max(min_gallop, 1)
+        if length1 == 1:
+            for i in range(length2):
+                arr.write(dest + i, arr[cursor2 + i])
+            arr.write(dest + length2, temp[cursor1])
+        else:
+            for i in range(length1):
+                arr.write(dest + i, temp[cursor1 + i])
+
+    def merge_high(self, start1, length1, start2, length2):
+        """
+        merge two adjacent runs from right to left, the second (shorter) run is copied to a temporary buffer.
+        :param start1: int.
+        :param length1: int.
+        :param start2: int.
+        :param length2: int.
+        :return: None.
+        """
+        arr = self.arr
+        temp = [arr[i] for i in range(start2, start2 + length2)]
+        cursor1 = start1 + length1 - 1
+        cursor2 = length2 - 1
+        dest = start2 + length2 - 1
+        arr.write(dest, arr[cursor1])
+        dest -= 1
+        cursor1 -= 1
+        length1 -= 1
+        if length1 == 0:
+            for i in range(length2):
+                arr.write(dest - length2 + 1 + i, temp[i])
+            return
+        if length2 == 1:
+            dest -= length1
+            cursor1 -= length1
+            for i in range(length1 - 1, -1, -1):
+                arr.write(dest + 1 + i, arr[cursor1 + 1 + i])
+            arr.write(dest, temp[cursor2])
+            return
+        min_gallop = self.min_gallop
+        done = False
+        while not done:
+            count1 = count2 = 0
+            # merge one value at a time until one run keeps winning.
+            while True:
+                if arr.value_less_than(temp[cursor2], cursor1):
+                    arr.write(dest, arr[cursor1])
+                    dest -= 1
+                    cursor1 -= 1
+                    count1 += 1
+                    count2 = 0
+                    length1 -= 1
+                    if length1 == 0:
+                        done = True
+                        break
+                else:
+                    arr.write(dest, temp[cursor2])
+                    dest -= 1
+                    cursor2 -= 1
+                    count2 += 1
+                    count1 = 0
+                    length2 -= 1
+                    if length2 == 1:
+                        done = True
+                        break
+                if (count1 | count2) >= min_gallop:
+                    break
+            # gallop until neither run wins by a lot anymore.
+            while not done:
+                count1 = length1 - self.gallop_right(temp[cursor2], arr, start1, length1, length1 - 1)
+                if count1:
+                    dest -= count1
+                    cursor1 -= count1
+                    length1 -= count1
+                    for i in range(count1 - 1, -1, -1):
+                        arr.write(dest + 1 + i, arr[cursor1 + 1 + i])
+                    if length1 == 0:
+                        done = True
+                        break
+                arr.write(dest, temp[cursor2])
+                dest -= 1
+                cursor2 -= 1
+                length2 -= 1
+                if length2 == 1:
+                    done = True
+                    break
+                count2 = length2 - self.gallop_left(arr[cursor1], temp, 0, length2, length2 - 1)
+                if count2:
+                    dest -= count2
+                    cursor2 -= count2
+                    length2 -= count2
+                    for i in range(count2):
+                        arr.write(dest + 1 + i, temp[cursor2 + 1 + i])
+                    if length2 <= 1:
+                        done = True
+                        break
+                arr.write(dest, arr[cursor1])
+                dest -= 1
+                cursor1 -= 1
+                length1 -= 1
+                if length1 == 0:
+                    done = True
+                    break
+                min_gallop -= 1
+                if count1 < TIM_SORT_MIN_GALLOP and count2 < TIM_SORT_MIN_GALLOP:
+                    break
+            if not done:
+                min_gallop = max(min_gallop, 0) + 2
+        self.min_gallop = max(min_gallop, 1)
+        if length2 == 1:
+            dest -= length1
+            cursor1 -= length1
+            for i in range(length1 - 1, -1, -1):
+                arr.write(dest + 1 + i, arr[cursor1 + 1 + i])
+            arr.write(dest, temp[cursor2])
+        else:
+            for i in range(length2):
+                arr.write(dest - length2 + 1 + i, temp[i])
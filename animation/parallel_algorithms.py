@@ -0,0 +1,322 @@
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.sharedctypes import RawArray
+import numpy as np
+from animation.registry import register, get_algorithm
+from animation.trace import Trace, TracedArray, NO_INDEX, WRITE
+from animation.algorithms import merge_sort, quick_sort
+
+# every worker gets at least this many values, smaller arrays are sorted by a single process.
+PARALLEL_MIN_CHUNK = 16
+# the number of values per worker that sample sort draws to choose its splitters.
+SAMPLE_SORT_OVERSAMPLING = 32
+# the number of consecutive operations of a worker that are replayed before the next worker's.
+PARALLEL_INTERLEAVE = 16
+
+# the shared buffers of the pool, set in every worker process by set_shared_buffers.
+shared_buffers = ()
+
+
+def set_shared_buffers(*buffers):
+    """
+    This function runs once in every worker process of the pool and keeps the shared buffers it was started with.
+    :param buffers: RawArray.
+    :return: None.
+    """
+    global shared_buffers
+    shared_buffers = buffers
+
+
+def get_worker_count(size, workers=None):
+    """
+    return the number of worker processes to sort an array of the size provided with.
+    worker processes cannot start their own pools, so a single worker is used inside one (for example in a race).
+    :param size: int.
+    :param workers: int / None, the most workers to use, the number of cores if None.
+    :return: int.
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, size // PARALLEL_MIN_CHUNK))
+
+
+def create_pool(workers, buffers):
+    """
+    return a pool of worker processes that share the buffers provided.
+    :param workers: int.
+    :param buffers: list of RawArray.
+    :return: ProcessPoolExecutor.
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=set_shared_buffers, initargs=tuple(buffers))
+
+
+def export_trace(trace, offset=0):
+    """
+    return the operations of a trace recorded in a worker as arrays that can be sent to the main process.
+    :param trace: Trace.
+    :param offset: int, added to the indices, for a trace recorded on a slice of the array.
+    :return: tuple of numpy.ndarray (codes, first, second, written).
+    """
+    codes = np.frombuffer(trace.codes, dtype=np.int8)
+    first = np.frombuffer(trace.first, dtype=np.int64)
+    second = np.frombuffer(trace.second, dtype=np.int64)
+    written = np.frombuffer(trace.written, dtype=np.int64 if trace.written.typecode == 'q' else np.float64)
+    if offset:
+        first = np.where(first != NO_INDEX, first + offset, first)
+        second = np.where((second != NO_INDEX) & (codes != WRITE), second + offset, second)
+    return codes, first, second, written
+
+
+def record_workers(arr, results):
+    """
+    This function appends the traces the workers of a phase recorded to the trace of the array. The phase ran in
+    parallel, so the traces are interleaved a few operations at a time and every operation keeps the worker that
+    recorded it, which the replay shows as the color of the bars.
+    :param arr: TracedArray.
+    :param results: list of tuple (trace arrays, recursion depth), one per worker.
+    :return: None.
+    """
+    codes, first, second, written, workers, blocks = [], [], [], [], [], []
+    written_size = 0
+    for worker, ((worker_codes, worker_first, worker_second, worker_written), depth) in enumerate(results):
+        codes.append(worker_codes)
+        first.append(worker_first)
+        second.append(np.where(worker_codes == WRITE, worker_second + written_size, worker_second))
+        written.append(worker_written)
+        workers.append(np.full(len(worker_codes), worker, dtype=np.int64))
+        blocks.append(np.arange(len(worker_codes)) // PARALLEL_INTERLEAVE)
+        written_size += len(worker_written)
+        arr.max_depth = max(arr.max_depth, depth)
+    workers = np.concatenate(workers)
+    order = np.lexsort((workers, np.concatenate(blocks)))
+    arr.get_trace().extend(np.concatenate(codes)[order], np.concatenate(first)[order],
+                           np.concatenate(second)[order], np.concatenate(written), workers[order])
+
+
+def sort_range_task(name, buffer, lo, hi):
+    """
+    This function runs in a worker process, it sorts the range [lo, hi) of a shared buffer in place with a
+    registered algorithm.
+    :param name: str.
+    :param buffer: int, the position of the buffer in the shared buffers.
+    :param lo: int.
+    :param hi: int.
+    :return: tuple (trace arrays, recursion depth).
+    """
+    values = shared_buffers[buffer]
+    traced_arr = TracedArray(values[lo:hi])
+    get_algorithm(name).get_function()(traced_arr)
+    values[lo:hi] = traced_arr.values
+    return export_trace(traced_arr.get_trace(), lo), traced_arr.max_depth
+
+
+def merge_task(source, target, left_start, left_end, right_start, right_end, start):
+    """
+    This function runs in a worker process, it merges the sorted ranges [left_start, left_end) and
+    [right_start, right_end) of the source buffer into the target buffer from start on. Equal values are taken
+    from the left range first, so the merge is stable.
+    :param source: int, the position of the source buffer in the shared buffers.
+    :param target: int, the position of the target buffer in the shared buffers.
+    :param left_start: int.
+    :param left_end: int.
+    :param right_start: int.
+    :param right_end: int.
+    :param start: int.
+    :return: tuple (trace arrays, recursion depth).
+    """
+    left = shared_buffers[source][left_start:left_end]
+    right = shared_buffers[source][right_start:right_end]
+    trace = Trace(left + right)
+    merged = []
+    i = j = 0
+    while i < len(left) or j < len(right):
+        if i == len(left):
+            value = right[j]
+            j += 1
+        elif j == len(right):
+            value = left[i]
+            i += 1
+        else:
+            trace.compare(NO_INDEX, NO_INDEX)
+            if right[j] < left[i]:
+                value = right[j]
+                j += 1
+            else:
+                value = left[i]
+                i += 1
+        trace.write(start + len(merged), value)
+        merged.append(value)
+    shared_buffers[target][start:start + len(merged)] = merged
+    return export_trace(trace), 0
+
+
+def classify_task(lo, hi, splitters):
+    """
+    This function runs in a worker process, it finds the bucket of every value of the range [lo, hi) of the input
+    buffer with a binary search over the splitters.
+    :param lo: int.
+    :param hi: int.
+    :param splitters: list, sorted.
+    :return: tuple (list of int, the number of values of every bucket, trace arrays).
+    """
+    values = shared_buffers[0][lo:hi]
+    trace = Trace(values)
+    counts = [0] * (len(splitters) + 1)
+    for index, value in enumerate(values):
+        counts[find_bucket(trace, lo + index, value, splitters)] += 1
+    return counts, export_trace(trace)
+
+
+def scatter_task(lo, hi, splitters, offsets):
+    """
+    This function runs in a worker process, it writes every value of the range [lo, hi) of the input buffer to its
+    bucket in the output buffer. Every worker owns a disjoint slice of every bucket, so no two workers write to the
+    same position.
+    :param lo: int.
+    :param hi: int.
+    :param splitters: list, sorted.
+    :param offsets: list of int, the position in the output buffer of the first value of this worker in every bucket.
+    :return: tuple (trace arrays, recursion depth).
+    """
+    values = shared_buffers[0][lo:hi]
+    output = shared_buffers[1]
+    trace = Trace(values)
+    offsets = list(offsets)
+    for value in values:
+        bucket = find_bucket(None, NO_INDEX, value, splitters)
+        trace.write(offsets[bucket], value)
+        output[offsets[bucket]] = value
+        offsets[bucket] += 1
+    return export_trace(trace), 0
+
+
+def find_bucket(trace, index, value, splitters):
+    """
+    This is a helper function of sample sort, it returns the number of splitters that are not larger than the value.
+    :param trace: Trace / None, records the comparisons if provided.
+    :param index: int, the index of the value in the array.
+    :param value: int / float.
+    :param splitters: list, sorted.
+    :return: int.
+    """
+    lo = 0
+    hi = len(splitters)
+    while lo < hi:
+        middle = (lo + hi) // 2
+        if trace is not None:
+            trace.compare(index, NO_INDEX)
+        if value < splitters[middle]:
+            hi = middle
+        else:
+            lo = middle + 1
+    return lo
+
+
+def split_merge(values, left_start, left_end, right_start, right_end, count):
+    """
+    This is a helper function of parallel merge sort, it finds how many values of the left range are among the first
+    count values of the stable merge of the two sorted ranges, so a merge can be split between several workers.
+    :param values: RawArray.
+    :param left_start: int.
+    :param left_end: int.
+    :param right_start: int.
+    :param right_end: int.
+    :param count: int.
+    :return: int.
+    """
+    lo = max(0, count - (right_end - right_start))
+    hi = min(count, left_end - left_start)
+    while lo < hi:
+        i = (lo + hi) // 2
+        if values[left_start + i] <= values[right_start + count - i - 1]:
+            lo = i + 1
+        else:
+            hi = i
+    return lo
+
+
+@register("Parallel Merge Sort", stable=True, in_place=False, complexity="O(n log n / p + n log p)")
+def parallel_merge_sort(arr, workers=None):
+    """
+    This function sorts the array by using a parallel 'merge sort': every worker process sorts its own part of the
+    array with merge sort, then the sorted parts are merged pairwise. Every merge is split between several workers
+    at the points where the merge output divides evenly, so all the workers stay busy until the last merge.
+    The values are shared with the workers through two shared buffers that the merges ping-pong between.
+    :param arr: TracedArray.
+    :param workers: int / None, the most worker processes to use, the number of cores if None.
+    :return: None.
+    """
+    size = len(arr)
+    workers = get_worker_count(size, workers)
+    if workers < 2:
+        merge_sort(arr)
+        return
+    typecode = 'q' if all(isinstance(value, int) for value in arr.values) else 'd'
+    buffers = [RawArray(typecode, arr.values), RawArray(typecode, size)]
+    with create_pool(workers, buffers) as pool:
+        runs = [size * worker // workers for worker in range(workers + 1)]
+        record_workers(arr, list(pool.map(sort_range_task, ["Merge Sort"] * workers, [0] * workers, runs[:-1],
+                                          runs[1:])))
+        source, target = 0, 1
+        while len(runs) > 2:
+            tasks = []
+            pairs = len(runs) // 2
+            for r in range(0, len(runs) - 1, 2):
+                lo, middle = runs[r], runs[r + 1]
+                hi = runs[r + 2] if r + 2 < len(runs) else middle
+                parts = max(1, workers // pairs)
+                splits = [0] + [split_merge(buffers[source], lo, middle, middle, hi, (hi - lo) * part // parts)
+                                for part in range(1, parts)] + [middle - lo]
+                for part in range(parts):
+                    start = (hi - lo) * part // parts
+                    end = (hi - lo) * (part + 1) // parts
+                    tasks.append((source, target, lo + splits[part], lo + splits[part + 1],
+                                  middle + start - splits[part], middle + end - splits[part + 1], lo + start))
+            record_workers(arr, [future.result() for future in [pool.submit(merge_task, *task) for task in tasks]])
+            runs = runs[::2] if runs[::2][-1] == size else runs[::2] + [size]
+            source, target = target, source
+    arr.values[:] = buffers[source]
+
+
+@register("Parallel Sample Sort", stable=False, in_place=False, complexity="O(n log n / p) expected")
+def parallel_sample_sort(arr, workers=None):
+    """
+    This function sorts the array by using a parallel 'sample sort': the splitters of one bucket per worker are
+    chosen from a sorted random sample, every worker finds the buckets of its part of the array, the values are
+    scattered to their buckets in a second buffer, and every worker sorts one bucket with quick sort.
+    :param arr: TracedArray.
+    :param workers: int / None, the most worker processes to use, the number of cores if None.
+    :return: None.
+    """
+    size = len(arr)
+    workers = get_worker_count(size, workers)
+    if workers < 2:
+        quick_sort(arr)
+        return
+    # a fixed seed keeps the trace of a given input reproducible.
+    sample = sorted(random.Random(0).sample(arr.values, min(size, workers * SAMPLE_SORT_OVERSAMPLING)))
+    splitters = [sample[len(sample) * bucket // workers] for bucket in range(1, workers)]
+    typecode = 'q' if all(isinstance(value, int) for value in arr.values) else 'd'
+    buffers = [RawArray(typecode, arr.values), RawArray(typecode, size)]
+    with create_pool(workers, buffers) as pool:
+        parts = [size * worker // workers for worker in range(workers + 1)]
+        results = list(pool.map(classify_task, parts[:-1], parts[1:], [splitters] * workers))
+        record_workers(arr, [(trace, 0) for counts, trace in results])
+        # every worker writes its values of a bucket after the values of the workers before it.
+        bucket_starts = [0]
+        offsets = [[0] * workers for _ in range(workers)]
+        for bucket in range(workers):
+            position = bucket_starts[-1]
+            for worker in range(workers):
+                offsets[worker][bucket] = position
+                position += results[worker][0][bucket]
+            bucket_starts.append(position)
+        record_workers(arr, list(pool.map(scatter_task, parts[:-1], parts[1:], [splitters] * workers, offsets)))
+        record_workers(arr, list(pool.map(sort_range_task, ["Quick Sort"] * workers, [1] * workers,
+                                          bucket_starts[:-1], bucket_starts[1:])))
+    arr.values[:] = buffers[1]
@@ -0,0 +1,110 @@
+import numpy as np
+import pygame
+
+
+class PixelBackend:
+    """
+    The PixelBackend draws the whole bar chart at once: the height of every pixel column is computed from the values
+    with NumPy, the pixels are filled through pygame.surfarray and the chart is blitted in one call.
+    A frame costs a constant number of C-level operations no matter how many bars there are, which is what makes
+    arrays with thousands of bars (more bars than pixel columns) drawable within the frame budget.
+
+    Parameters
+    ----------
+
+    background_color : tuple.
+    color of the pixels that are not covered by a bar.
+
+    Attributes
+    ----------
+
+    self.background_color : tuple.
+    self.surface : pygame.Surface, the chart surface, reused between frames.
+    self.pixels : numpy.ndarray, the pixels of the chart surface, reused between frames.
+    """
+    def __init__(self, background_color):
+        self.background_color = background_color
+        self.surface = None
+        self.pixels = None
+
+    def get_buffers(self, size):
+        """
+        return the chart surface and pixel buffer for the size provided, creating them only if the size changed.
+        :param size: tuple.
+        :return: tuple (pygame.Surface, numpy.ndarray).
+        """
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+            self.pixels = np.empty((size[0], size[1], 3), dtype=np.uint8)
+        return self.surface, self.pixels
+
+    def get_column_bars(self, bar_array, rect):
+        """
+        return the index of the bar shown in every pixel column of the rectangle, the nearest bar if the columns are
+        wider than the bars and the first bar of the group of bars that falls on the column otherwise.
+        :param bar_array: BarArray.
+        :param rect: pygame.Rect.
+        :return: tuple (numpy.ndarray, numpy.ndarray), the indices and a mask of the columns that show a bar.
+        """
+        xs = np.arange(rect.left, rect.right)
+        gap = bar_array.gap
+        size = len(bar_array)
+        if gap >= 1:
+            # every pixel column shows at most one bar: the nearest one, if the column is inside its width.
+            index = np.rint((xs - bar_array.x) / gap).astype(np.int64)
+            offset = xs - (bar_array.x + index * gap)
+            covered = (index >= 0) & (index < size) & (offset >= -((bar_array.width - 1) // 2)) & \
+                (offset <= bar_array.width // 2)
+        else:
+            # every pixel column shows a group of neighbouring bars.
+            index = np.ceil((xs - bar_array.x) / gap).astype(np.int64)
+            covered = (index >= 0) & (index < size)
+        return index, covered
+
+    def get_column_heights(self, bar_array, rect, bars=None):
+        """
+        return the height in pixels of the chart in every pixel column of the rectangle, -1 where there is no bar.
+        if several bars fall on the same pixel column the tallest one is shown.
+        :param bar_array: BarArray.
+        :param rect: pygame.Rect.
+        :param bars: tuple, the result of get_column_bars, computed if None.
+        :return: numpy.ndarray.
+        """
+        heights = bar_array.get_heights()
+        columns = np.full(rect.width, -1, dtype=np.int64)
+        if len(heights) == 0:
+            return columns
+        index, covered = bars if bars is not None else self.get_column_bars(bar_array, rect)
+        if bar_array.gap >= 1:
+            columns[covered] = heights[index[covered]]
+        else:
+            columns[covered] = np.maximum.reduceat(heights, index[covered])
+        return columns
+
+    def draw(self, window, bar_array):
+        """
+        draw all the bars of the array on the window surface.
+        :param window: pygame.display
+        :param bar_array: BarArray.
+        :return: pygame.Rect, the rectangle that was drawn.
+        """
+        rect = bar_array.get_rect().clip(window.get_rect())
+        if rect.width == 0 or rect.height == 0:
+            return rect
+        surface, pixels = self.get_buffers(rect.size)
+        bars = self.get_column_bars(bar_array, rect)
+        columns = self.get_column_heights(bar_array, rect, bars)
+        rows = np.arange(rect.top, rect.bottom)
+        bottom = bar_array.y
+        mask = (rows[None, :] >= bottom - columns[:, None]) & (rows[None, :] <= bottom) & (columns[:, None] >= 0)
+        pixels[:] = self.background_color
+        if bar_array.colors is None:
+            pixels[mask] = bar_array.color
+        else:
+            index, covered = bars
+            colors = np.zeros((rect.width, 3), dtype=np.uint8)
+            colors[covered] = bar_array.colors[index[covered]]
+            pixels[mask] = np.broadcast_to(colors[:, None, :], pixels.shape)[mask]
+        pygame.surfarray.blit_array(surface, pixels)
+        window.blit(surface, rect)
+        return rect
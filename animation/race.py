@@ -0,0 +1,261 @@
+import multiprocessing
+import numpy as np
+from helper_functions.constants import *
+from helper_functions.helpers import fit_bar_array
+from animation.array_view import ArrayView
+from animation.trace import Counters, SWAP, WRITE
+from animation.trace_stream import TraceStream, stream_algorithm, FAILED, MARK
+from shapes.button import get_font
+import pygame
+
+
+class Lane:
+    """
+    The Lane is the part of the race view that shows one algorithm: its own copy of the array, the worker process
+    that sorts it and the stream the operations arrive through.
+
+    Parameters
+    ----------
+
+    name : str.
+    the name of the algorithm.
+
+    bar_array : BarArray.
+    the copy of the array the operations are replayed on.
+
+    background : BackGround.
+    used to erase the lane.
+
+    rect : pygame.Rect.
+    the area of the display the lane covers.
+
+    Attributes
+    ----------
+
+    self.name : str.
+    self.view : ArrayView.
+    self.background : BackGround.
+    self.rect : pygame.Rect.
+    self.stream : TraceStream.
+    self.process : multiprocessing.Process / None, the worker, None until the race starts.
+    self.counters : Counters, the counts of the operations replayed so far.
+    self.worker : int / None, the worker of the operations replayed last (see Trace.mark_worker), None before the
+    first worker mark.
+    """
+    def __init__(self, name, bar_array, background, rect):
+        self.name = name
+        self.view = ArrayView(bar_array, background)
+        self.background = background
+        self.rect = rect
+        self.stream = TraceStream(bar_array.values.dtype.kind == "f")
+        self.process = None
+        self.counters = Counters()
+        self.worker = None
+
+    def start(self, context):
+        """
+        start the worker process that sorts the values of the lane.
+        :param context: multiprocessing context.
+        :return: None.
+        """
+        self.process = context.Process(target=stream_algorithm,
+                                       args=(self.name, self.view.bar_array.get_values(), self.stream), daemon=True)
+        self.process.start()
+
+    def stop(self):
+        """
+        stop the worker process if it is still running and wait for it.
+        :return: None.
+        """
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.process = None
+
+    def has_failed(self):
+        """
+        check if the algorithm raised an exception or its worker died before it finished.
+        :return: bool.
+        """
+        return self.stream.get_state() == FAILED or (self.process is not None and self.process.exitcode not in
+                                                      (None, 0))
+
+    def is_finished(self):
+        """
+        check if all the operations of the algorithm were replayed (or it failed).
+        :return: bool.
+        """
+        return self.stream.is_finished() or self.has_failed()
+
+    def get_error(self):
+        """
+        return why the algorithm failed.
+        :return: str / None, None if it did not fail.
+        """
+        error = self.stream.get_error()
+        if error is None and self.process is not None and self.process.exitcode not in (None, 0):
+            error = f"the worker exited with code {self.process.exitcode}"
+        return error
+
+    def advance(self, budget):
+        """
+        replay up to budget operations that already arrived from the worker, every bar that changes after a worker
+        mark takes the color of the worker.
+        :param budget: int.
+        :return: set, the indices that changed.
+        """
+        bar_array = self.view.bar_array
+        dirty = set()
+        for code, first, second, value in self.stream.take(budget):
+            if code == MARK:
+                self.worker = first
+                continue
+            self.counters.add_operation(code)
+            if code == SWAP:
+                bar_array.swap(first, second)
+                changed = (first, second)
+            elif code == WRITE:
+                bar_array[first] = value
+                changed = (first,)
+            else:
+                continue
+            dirty.update(changed)
+            if self.worker is not None:
+                for index in changed:
+                    bar_array.set_color(index, WORKER_COLORS[self.worker % len(WORKER_COLORS)])
+        return dirty
+
+    def get_label(self):
+        """
+        return the text shown above the lane.
+        :return: str.
+        """
+        counters = self.counters
+        if self.has_failed():
+            state = f" - failed: {self.get_error()}"
+        elif self.is_finished():
+            state = f" - done, depth {self.stream.get_max_depth()}"
+        else:
+            state = ""
+        return f"{self.name}: {counters.comparisons} cmp, {counters.swaps} swp, {counters.writes} wr{state}"
+
+    def draw_label(self, win):
+        """
+        erase and draw the label of the lane, without updating the display.
+        :param win: pygame.display.
+        :return: pygame.Rect, the rectangle of the label.
+        """
+        rect = pygame.Rect(self.rect.left, self.rect.top, self.rect.width, race_label_height)
+        self.background.draw_rect(win, rect)
+        win.blit(get_font(race_label_height).render(self.get_label(), 1, BLACK), rect.topleft,
+                 (0, 0, rect.width, rect.height))
+        return rect
+
+    def draw(self, win):
+        """
+        draw the whole lane, without updating the display.
+        :param win: pygame.display.
+        :return: None.
+        """
+        self.background.draw_rect(win, self.rect)
+        self.view.draw(win)
+        self.draw_label(win)
+
+
+class Race:
+    """
+    The Race sorts the same values with several algorithms at once, each in its own worker process, and replays them
+    side by side in a grid of lanes. The workers stream their operations through shared memory while they run and
+    every lane is replayed at the speed of the scheduler, so the algorithm that needs fewer operations finishes first.
+
+    Parameters
+    ----------
+
+    names : list of str.
+    the names of the algorithms.
+
+    values : numpy.ndarray.
+    the values every algorithm sorts.
+
+    background : BackGround.
+
+    rect : pygame.Rect.
+    the area of the display the lanes share.
+
+    Attributes
+    ----------
+
+    self.lanes : list of Lane.
+    self.rect : pygame.Rect.
+    self.context : multiprocessing context, the workers are spawned so they do not inherit the display.
+    """
+    def __init__(self, names, values, background, rect):
+        self.rect = rect
+        self.context = multiprocessing.get_context("spawn")
+        columns = min(len(names), race_columns)
+        rows = -(-len(names) // columns)
+        width = (rect.width - race_lane_gap * (columns - 1)) // columns
+        height = (rect.height - race_lane_gap * (rows - 1)) // rows
+        self.lanes = []
+        for i, name in enumerate(names):
+            left = rect.left + (i % columns) * (width + race_lane_gap)
+            top = rect.top + (i // columns) * (height + race_lane_gap)
+            lane_rect = pygame.Rect(left, top, width, height)
+            bar_array = fit_bar_array(np.array(values), left, lane_rect.right, top + race_label_height + 2,
+                                      lane_rect.bottom)
+            self.lanes.append(Lane(name, bar_array, background, lane_rect))
+
+    def start(self):
+        """
+        start the workers of all the lanes.
+        :return: None.
+        """
+        for lane in self.lanes:
+            lane.start(self.context)
+
+    def stop(self):
+        """
+        stop the workers that are still running.
+        :return: None.
+        """
+        for lane in self.lanes:
+            lane.stop()
+
+    def draw(self, win):
+        """
+        draw all the lanes, without updating the display.
+        :param win: pygame.display.
+        :return: pygame.Rect, the area of the lanes.
+        """
+        for lane in self.lanes:
+            lane.draw(win)
+        return self.rect
+
+    def frames(self, animation, win):
+        """
+        run the race and replay it frame by frame, like Renderer.frames this is a generator that yields after every
+        frame and closing it stops the workers.
+        :param animation: Animation, shows the race instead of its array.
+        :param win: pygame.display.
+        :return: generator.
+        """
+        scheduler = animation.renderer.get_scheduler()
+        self.start()
+        try:
+            animation.print_arr(win)
+            scheduler.reset()
+            while not all(lane.is_finished() for lane in self.lanes):
+                yield
+                budget = scheduler.get_budget(scheduler.tick())
+                rects = []
+                for lane in self.lanes:
+                    dirty = lane.advance(budget)
+                    if dirty:
+                        rects.extend(lane.view.draw_columns(win, dirty))
+                    rects.append(lane.draw_label(win))
+                rects.append(animation.draw_hud(win))
+                pygame.display.update(rects)
+        finally:
+            self.stop()
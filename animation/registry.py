@@ -0,0 +1,173 @@
+import ast
+import hashlib
+import importlib
+import inspect
+import sys
+
+# the modules whose algorithms are registered the first time the registry is used.
+BUILTIN_MODULES = ["animation.algorithms", "animation.hybrid_algorithms", "animation.parallel_algorithms"]
+
+# every registered algorithm by name, in registration order.
+REGISTRY = {}
+
+
+class AlgorithmInfo:
+    """
+    The AlgorithmInfo class describes a registered sorting algorithm.
+
+    Parameters
+    ----------
+
+    name : str.
+    the name of the algorithm, also the label of its button.
+
+    function : function.
+    sorts a TracedArray in place.
+
+    stable : bool.
+    True if equal values keep their relative order.
+
+    in_place : bool.
+    True if the algorithm needs only O(1) (or O(log n) stack) extra memory.
+
+    complexity : str.
+    the time complexity of the algorithm.
+
+    show_button : bool.
+    True if the algorithm gets a button in the animation.
+
+    Attributes
+    ----------
+
+    self.name : str.
+    self.function : function.
+    self.stable : bool.
+    self.in_place : bool.
+    self.complexity : str.
+    self.show_button : bool.
+    self.version : str / None, the hash of the source code of the algorithm, None until it is computed.
+    """
+    def __init__(self, name, function, stable, in_place, complexity, show_button=True):
+        self.name = name
+        self.function = function
+        self.stable = stable
+        self.in_place = in_place
+        self.complexity = complexity
+        self.show_button = show_button
+        self.version = None
+
+    def get_name(self):
+        """
+        return the name of the algorithm.
+        :return: str.
+        """
+        return self.name
+
+    def get_function(self):
+        """
+        return the function that runs the algorithm.
+        :return: function.
+        """
+        return self.function
+
+    def get_version(self):
+        """
+        return a hash of the source code of the algorithm: the module it is defined in and every module of its
+        package that module imports, directly or not, so a trace recorded before the code changed is told apart.
+        :return: str.
+        """
+        if self.version is None:
+            digest = hashlib.sha256()
+            for module in get_imported_modules(self.function.__module__):
+                digest.update(f"{module.__name__}:".encode())
+                digest.update(inspect.getsource(module).encode())
+            self.version = digest.hexdigest()
+        return self.version
+
+
+def get_imported_modules(name):
+    """
+    return the module provided and the modules of its package it imports, directly or through one another. A
+    package without a file of its own (a namespace package) has no source and is left out.
+    :param name: str, the name of the module.
+    :return: list of module, sorted by name.
+    """
+    package = name.split(".")[0]
+    modules = {}
+    pending = [name]
+    while pending:
+        name = pending.pop()
+        if name in modules:
+            continue
+        modules[name] = module = sys.modules[name] if name in sys.modules else importlib.import_module(name)
+        if getattr(module, "__file__", None) is None:
+            continue
+        for node in ast.walk(ast.parse(inspect.getsource(module))):
+            if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+                # the names imported from a package may be modules of their own.
+                imported = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names
+                                            if f"{node.module}.{alias.name}" in sys.modules]
+            elif isinstance(node, ast.Import):
+                imported = [alias.name for alias in node.names]
+            else:
+                continue
+            pending.extend(imported_name for imported_name in imported if imported_name.split(".")[0] == package)
+    return [modules[name] for name in sorted(modules) if getattr(modules[name], "__file__", None) is not None]
+
+
+def register(name, stable, in_place, complexity, show_button=True):
+    """
+    decorator that registers a sorting algorithm under the name provided.
+    :param name: str.
+    :param stable: bool.
+    :param in_place: bool.
+    :param complexity: str.
+    :param show_button: bool.
+    :return: function, the decorator.
+    """
+    def decorator(function):
+        if name in REGISTRY:
+            raise Exception(f"Algorithm already registered: {name}")
+        REGISTRY[name] = AlgorithmInfo(name, function, stable, in_place, complexity, show_button)
+        return function
+    return decorator
+
+
+def load_builtin_algorithms():
+    """
+    import the modules of the built-in algorithms so they register themselves.
+    :return: None.
+    """
+    for module in BUILTIN_MODULES:
+        importlib.import_module(module)
+
+
+def get_algorithm(name):
+    """
+    return the algorithm registered under the name provided.
+    :param name: str.
+    :return: AlgorithmInfo.
+    """
+    load_builtin_algorithms()
+    if name not in REGISTRY:
+        raise Exception(f"Unknown algorithm: {name}")
+    return REGISTRY[name]
+
+
+def get_algorithms(buttons_only=False):
+    """
+    return all the registered algorithms in registration order.
+    :param buttons_only: bool, if True only the algorithms that get a button are returned.
+    :return: list of AlgorithmInfo.
+    """
+    load_builtin_algorithms()
+    return [info for info in REGISTRY.values() if info.show_button or not buttons_only]
+
+
+def get_names(buttons_only=False):
+    """
+    return the names of all the registered algorithms in registration order.
+    :param buttons_only: bool, if True only the algorithms that get a button are returned.
+    :return: list of str.
+    """
+    return [info.get_name() for info in get_algorithms(buttons_only)]
@@ -0,0 +1,180 @@
+from helper_functions.constants import timeline_build_seconds, timeline_seek_build_seconds
+from animation.trace import COMPARE, SWAP, WRITE, Counters
+from animation.scheduler import Scheduler
+from animation.timeline import Timeline
+from bisect import bisect_left
+import pygame
+import time
+
+
+class Renderer:
+    """
+    The Renderer replays a trace on the animation frame by frame. The scheduler decides how many operations are applied
+    in every frame and a single frame is drawn for all of them, so the time a replay takes depends on the speed, not on
+    the number of operations the algorithm did.
+    Only the first frame of a replay is a full repaint, every other frame erases and redraws just the columns that
+    changed and pushes only their rectangles to the display.
+    For a trace recorded by several worker processes, every bar that changes takes the color of the worker.
+    The replay can jump to any position of the trace: the timeline restores the array there from its nearest snapshot.
+    The timeline builds its snapshots a slice per frame, and a jump past them waits for them over the next frames.
+    A trace that is still recorded by a worker process is replayed as its operations arrive.
+
+    Parameters
+    ----------
+
+    scheduler : Scheduler.
+    paces the replay, a default Scheduler is created if None is provided.
+
+    Attributes
+    ----------
+
+    self.scheduler : Scheduler.
+    self.position : int, the number of operations of the current trace replayed so far.
+    self.target : int / None, the position the replay jumps to before its next frame, None if no jump is requested.
+    """
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.position = 0
+        self.target = None
+
+    def get_scheduler(self):
+        """
+        return the scheduler that paces the replay.
+        :return: Scheduler.
+        """
+        return self.scheduler
+
+    def get_position(self):
+        """
+        return the number of operations of the current trace replayed so far.
+        :return: int.
+        """
+        return self.position
+
+    def seek(self, position):
+        """
+        request a jump of the replay in progress to the position provided, it happens before the next frame, or
+        once the timeline is ready for it.
+        :param position: int.
+        :return: None.
+        """
+        self.target = position
+
+    def get_status(self, timeline=None):
+        """
+        return text lines that describe the state of the replay.
+        :param timeline: Timeline / None, the timeline of the replay.
+        :return: list of str.
+        """
+        status = self.scheduler.get_status()
+        if self.target is not None and timeline is not None and not timeline.is_ready(self.target):
+            status.append(f"seeking: {100 * timeline.built // max(1, self.target)}%")
+        return status
+
+    def restore(self, animation, timeline, counters, position):
+        """
+        put the animation in the state it has after the operations of the trace before the position provided.
+        The colors of the workers are not kept in the snapshots, so after a jump only the bars that change again are
+        colored.
+        :param animation: Animation.
+        :param timeline: Timeline.
+        :param counters: Counters.
+        :param position: int.
+        :return: tuple (int, int, int / None), the position, the next worker mark and the current worker.
+        """
+        position = min(max(position, 0), len(timeline))
+        animation.set_values(timeline.get_values(position))
+        counters.comparisons = timeline.count(COMPARE, position)
+        counters.swaps = timeline.count(SWAP, position)
+        counters.writes = timeline.count(WRITE, position)
+        marks = timeline.trace.get_worker_marks()
+        mark = bisect_left([index for index, _ in marks], position)
+        worker = marks[mark - 1][1] if mark else None
+        self.position = position
+        return position, mark, worker
+
+    def frames(self, animation, trace, win, counters=None, timeline=None, start=0, paused=False, recorder=None):
+        """
+        replay the trace on the animation, drawing one frame per batch of operations.
+        This is a generator that yields after every frame, so the caller drives the replay from its own loop and keeps
+        handling events between frames. Closing the generator cancels the replay.
+        :param animation: Animation.
+        :param trace: Trace.
+        :param win: pygame.display.
+        :param counters: Counters, updated with the replayed operations and the time spent drawing and waiting.
+        :param timeline: Timeline, used to jump in the trace, it builds a slice of its snapshots every frame.
+        :param start: int, the position the replay starts from.
+        :param paused: bool, True to start the replay paused.
+        :param recorder: TraceRecorder / None, the recorder the trace is growing from, polled before every frame.
+        :return: generator.
+        """
+        if counters is None:
+            counters = Counters()
+        if timeline is None:
+            timeline = Timeline(trace)
+        self.target = None
+        size = len(trace)
+        marks = trace.get_worker_marks()
+        if not timeline.is_ready(start):
+            # the replay starts where the snapshots end and jumps once they reach the start.
+            self.target = start
+            start = timeline.built
+        index, mark, worker = self.restore(animation, timeline, counters, start)
+        animation.print_arr(win)
+        self.scheduler.reset()
+        if paused:
+            self.scheduler.toggle_pause()
+        status = None
+        while index < size or self.target is not None or (recorder is not None and not recorder.is_finished()):
+            yield
+            if recorder is not None:
+                recorder.poll()
+                size = len(trace)
+            if self.target is not None:
+                if not timeline.build(timeline_seek_build_seconds, self.target):
+                    pygame.display.update([animation.draw_hud(win)] + animation.draw_timeline(win))
+                    self.scheduler.tick()
+                    continue
+                index, mark, worker = self.restore(animation, timeline, counters, self.target)
+                self.target = None
+                rects = [animation.draw_array(win), animation.draw_hud(win)] + animation.draw_timeline(win)
+                pygame.display.update(rects)
+                # the jump may have replayed part of the trace, which should not count as time to catch up on.
+                self.scheduler.tick()
+                continue
+            timeline.build(timeline_build_seconds)
+            start = time.perf_counter()
+            budget = self.scheduler.get_budget(self.scheduler.tick())
+            counters.wait_seconds += time.perf_counter() - start
+            dirty = set()
+            stop = min(size, index + budget)
+            while index < stop:
+                while mark < len(marks) and marks[mark][0] <= index:
+                    worker = marks[mark][1]
+                    mark += 1
+                code, first, second = trace[index]
+                counters.add_operation(code)
+                if code != COMPARE:
+                    animation.apply_operation(code, first, second)
+                    dirty.add(first)
+                    if code == SWAP:
+                        dirty.add(second)
+                    if worker is not None:
+                        animation.paint(first, worker)
+                        if code == SWAP:
+                            animation.paint(second, worker)
+                index += 1
+            self.position = index
+            if budget == 0 and status == animation.get_status():
+                # nothing changed (for example while paused), so there is nothing to draw.
+                continue
+            status = animation.get_status()
+            start = time.perf_counter()
+            rects = animation.draw_columns(win, dirty) if dirty else []
+            rects.append(animation.draw_hud(win))
+            rects.extend(animation.draw_timeline(win))
+            pygame.display.update(rects)
+            counters.render_seconds += time.perf_counter() - start
+        if recorder is not None:
+            # the recording may have ended after the last frame was drawn, so its outcome is drawn once more.
+            pygame.display.update(animation.draw_hud(win))
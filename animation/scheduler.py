@@ -0,0 +1,133 @@
+import pygame
+
+
+class Scheduler:
+    """
+    The Scheduler decides how many operations of a trace are replayed in every frame. It is driven by a
+    pygame.time.Clock, so every algorithm is replayed at the same global speed (operations per second) regardless of
+    how many operations it does, and the replay can be paused, stepped one operation at a time or fast-forwarded.
+
+    Parameters
+    ----------
+
+    operations_per_second : float.
+    the replay speed.
+
+    fps : int.
+    target frames per second.
+
+    fast_forward_factor : int.
+    how many times faster the replay runs while fast-forwarding.
+
+    Attributes
+    ----------
+
+    self.operations_per_second : float.
+    self.fps : int.
+    self.fast_forward_factor : int.
+    self.clock : pygame.time.Clock.
+    self.paused : bool.
+    self.fast_forward : bool.
+    self.pending_steps : int, operations requested one at a time while paused.
+    self.credit : float, the fraction of an operation left over from the previous frames.
+    """
+    def __init__(self, operations_per_second=1000, fps=60, fast_forward_factor=16):
+        self.operations_per_second = operations_per_second
+        self.fps = fps
+        self.fast_forward_factor = fast_forward_factor
+        self.clock = pygame.time.Clock()
+        self.paused = False
+        self.fast_forward = False
+        self.pending_steps = 0
+        self.credit = 0.0
+
+    def reset(self):
+        """
+        forget the state of the previous replay, the speed is kept.
+        :return: None.
+        """
+        self.paused = False
+        self.fast_forward = False
+        self.pending_steps = 0
+        self.credit = 0.0
+        self.clock.tick()
+
+    def set_speed(self, operations_per_second):
+        """
+        update the replay speed.
+        :param operations_per_second: float.
+        :return: None.
+        """
+        self.operations_per_second = max(1, operations_per_second)
+
+    def toggle_pause(self):
+        """
+        pause a running replay or resume a paused one.
+        :return: None.
+        """
+        self.paused = not self.paused
+        self.credit = 0.0
+
+    def toggle_fast_forward(self):
+        """
+        start or stop fast-forwarding.
+        :return: None.
+        """
+        self.fast_forward = not self.fast_forward
+
+    def step(self):
+        """
+        request a single operation, used while the replay is paused.
+        :return: None.
+        """
+        self.pending_steps += 1
+
+    def tick(self):
+        """
+        wait until it is time for the next frame.
+        :return: float, seconds since the previous frame.
+        """
+        return self.clock.tick(self.fps) / 1000
+
+    def get_budget(self, elapsed):
+        """
+        return the number of operations to replay in a frame that comes the seconds provided after the previous one.
+        :param elapsed: float.
+        :return: int.
+        """
+        if self.paused:
+            steps, self.pending_steps = self.pending_steps, 0
+            return steps
+        speed = self.operations_per_second * (self.fast_forward_factor if self.fast_forward else 1)
+        self.credit += speed * elapsed
+        budget = int(self.credit)
+        self.credit -= budget
+        return budget
+
+    def handle_event(self, event):
+        """
+        update the state according to a key press: space pauses / resumes, the right arrow steps, 'f' fast-forwards
+        and the up / down arrows double / halve the speed.
+        :param event: pygame.event.Event.
+        :return: None.
+        """
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_SPACE:
+            self.toggle_pause()
+        elif event.key == pygame.K_RIGHT:
+            self.step()
+        elif event.key == pygame.K_f:
+            self.toggle_fast_forward()
+        elif event.key == pygame.K_UP:
+            self.set_speed(self.operations_per_second * 2)
+        elif event.key == pygame.K_DOWN:
+            self.set_speed(self.operations_per_second // 2)
+
+    def get_status(self):
+        """
+        return text lines that describe the state of the scheduler.
+        :return: list of str.
+        """
+        state = "paused" if self.paused else "fast-forward" if self.fast_forward else "playing"
+        return [f"speed: {self.operations_per_second:.0f} ops/s", f"state: {state}"]
@@ -0,0 +1,228 @@
+from helper_functions.constants import timeline_memory, timeline_min_interval, timeline_build_seconds
+from animation.trace import SWAP, WRITE
+import numpy as np
+import pygame
+import time
+
+# the number of operations converted to Python lists at a time while the timeline replays a range of a trace.
+TIMELINE_CHUNK = 1 << 16
+# the number of operations the timeline replays between two looks at the clock while it builds its snapshots.
+TIMELINE_BUILD_STEP = 1 << 12
+
+
+class Timeline:
+    """
+    The Timeline makes a trace seekable. It keeps a snapshot of the array every interval operations, so the array at
+    any position of the trace is the nearest snapshot before it with at most interval operations replayed on top.
+    The interval is chosen so all the snapshots of the trace fit in the memory budget, and it is never smaller than
+    the minimum interval, so short traces do not keep a snapshot per operation. The trace may still grow while it is
+    recorded: once the snapshots fill the budget the interval doubles and every other snapshot is dropped.
+    The snapshots are built in slices of a few milliseconds that the renderer runs every frame, ahead of the replay,
+    so the window keeps responding while a long trace is indexed. A position is ready once the snapshots reach it,
+    and the renderer waits for that before a seek instead of replaying the whole trace at once.
+    The operations are read through views that are only kept while they are replayed, because a Trace can not grow
+    while a view of its arrays exists.
+
+    Parameters
+    ----------
+
+    trace : Trace / MappedTrace.
+    the trace to seek in.
+
+    memory : int.
+    the number of bytes the snapshots may take.
+
+    min_interval : int.
+    the smallest number of operations between two snapshots.
+
+    Attributes
+    ----------
+
+    self.trace : Trace / MappedTrace.
+    self.dtype : numpy.dtype, the type of the values.
+    self.limit : int, the most snapshots that fit in the memory budget.
+    self.interval : int, the number of operations between two snapshots.
+    self.snapshots : list of numpy.ndarray, the array after every multiple of interval operations.
+    self.built : int, the number of operations the snapshots were built for.
+    self.values : list, the array after the built operations.
+    """
+    def __init__(self, trace, memory=timeline_memory, min_interval=timeline_min_interval):
+        self.trace = trace
+        self.dtype = np.float64 if np.asarray(trace.written).dtype.kind == "f" else np.int64
+        initial = np.asarray(trace.get_initial(), dtype=self.dtype)
+        self.limit = max(2, memory // max(1, initial.nbytes))
+        self.interval = max(min_interval, -(-len(trace) // self.limit))
+        self.snapshots = [initial]
+        self.built = 0
+        self.values = initial.tolist()
+
+    def __len__(self):
+        """
+        return the number of operations in the trace.
+        :return: int.
+        """
+        return len(self.trace)
+
+    def get_arrays(self):
+        """
+        return views of the op codes, operands and written values of the trace.
+        :return: tuple of numpy.ndarray.
+        """
+        trace = self.trace
+        return (np.asarray(trace.codes, dtype=np.int8), np.asarray(trace.first), np.asarray(trace.second),
+                np.asarray(trace.written))
+
+    def get_next_keyframe(self):
+        """
+        return the position of the next snapshot to take.
+        :return: int.
+        """
+        return len(self.snapshots) * self.interval
+
+    def add_snapshot(self, values):
+        """
+        add the snapshot at the next keyframe, the values must be the array at that position of the trace.
+        :param values: list / numpy.ndarray.
+        :return: None.
+        """
+        self.snapshots.append(np.array(values, dtype=self.dtype))
+        if len(self.snapshots) > self.limit:
+            self.snapshots = self.snapshots[::2]
+            self.interval *= 2
+
+    def apply(self, values, start, stop):
+        """
+        replay the operations in the range [start, stop) on the values provided (in place), a chunk at a time.
+        :param values: list.
+        :param start: int.
+        :param stop: int.
+        :return: None.
+        """
+        all_codes, all_first, all_second, all_written = self.get_arrays()
+        for chunk in range(start, stop, TIMELINE_CHUNK):
+            end = min(stop, chunk + TIMELINE_CHUNK)
+            codes = all_codes[chunk:end]
+            second = all_second[chunk:end]
+            # the second operand of a write is the position of its value, so the values are looked up at once.
+            written = iter(all_written[second[codes == WRITE]].tolist())
+            for code, i, j in zip(codes.tolist(), all_first[chunk:end].tolist(), second.tolist()):
+                if code == SWAP:
+                    values[i], values[j] = values[j], values[i]
+                elif code == WRITE:
+                    values[i] = next(written)
+
+    def build(self, seconds=timeline_build_seconds, stop=None):
+        """
+        replay the operations after the built ones and take the snapshots on the way, until the seconds provided
+        are over or the trace (or the stop provided) is reached.
+        :param seconds: float / None, no limit if None.
+        :param stop: int / None, the position to build up to, the end of the trace if None.
+        :return: bool, True once the stop is built.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        deadline = time.perf_counter() + seconds if seconds is not None else None
+        while self.built < stop:
+            end = min(stop, self.built + TIMELINE_BUILD_STEP, self.get_next_keyframe())
+            self.apply(self.values, self.built, end)
+            self.built = end
+            if end == self.get_next_keyframe():
+                self.add_snapshot(self.values)
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return self.built >= stop
+
+    def is_ready(self, position):
+        """
+        check if the array at the position provided can be restored without replaying more than an interval.
+        :param position: int.
+        :return: bool.
+        """
+        return min(max(position, 0), len(self)) <= self.built
+
+    def get_values(self, position):
+        """
+        return the array after the operations before the position provided, from the nearest snapshot. A position
+        that is not ready is built first.
+        :param position: int.
+        :return: list.
+        """
+        position = min(max(position, 0), len(self))
+        self.build(None, position)
+        keyframe = position // self.interval
+        values = self.snapshots[keyframe].tolist()
+        self.apply(values, keyframe * self.interval, position)
+        return values
+
+    def count(self, code, position):
+        """
+        return the number of operations with the op code provided before the position provided.
+        :param code: int.
+        :param position: int.
+        :return: int.
+        """
+        codes = self.get_arrays()[0]
+        return int(np.count_nonzero(codes[:position] == code))
+
+
+class TimelineBar:
+    """
+    The TimelineBar shows how far the replay of a trace went as a bar under the array, and turns a click on it into a
+    position of the trace to seek to.
+
+    Parameters
+    ----------
+
+    x : int.
+    top left point x-coordinate.
+
+    y : int.
+    top left point y-coordinate.
+
+    width : int.
+
+    height : int.
+
+    color : tuple.
+    color of the outline and of the replayed part.
+
+    background : BackGround.
+    used to erase the bar.
+
+    Attributes
+    ----------
+
+    self.rect : pygame.Rect.
+    self.color : tuple.
+    self.background : BackGround.
+    """
+    def __init__(self, x, y, width, height, color, background):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.color = color
+        self.background = background
+
+    def draw(self, win, position, size):
+        """
+        erase and draw the bar, without updating the display.
+        :param win: pygame.display.
+        :param position: int, the operations replayed so far.
+        :param size: int, the number of operations in the trace.
+        :return: pygame.Rect, the rectangle of the bar.
+        """
+        self.background.draw_rect(win, self.rect)
+        pygame.draw.rect(win, self.color, self.rect, 1)
+        if size:
+            filled = self.rect.copy()
+            filled.width = self.rect.width * position // size
+            pygame.draw.rect(win, self.color, filled)
+        return self.rect
+
+    def get_position(self, point, size):
+        """
+        return the position of the trace under the point provided.
+        :param point: tuple.
+        :param size: int, the number of operations in the trace.
+        :return: int / None, None if the point is not on the bar.
+        """
+        if not self.rect.collidepoint(point):
+            return None
+        return min(size, max(0, round((point[0] - self.rect.left) * size / (self.rect.width - 1))))
@@ -0,0 +1,409 @@
+from array import array
+import numpy as np
+
+# operation codes stored in the trace.
+COMPARE = 0
+SWAP = 1
+WRITE = 2
+
+# index used in a compare operation when one of the operands is not an array slot (a held key or an auxiliary buffer).
+NO_INDEX = -1
+
+
+class Trace:
+    """
+    The Trace class is a compact log of the operations a sorting algorithm performed on an array.
+    Operations are stored in flat arrays of integers so a trace with millions of operations stays small, and it can
+    be replayed (or partially replayed) on any copy of the initial array without running the algorithm again.
+
+    Every operation has an op code and two operands:
+    COMPARE - the two indices that were compared (NO_INDEX if an operand was not an array slot).
+    SWAP - the two indices that were swapped.
+    WRITE - the index that was written and the position of the written value in the written values array.
+
+    Parameters
+    ----------
+
+    initial : iterable.
+    the values of the array before the algorithm started.
+
+    Attributes
+    ----------
+
+    self.initial : list.
+    the values of the array before the algorithm started.
+
+    self.codes : array.
+    the op code of every operation.
+
+    self.first : array.
+    the first operand of every operation.
+
+    self.second : array.
+    the second operand of every operation.
+
+    self.written : array.
+    the values written by the WRITE operations, in the order they were written.
+
+    self.worker_marks : list of tuple (int, int).
+    for traces recorded by several worker processes, the operation index from which every worker's operations start
+    and the worker, empty if the whole trace was recorded by one process.
+    """
+    def __init__(self, initial):
+        self.initial = list(initial)
+        self.codes = array('b')
+        self.first = array('q')
+        self.second = array('q')
+        self.written = array('q' if all(isinstance(value, int) for value in self.initial) else 'd')
+        self.worker_marks = []
+
+    def __len__(self):
+        """
+        return the number of operations in the trace.
+        :return: int.
+        """
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        """
+        return the operation at the index provided as a tuple (op code, first operand, second operand).
+        for a WRITE operation the second operand is the written value.
+        :param index: int.
+        :return: tuple.
+        """
+        code = self.codes[index]
+        if code == WRITE:
+            return code, self.first[index], self.written[self.second[index]]
+        return code, self.first[index], self.second[index]
+
+    def __iter__(self):
+        """
+        iterate over the operations in the trace.
+        :return: generator.
+        """
+        for index in range(len(self.codes)):
+            yield self[index]
+
+    def count(self, code):
+        """
+        return the number of operations in the trace with the op code provided.
+        :param code: int.
+        :return: int.
+        """
+        return self.codes.count(code)
+
+    def get_initial(self):
+        """
+        return a copy of the values of the array before the algorithm started.
+        :return: list.
+        """
+        return list(self.initial)
+
+    def compare(self, i, j):
+        """
+        record a comparison between two indices.
+        :param i: int.
+        :param j: int.
+        :return: None.
+        """
+        self.codes.append(COMPARE)
+        self.first.append(i)
+        self.second.append(j)
+
+    def swap(self, i, j):
+        """
+        record a swap between two indices.
+        :param i: int.
+        :param j: int.
+        :return: None.
+        """
+        self.codes.append(SWAP)
+        self.first.append(i)
+        self.second.append(j)
+
+    def write(self, index, value):
+        """
+        record a write of a value to an index.
+        :param index: int.
+        :param value: int / float.
+        :return: None.
+        """
+        self.codes.append(WRITE)
+        self.first.append(index)
+        self.second.append(len(self.written))
+        self.written.append(value)
+
+    def extend(self, codes, first, second, written, workers=None):
+        """
+        append operations recorded by worker processes.
+        :param codes: numpy.ndarray, the op codes.
+        :param first: numpy.ndarray, the first operands.
+        :param second: numpy.ndarray, the second operands, for a WRITE the position of its value in written.
+        :param written: numpy.ndarray, the values of the WRITE operations.
+        :param workers: numpy.ndarray / None, the worker that recorded every operation, None to add no worker marks.
+        :return: None.
+        """
+        start = len(self.codes)
+        second = np.where(codes == WRITE, second + len(self.written), second)
+        self.codes.frombytes(codes.astype(np.int8).tobytes())
+        self.first.frombytes(first.astype(np.int64).tobytes())
+        self.second.frombytes(second.astype(np.int64).tobytes())
+        self.written.frombytes(written.astype(np.int64 if self.written.typecode == 'q' else np.float64).tobytes())
+        if workers is None:
+            return
+        for index in np.flatnonzero(np.diff(workers, prepend=-1)):
+            self.worker_marks.append((start + int(index), int(workers[index])))
+
+    def mark_worker(self, worker, index=None):
+        """
+        record that the operations from the index provided on belong to the worker provided, until the next mark.
+        :param worker: int.
+        :param index: int / None, the first operation of the worker, the next operation recorded if None.
+        :return: None.
+        """
+        if index is None:
+            index = len(self.codes)
+        if self.worker_marks and self.worker_marks[-1][0] == index:
+            self.worker_marks[-1] = (index, worker)
+        else:
+            self.worker_marks.append((index, worker))
+
+    def get_worker_marks(self):
+        """
+        return the worker marks of the trace.
+        :return: list of tuple (int, int).
+        """
+        return self.worker_marks
+
+    def apply(self, values, start=0, stop=None):
+        """
+        replay the operations in the range [start, stop) on the values provided (in place).
+        :param values: list.
+        :param start: int.
+        :param stop: int.
+        :return: None.
+        """
+        if stop is None:
+            stop = len(self.codes)
+        codes, first, second, written = self.codes, self.first, self.second, self.written
+        for index in range(start, stop):
+            code = codes[index]
+            if code == SWAP:
+                i, j = first[index], second[index]
+                values[i], values[j] = values[j], values[i]
+            elif code == WRITE:
+                values[first[index]] = written[second[index]]
+
+
+class Counters:
+    """
+    The Counters class holds the measurements of an algorithm run: how many operations it did, how deep its recursion
+    went and how the time of its replay was split between drawing and waiting for the next frame.
+
+    Attributes
+    ----------
+
+    self.comparisons : int.
+    self.swaps : int.
+    self.writes : int.
+    self.max_depth : int, the deepest recursion level reached.
+    self.render_seconds : float, time spent drawing and updating the display.
+    self.wait_seconds : float, time spent waiting for the next frame.
+    """
+    def __init__(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        self.max_depth = 0
+        self.render_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def add_operation(self, code):
+        """
+        count a single operation.
+        :param code: int, op code.
+        :return: None.
+        """
+        if code == COMPARE:
+            self.comparisons += 1
+        elif code == SWAP:
+            self.swaps += 1
+        elif code == WRITE:
+            self.writes += 1
+
+    def count_trace(self, trace):
+        """
+        set the operation counts to the counts of the whole trace provided.
+        :param trace: Trace.
+        :return: None.
+        """
+        self.comparisons = trace.count(COMPARE)
+        self.swaps = trace.count(SWAP)
+        self.writes = trace.count(WRITE)
+
+    def as_dict(self):
+        """
+        return the counters as a dictionary.
+        :return: dict.
+        """
+        return {
+            "comparisons": self.comparisons,
+            "swaps": self.swaps,
+            "writes": self.writes,
+            "max_depth": self.max_depth,
+            "render_seconds": self.render_seconds,
+            "wait_seconds": self.wait_seconds,
+        }
+
+
+class TracedArray:
+    """
+    The TracedArray is the array the sorting algorithms work on. It holds the values and records every comparison,
+    swap and write into a Trace, so the algorithm runs at full speed and the animation is replayed later.
+
+    Parameters
+    ----------
+
+    values : iterable.
+    the values to sort.
+
+    trace : Trace / TraceStream.
+    the trace the operations are recorded into, a new Trace of the values if None is provided.
+
+    Attributes
+    ----------
+
+    self.values : list.
+    the current values of the array.
+
+    self.trace : Trace / TraceStream.
+    the trace the operations are recorded into.
+
+    self.depth : int.
+    the current recursion depth of the algorithm.
+
+    self.max_depth : int.
+    the deepest recursion depth the algorithm reached.
+    """
+    def __init__(self, values, trace=None):
+        self.values = list(values)
+        self.trace = trace if trace is not None else Trace(self.values)
+        self.depth = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        """
+        return the size of the array.
+        :return: int.
+        """
+        return len(self.values)
+
+    def __getitem__(self, index):
+        """
+        read the value at the index provided, reads are not recorded.
+        :param index: int.
+        :return: int / float.
+        """
+        return self.values[index]
+
+    def get_trace(self):
+        """
+        return the recorded trace.
+        :return: Trace.
+        """
+        return self.trace
+
+    def get_counters(self):
+        """
+        return the counters of the operations recorded so far.
+        :return: Counters.
+        """
+        counters = Counters()
+        counters.count_trace(self.trace)
+        counters.max_depth = self.max_depth
+        return counters
+
+    def enter(self):
+        """
+        called by recursive algorithms when they go one recursion level deeper.
+        :return: None.
+        """
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+
+    def leave(self):
+        """
+        called by recursive algorithms when they return from a recursion level.
+        :return: None.
+        """
+        self.depth -= 1
+
+    def less(self, i, j):
+        """
+        compare the values at two indices.
+        :param i: int.
+        :param j: int.
+        :return: bool, True if the value at i is smaller than the value at j.
+        """
+        self.trace.compare(i, j)
+        return self.values[i] < self.values[j]
+
+    def less_than_value(self, index, value):
+        """
+        compare the value at an index to a value that is not in the array.
+        :param index: int.
+        :param value: int / float.
+        :return: bool, True if the value at the index is smaller than the value provided.
+        """
+        self.trace.compare(index, NO_INDEX)
+        return self.values[index] < value
+
+    def value_less_than(self, value, index):
+        """
+        compare a value that is not in the array to the value at an index.
+        :param value: int / float.
+        :param index: int.
+        :return: bool, True if the value provided is smaller than the value at the index.
+        """
+        self.trace.compare(NO_INDEX, index)
+        return value < self.values[index]
+
+    def values_less(self, first, second):
+        """
+        compare two values that are not in the array (for example in an auxiliary buffer).
+        :param first: int / float.
+        :param second: int / float.
+        :return: bool, True if the first value is smaller than the second.
+        """
+        self.trace.compare(NO_INDEX, NO_INDEX)
+        return first < second
+
+    def mark_worker(self, worker):
+        """
+        color the bars the next operations change by the worker provided, for algorithms that work in phases or
+        groups (see Trace.mark_worker).
+        :param worker: int.
+        :return: None.
+        """
+        self.trace.mark_worker(worker)
+
+    def swap(self, i, j):
+        """
+        swap the values at two indices.
+        :param i: int.
+        :param j: int.
+        :return: None.
+        """
+        self.trace.swap(i, j)
+        self.values[i], self.values[j] = self.values[j], self.values[i]
+
+    def write(self, index, value):
+        """
+        write a value to an index.
+        :param index: int.
+        :param value: int / float.
+        :return: None.
+        """
+        self.trace.write(index, value)
+        self.values[index] = value
@@ -0,0 +1,398 @@
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+import numpy as np
+from helper_functions.constants import trace_cache_size
+from animation.registry import get_algorithm
+from animation.trace import SWAP, WRITE
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# the first bytes of every trace file.
+MAGIC = b"SORTTRC\0"
+# bumped whenever the layout of the file changes, so older cached traces are not read.
+FORMAT_VERSION = 1
+# the compressions a trace file can use, by the id stored in the header.
+COMPRESSIONS = [None, "zlib", "lz4"]
+# magic, version, compression, float values, index size, then the sizes of the initial values, the operations, the
+# written values and the worker marks, and the recursion depth.
+HEADER = struct.Struct("<8sHBBB3xqqqqq")
+# the sections of an uncompressed file start at multiples of this, so they can be mapped as arrays.
+ALIGNMENT = 8
+# the size of a section of a compressed file is stored before it.
+FRAME = struct.Struct("<q")
+
+
+class MappedTrace:
+    """
+    The MappedTrace is a trace read from a trace file. It can be replayed like a Trace, but its operations are
+    NumPy arrays: for an uncompressed file they are memory-mapped, so a trace with millions of operations starts
+    replaying at once and only the pages that are replayed are read from the disk.
+
+    Parameters
+    ----------
+
+    initial : numpy.ndarray.
+    the values of the array before the algorithm started.
+
+    codes : numpy.ndarray.
+    first : numpy.ndarray.
+    second : numpy.ndarray.
+    written : numpy.ndarray.
+    the op codes, operands and written values, as in Trace.
+
+    worker_marks : list of tuple (int, int).
+
+    max_depth : int.
+    the deepest recursion level of the algorithm that recorded the trace.
+
+    Attributes
+    ----------
+
+    self.initial : numpy.ndarray.
+    self.codes : numpy.ndarray.
+    self.first : numpy.ndarray.
+    self.second : numpy.ndarray.
+    self.written : numpy.ndarray.
+    self.worker_marks : list of tuple (int, int).
+    self.max_depth : int.
+    """
+    def __init__(self, initial, codes, first, second, written, worker_marks, max_depth):
+        self.initial = initial
+        self.codes = codes
+        self.first = first
+        self.second = second
+        self.written = written
+        self.worker_marks = worker_marks
+        self.max_depth = max_depth
+
+    def __len__(self):
+        """
+        return the number of operations in the trace.
+        :return: int.
+        """
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        """
+        return the operation at the index provided as a tuple (op code, first operand, second operand).
+        for a WRITE operation the second operand is the written value.
+        :param index: int.
+        :return: tuple.
+        """
+        code = int(self.codes[index])
+        if code == WRITE:
+            return code, int(self.first[index]), self.written[self.second[index]].item()
+        return code, int(self.first[index]), int(self.second[index])
+
+    def __iter__(self):
+        """
+        iterate over the operations in the trace.
+        :return: generator.
+        """
+        for index in range(len(self.codes)):
+            yield self[index]
+
+    def count(self, code):
+        """
+        return the number of operations in the trace with the op code provided.
+        :param code: int.
+        :return: int.
+        """
+        return int(np.count_nonzero(self.codes == code))
+
+    def get_initial(self):
+        """
+        return a copy of the values of the array before the algorithm started.
+        :return: list.
+        """
+        return self.initial.tolist()
+
+    def get_worker_marks(self):
+        """
+        return the worker marks of the trace.
+        :return: list of tuple (int, int).
+        """
+        return self.worker_marks
+
+    def get_max_depth(self):
+        """
+        return the deepest recursion level of the algorithm that recorded the trace.
+        :return: int.
+        """
+        return self.max_depth
+
+    def apply(self, values, start=0, stop=None):
+        """
+        replay the operations in the range [start, stop) on the values provided (in place).
+        :param values: list.
+        :param start: int.
+        :param stop: int.
+        :return: None.
+        """
+        if stop is None:
+            stop = len(self.codes)
+        for index in range(start, stop):
+            code, first, second = self[index]
+            if code == SWAP:
+                values[first], values[second] = values[second], values[first]
+            elif code == WRITE:
+                values[first] = second
+
+
+def get_sections(trace):
+    """
+    return the arrays a trace is stored as, the indices are packed into 32-bit integers when they fit.
+    :param trace: Trace / MappedTrace.
+    :return: list of numpy.ndarray.
+    """
+    # the type of the written values follows the initial values, in a Trace as in a MappedTrace.
+    value_type = np.float64 if np.asarray(trace.written).dtype.kind == "f" else np.int64
+    initial = np.asarray(trace.get_initial(), dtype=value_type)
+    index_type = np.int64 if max(len(initial), len(trace.written)) >= 2 ** 31 else np.int32
+    marks = np.asarray(trace.get_worker_marks(), dtype=np.int64).reshape(-1, 2)
+    return [initial, np.asarray(trace.codes, dtype=np.int8), np.asarray(trace.first, dtype=index_type),
+            np.asarray(trace.second, dtype=index_type), np.asarray(trace.written, dtype=value_type), marks]
+
+
+def compress(data, compression):
+    """
+    compress a section of a trace file.
+    :param data: bytes.
+    :param compression: str / None, one of COMPRESSIONS.
+    :return: bytes.
+    """
+    if compression == "zlib":
+        return zlib.compress(data, 6)
+    if compression == "lz4":
+        if lz4 is None:
+            raise Exception("LZ4 compression needs the lz4 package")
+        return lz4.frame.compress(data)
+    return data
+
+
+def decompress(data, compression):
+    """
+    decompress a section of a trace file.
+    :param data: bytes.
+    :param compression: str / None, one of COMPRESSIONS.
+    :return: bytes.
+    """
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "lz4":
+        if lz4 is None:
+            raise Exception("LZ4 compression needs the lz4 package")
+        return lz4.frame.decompress(data)
+    return data
+
+
+def save_trace(trace, path, compression=None, max_depth=0):
+    """
+    This function writes a trace to a file. Without compression every section is aligned so the file can be
+    memory-mapped, with compression every section is compressed on its own and stored after its size.
+    The file is written next to its destination and renamed, so a reader never sees a partial file.
+    :param trace: Trace / MappedTrace.
+    :param path: str.
+    :param compression: str / None, one of COMPRESSIONS.
+    :param max_depth: int, the deepest recursion level of the algorithm.
+    :return: None.
+    """
+    if compression not in COMPRESSIONS:
+        raise Exception(f"Unknown compression: {compression}")
+    sections = get_sections(trace)
+    initial, codes, first, second, written, marks = sections
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, COMPRESSIONS.index(compression), written.dtype.kind == "f",
+                         first.itemsize, len(initial), len(codes), len(written), len(marks), max_depth)
+    directory = os.path.dirname(path) or "."
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(header)
+            for section in sections:
+                data = section.tobytes()
+                if compression is None:
+                    file.write(data)
+                    file.write(b"\0" * (-len(data) % ALIGNMENT))
+                else:
+                    data = compress(data, compression)
+                    file.write(FRAME.pack(len(data)))
+                    file.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def load_trace(path):
+    """
+    This function reads a trace file, an uncompressed file is memory-mapped instead of read.
+    :param path: str.
+    :return: MappedTrace.
+    """
+    with open(path, "rb") as file:
+        magic, version, compression, floats, index_size, initial_size, size, written_size, marks_size, max_depth = \
+            HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise Exception(f"Not a trace file of version {FORMAT_VERSION}: {path}")
+        compression = COMPRESSIONS[compression]
+        value_type = np.float64 if floats else np.int64
+        index_type = np.int64 if index_size == 8 else np.int32
+        layout = [(value_type, initial_size), (np.int8, size), (index_type, size), (index_type, size),
+                  (value_type, written_size), (np.int64, marks_size * 2)]
+        sections = []
+        if compression is None:
+            data = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) > HEADER.size else None
+            offset = HEADER.size
+            for dtype, count in layout:
+                nbytes = count * np.dtype(dtype).itemsize
+                sections.append(data[offset:offset + nbytes].view(dtype) if nbytes else np.empty(0, dtype))
+                offset += nbytes + (-nbytes % ALIGNMENT)
+        else:
+            for dtype, count in layout:
+                length, = FRAME.unpack(file.read(FRAME.size))
+                sections.append(np.frombuffer(decompress(file.read(length), compression), dtype=dtype))
+    initial, codes, first, second, written, marks = sections
+    worker_marks = [(int(index), int(worker)) for index, worker in marks.reshape(-1, 2)]
+    return MappedTrace(initial, codes, first, second, written, worker_marks, max_depth)
+
+
+class TraceCache:
+    """
+    The TraceCache keeps the traces of the algorithms on the disk, so an algorithm that already sorted some values
+    is replayed from its file instead of running again. A trace is found by the name of the algorithm, a hash of its
+    source code and the content of the values it sorted, so the same seed, size and distribution always hit the
+    same file, until the algorithm changes.
+    Large traces are stored uncompressed so they are memory-mapped when they are read, smaller ones are compressed.
+    The files take at most max_bytes: once a new trace is stored, the traces that were used the longest time ago are
+    removed until the rest fit.
+
+    Parameters
+    ----------
+
+    directory : str.
+    where the trace files are kept, created if it does not exist.
+
+    compression : str / None.
+    the compression of the small traces, one of COMPRESSIONS.
+
+    mmap_threshold : int.
+    traces with this many operations or more are stored uncompressed.
+
+    max_bytes : int.
+    the most bytes the trace files may take.
+
+    Attributes
+    ----------
+
+    self.directory : str.
+    self.compression : str / None.
+    self.mmap_threshold : int.
+    self.max_bytes : int.
+    """
+    def __init__(self, directory, compression="zlib", mmap_threshold=1 << 20, max_bytes=trace_cache_size):
+        self.directory = directory
+        self.compression = compression
+        self.mmap_threshold = mmap_threshold
+        self.max_bytes = max_bytes
+
+    def get_key(self, name, values):
+        """
+        return the key of the trace of an algorithm on the values provided.
+        :param name: str.
+        :param values: list / numpy.ndarray.
+        :return: str.
+        """
+        values = np.asarray(values)
+        digest = hashlib.sha256()
+        digest.update(f"{FORMAT_VERSION}:{name}:{get_algorithm(name).get_version()}:{values.dtype.kind}:".encode())
+        digest.update(values.astype(np.float64 if values.dtype.kind == "f" else np.int64).tobytes())
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        """
+        return the path of the file of the key provided.
+        :param key: str.
+        :return: str.
+        """
+        return os.path.join(self.directory, key[:2], key + ".trace")
+
+    def get(self, name, values):
+        """
+        return the cached trace of an algorithm on the values provided.
+        :param name: str.
+        :param values: list / numpy.ndarray.
+        :return: MappedTrace / None, None if the trace is not cached.
+        """
+        path = self.get_path(self.get_key(name, values))
+        if not os.path.exists(path):
+            return None
+        try:
+            trace = load_trace(path)
+        except Exception:
+            # a file of an older version or a damaged file is recorded again.
+            return None
+        try:
+            # the time the file was modified is the time it was last used, the oldest files are removed first.
+            os.utime(path)
+        except OSError:
+            pass
+        return trace
+
+    def put(self, name, values, trace, max_depth=0):
+        """
+        store the trace of an algorithm on the values provided.
+        :param name: str.
+        :param values: list / numpy.ndarray.
+        :param trace: Trace.
+        :param max_depth: int.
+        :return: str, the path of the file, removed at once if the trace alone does not fit in max_bytes.
+        """
+        path = self.get_path(self.get_key(name, values))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        save_trace(trace, path, None if len(trace) >= self.mmap_threshold else self.compression, max_depth)
+        self.evict()
+        return path
+
+    def get_files(self):
+        """
+        return the trace files of the cache, the least recently used first.
+        :return: list of tuple (float, int, str), the time the file was last used, its size and its path.
+        """
+        files = []
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".trace"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return sorted(files)
+
+    def evict(self):
+        """
+        remove the least recently used trace files until the files take at most max_bytes.
+        :return: int, the number of files removed.
+        """
+        files = self.get_files()
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # a file that is still mapped can not be removed on some systems, it is removed by a later eviction.
+                continue
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,433 @@
+from multiprocessing.sharedctypes import RawArray
+from animation.registry import get_algorithm
+from animation.trace import COMPARE, SWAP, WRITE, Trace, TracedArray
+import multiprocessing
+import numpy as np
+import os
+import signal
+import time
+
+# the number of operations the shared ring buffer of a stream holds.
+STREAM_CAPACITY = 1 << 16
+# the number of operations a worker collects before it copies them to the shared ring buffer.
+STREAM_CHUNK = 4096
+# the positions of the fields in the shared header of a stream.
+HEAD = 0
+TAIL = 1
+STATE = 2
+MAX_DEPTH = 3
+# the op code of a record that starts the operations of a worker (see Trace.mark_worker), only used in a stream.
+MARK = 3
+# the most bytes of the message of an exception raised by the algorithm that a stream carries.
+STREAM_ERROR_LENGTH = 256
+# the most seconds a recorder spends taking the operations of its worker in a frame.
+RECORDER_POLL_SECONDS = 0.005
+# the values of the STATE field of the header.
+RUNNING = 0
+FINISHED = 1
+FAILED = 2
+
+
+class TraceStream:
+    """
+    The TraceStream carries the operations of an algorithm that runs in a worker process to the render process while
+    the algorithm is still running. The operations go through a ring buffer in shared memory: the worker appends
+    them in chunks and waits when the buffer is full, the render process takes them as fast as the replay needs them.
+    Only one process writes to a stream and only one process reads from it.
+
+    The worker records into the stream like into a Trace (compare, swap, write, worker marks and the operations of
+    worker processes), so a TracedArray can record straight into it. A worker mark is a record of its own, with
+    the MARK op code and the worker as its first operand.
+
+    Parameters
+    ----------
+
+    floats : bool.
+    True if the values of the array are floats.
+
+    capacity : int.
+    the number of operations the ring buffer holds.
+
+    Attributes
+    ----------
+
+    self.floats : bool.
+    self.capacity : int.
+    self.shared_records : RawArray, the ring buffer of operations, shared between the processes.
+    self.shared_header : RawArray, the head (operations written), tail (operations read), state and recursion depth.
+    self.shared_error : RawArray, the message of the exception the algorithm raised, empty if it did not.
+    self.records : numpy.ndarray, a view of the ring buffer with a (code, first, second, value) record per operation.
+    self.header : numpy.ndarray, a view of the header.
+    self.chunk : list, the operations recorded by the worker that are not in the ring buffer yet.
+    """
+    def __init__(self, floats=False, capacity=STREAM_CAPACITY):
+        self.floats = floats
+        self.capacity = capacity
+        self.shared_records = RawArray('b', capacity * self.get_dtype().itemsize)
+        self.shared_header = RawArray('q', 4)
+        self.shared_error = RawArray('c', STREAM_ERROR_LENGTH)
+        self.create_views()
+
+    def __getstate__(self):
+        """
+        only the shared buffers are sent to the worker process, the views are created again on the other side.
+        :return: dict.
+        """
+        return {"floats": self.floats, "capacity": self.capacity, "shared_records": self.shared_records,
+                "shared_header": self.shared_header, "shared_error": self.shared_error}
+
+    def __setstate__(self, state):
+        """
+        restore a stream sent to another process.
+        :param state: dict.
+        :return: None.
+        """
+        self.__dict__.update(state)
+        self.create_views()
+
+    def create_views(self):
+        """
+        create the NumPy views of the shared buffers.
+        :return: None.
+        """
+        self.records = np.frombuffer(self.shared_records, dtype=self.get_dtype())
+        self.header = np.frombuffer(self.shared_header, dtype=np.int64)
+        self.chunk = []
+
+    def get_dtype(self):
+        """
+        return the type of an operation record, the written value is stored as a float if the array holds floats.
+        :return: numpy.dtype.
+        """
+        return np.dtype([("code", np.int64), ("first", np.int64), ("second", np.int64),
+                         ("value", np.float64 if self.floats else np.int64)])
+
+    def compare(self, i, j):
+        """
+        record a comparison between two indices.
+        :param i: int.
+        :param j: int.
+        :return: None.
+        """
+        self.add(COMPARE, i, j, 0)
+
+    def swap(self, i, j):
+        """
+        record a swap between two indices.
+        :param i: int.
+        :param j: int.
+        :return: None.
+        """
+        self.add(SWAP, i, j, 0)
+
+    def write(self, index, value):
+        """
+        record a write of a value to an index.
+        :param index: int.
+        :param value: int / float.
+        :return: None.
+        """
+        self.add(WRITE, index, 0, value)
+
+    def mark_worker(self, worker):
+        """
+        record that the next operations belong to the worker provided.
+        :param worker: int.
+        :return: None.
+        """
+        self.add(MARK, worker, 0, 0)
+
+    def extend(self, codes, first, second, written, workers=None):
+        """
+        record operations recorded by worker processes, like Trace.extend.
+        :param codes: numpy.ndarray, the op codes.
+        :param first: numpy.ndarray, the first operands.
+        :param second: numpy.ndarray, the second operands, for a WRITE the position of its value in written.
+        :param written: numpy.ndarray, the values of the WRITE operations.
+        :param workers: numpy.ndarray / None, the worker that recorded every operation, None to add no worker marks.
+        :return: None.
+        """
+        records = np.zeros(len(codes), dtype=self.get_dtype())
+        writes = codes == WRITE
+        records["code"] = codes
+        records["first"] = first
+        records["second"] = np.where(writes, 0, second)
+        records["value"][writes] = written[second[writes]]
+        if workers is not None:
+            changes = np.flatnonzero(np.diff(workers, prepend=-1))
+            marks = np.zeros(len(changes), dtype=self.get_dtype())
+            marks["code"] = MARK
+            marks["first"] = workers[changes]
+            records = np.insert(records, changes, marks)
+        self.flush()
+        self.write_records(records)
+
+    def add(self, code, first, second, value):
+        """
+        record an operation, the operations are copied to the ring buffer a chunk at a time.
+        :param code: int.
+        :param first: int.
+        :param second: int.
+        :param value: int / float.
+        :return: None.
+        """
+        self.chunk.append((code, first, second, value))
+        if len(self.chunk) >= STREAM_CHUNK:
+            self.flush()
+
+    def flush(self):
+        """
+        copy the recorded operations to the ring buffer, waiting for the reader while there is no room for them.
+        :return: None.
+        """
+        if not self.chunk:
+            return
+        chunk = np.array(self.chunk, dtype=self.get_dtype())
+        self.chunk = []
+        self.write_records(chunk)
+
+    def write_records(self, records):
+        """
+        copy records to the ring buffer, a part as large as the buffer at most at a time.
+        :param records: numpy.ndarray, of the type of get_dtype.
+        :return: None.
+        """
+        for start in range(0, len(records), self.capacity):
+            part = records[start:start + self.capacity]
+            head = int(self.header[HEAD])
+            while self.capacity - (head - int(self.header[TAIL])) < len(part):
+                time.sleep(0.001)
+            self.records[(head + np.arange(len(part))) % self.capacity] = part
+            # the records are in place before the head moves, so the reader never sees a partial part.
+            self.header[HEAD] = head + len(part)
+
+    def close(self, max_depth, error=None):
+        """
+        flush the last operations and mark the stream as finished, or as failed if an error is provided.
+        :param max_depth: int, the deepest recursion level the algorithm reached.
+        :param error: str / None, the message of the exception the algorithm raised.
+        :return: None.
+        """
+        self.flush()
+        self.header[MAX_DEPTH] = max_depth
+        if error is not None:
+            self.shared_error.value = error.encode(errors="replace")[:STREAM_ERROR_LENGTH - 1]
+        self.header[STATE] = FAILED if error is not None else FINISHED
+
+    def take(self, count):
+        """
+        take up to count operations that the worker already wrote, in the order they were recorded.
+        :param count: int.
+        :return: list of tuple (code, first, second, value).
+        """
+        return self.take_records(count).tolist()
+
+    def take_records(self, count):
+        """
+        take up to count records that the worker already wrote, in the order they were recorded.
+        :param count: int.
+        :return: numpy.ndarray, of the type of get_dtype.
+        """
+        tail = int(self.header[TAIL])
+        count = min(count, int(self.header[HEAD]) - tail)
+        if count <= 0:
+            return self.records[:0].copy()
+        records = self.records[(tail + np.arange(count)) % self.capacity]
+        self.header[TAIL] = tail + count
+        return records
+
+    def get_state(self):
+        """
+        return the state of the worker: RUNNING, FINISHED or FAILED.
+        :return: int.
+        """
+        return int(self.header[STATE])
+
+    def get_max_depth(self):
+        """
+        return the deepest recursion level the algorithm reached, known once it finished.
+        :return: int.
+        """
+        return int(self.header[MAX_DEPTH])
+
+    def get_error(self):
+        """
+        return the message of the exception the algorithm raised, known once it failed.
+        :return: str / None, None if it did not fail.
+        """
+        if self.get_state() != FAILED:
+            return None
+        return self.shared_error.value.decode(errors="replace")
+
+    def is_finished(self):
+        """
+        check if the worker is done and all its operations were taken.
+        :return: bool.
+        """
+        return self.get_state() != RUNNING and self.header[TAIL] == self.header[HEAD]
+
+
+def stop_worker(signum, frame):
+    """
+    This function handles SIGTERM in a worker process: the processes the algorithm started (the pool of a parallel
+    algorithm) are terminated and waited for before the worker exits, so none of them keeps running without it.
+    :param signum: int.
+    :param frame: frame / None.
+    :return: None.
+    """
+    children = multiprocessing.active_children()
+    for child in children:
+        child.terminate()
+    for child in children:
+        child.join()
+    os._exit(128 + signum)
+
+
+def stream_algorithm(name, values, stream):
+    """
+    This function runs in a worker process: it sorts the values with a registered algorithm and streams the
+    operations to the render process. An exception of the algorithm ends the stream with its message, the render
+    process shows it instead of the worker dying with a traceback. Stopping the worker stops its own worker processes
+    with it (see stop_worker).
+    :param name: str, the name of a registered algorithm.
+    :param values: list.
+    :param stream: TraceStream.
+    :return: None.
+    """
+    signal.signal(signal.SIGTERM, stop_worker)
+    traced_arr = TracedArray(values, stream)
+    try:
+        get_algorithm(name).get_function()(traced_arr)
+    except Exception as exception:
+        stream.close(traced_arr.max_depth, f"{type(exception).__name__}: {exception}")
+        return
+    stream.close(traced_arr.max_depth)
+
+
+def append_records(trace, records):
+    """
+    This function appends the records taken from a stream to a trace, the worker marks become marks of the trace.
+    :param trace: Trace.
+    :param records: numpy.ndarray, of the type of TraceStream.get_dtype.
+    :return: None.
+    """
+    codes = records["code"]
+    marks = np.flatnonzero(codes == MARK)
+    # a mark starts at the operation after it, which is the operation at its position less the marks before it.
+    positions = (len(trace) + marks - np.arange(len(marks))).tolist()
+    workers = records["first"][marks].tolist()
+    operations = records[codes != MARK] if len(marks) else records
+    writes = operations["code"] == WRITE
+    second = np.where(writes, np.cumsum(writes) - 1, operations["second"])
+    trace.extend(operations["code"], operations["first"], second, operations["value"][writes])
+    for position, worker in zip(positions, workers):
+        trace.mark_worker(worker, position)
+
+
+class TraceRecorder:
+    """
+    The TraceRecorder runs a registered algorithm in a worker process and collects the operations it streams into a
+    Trace, so the replay starts as soon as the first operations arrive and the window keeps handling events while
+    the algorithm runs, however many operations it does.
+    The worker is not a daemon, so the parallel algorithms can start their own worker processes in it.
+
+    Parameters
+    ----------
+
+    name : str.
+    the name of the algorithm.
+
+    values : list.
+    the values to sort.
+
+    Attributes
+    ----------
+
+    self.name : str.
+    self.trace : Trace, the operations that arrived so far.
+    self.stream : TraceStream.
+    self.process : multiprocessing.Process / None, the worker, None until the recording starts.
+    """
+    def __init__(self, name, values):
+        self.name = name
+        self.trace = Trace(values)
+        self.stream = TraceStream(self.trace.written.typecode == 'd')
+        self.process = None
+
+    def get_trace(self):
+        """
+        return the trace, it grows until the recording is finished.
+        :return: Trace.
+        """
+        return self.trace
+
+    def start(self):
+        """
+        start the worker process, it is spawned so it does not inherit the display.
+        :return: None.
+        """
+        context = multiprocessing.get_context("spawn")
+        self.process = context.Process(target=stream_algorithm,
+                                       args=(self.name, self.trace.get_initial(), self.stream))
+        self.process.start()
+
+    def stop(self):
+        """
+        stop the worker process if it is still running and wait for it, the processes it started stop with it.
+        :return: None.
+        """
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.process = None
+
+    def poll(self, seconds=RECORDER_POLL_SECONDS):
+        """
+        append the operations the worker streamed to the trace, for the seconds provided at most.
+        :param seconds: float.
+        :return: int, the number of operations appended.
+        """
+        size = len(self.trace)
+        deadline = time.perf_counter() + seconds
+        while True:
+            records = self.stream.take_records(self.stream.capacity)
+            if len(records) == 0:
+                break
+            append_records(self.trace, records)
+            if time.perf_counter() >= deadline:
+                break
+        return len(self.trace) - size
+
+    def has_failed(self):
+        """
+        check if the algorithm raised an exception or its worker died before it finished.
+        :return: bool.
+        """
+        return self.stream.get_state() == FAILED or (self.process is not None and self.process.exitcode not in
+                                                      (None, 0))
+
+    def is_finished(self):
+        """
+        check if all the operations of the algorithm were appended to the trace (or it failed).
+        :return: bool.
+        """
+        return self.stream.is_finished() or self.has_failed()
+
+    def get_max_depth(self):
+        """
+        return the deepest recursion level the algorithm reached, known once it finished.
+        :return: int.
+        """
+        return self.stream.get_max_depth()
+
+    def get_error(self):
+        """
+        return why the algorithm failed.
+        :return: str / None, None if it did not fail.
+        """
+        error = self.stream.get_error()
+        if error is None and self.process is not None and self.process.exitcode not in (None, 0):
+            error = f"the worker exited with code {self.process.exitcode}"
+        return error
@@ -0,0 +1,202 @@
+import numpy as np
+import pygame
+
+
+class BarArray:
+    """
+    The BarArray holds the values of the animation in a contiguous NumPy buffer and draws every value as a vertical
+    bar. The geometry of a bar is computed from its index when it is drawn, so moving a value is a single write to
+    the buffer and no per-bar objects are kept.
+
+    Parameters
+    ----------
+
+    values : iterable.
+    the values of the array, integers or floats.
+
+    x : int.
+    x-coordinate of the first bar.
+
+    y : int.
+    y-coordinate of the bottom of the bars.
+
+    gap : int / float.
+    horizontal distance between two bars, a fraction of a pixel when there are more bars than pixel columns.
+
+    width : int.
+    width of a bar.
+
+    color : tuple.
+    color of the bars.
+
+    scale : float.
+    height in pixels of a bar per unit of value above the baseline.
+
+    top : int.
+    y-coordinate of the top of the area the bars can cover.
+
+    baseline : int / float.
+    the value drawn as a bar of no height, so negative values and values far from zero can be shown.
+
+    Attributes
+    ----------
+
+    self.values : numpy.ndarray.
+    self.x : int.
+    self.y : int.
+    self.gap : int / float.
+    self.width : int.
+    self.color : tuple.
+    self.scale : float.
+    self.top : int.
+    self.baseline : int / float.
+    self.colors : numpy.ndarray / None, the color of every bar when the bars do not all have the color of the array.
+    """
+    def __init__(self, values, x, y, gap, width, color, scale=1, top=0, baseline=0):
+        values = np.asarray(values)
+        self.values = values.astype(np.int64 if np.issubdtype(values.dtype, np.integer) else np.float64)
+        self.x = x
+        self.y = y
+        self.gap = gap
+        self.width = width
+        self.color = color
+        self.scale = scale
+        self.top = top
+        self.baseline = baseline
+        self.colors = None
+
+    def __len__(self):
+        """
+        return the number of bars.
+        :return: int.
+        """
+        return len(self.values)
+
+    def __getitem__(self, index):
+        """
+        return the value at the index provided.
+        :param index: int.
+        :return: int / float.
+        """
+        return self.values[index].item()
+
+    def __setitem__(self, index, value):
+        """
+        update the value at the index provided.
+        :param index: int.
+        :param value: int / float.
+        :return: None.
+        """
+        self.values[index] = value
+
+    def get_values(self):
+        """
+        return the values as a list, this is the copy the sorting algorithms work on.
+        :return: list.
+        """
+        return self.values.tolist()
+
+    def swap(self, i, j):
+        """
+        swap the values at two indices.
+        :param i: int.
+        :param j: int.
+        :return: None.
+        """
+        values = self.values
+        values[i], values[j] = values[j], values[i]
+
+    def shuffle(self):
+        """
+        shuffle the values in place.
+        :return: None.
+        """
+        np.random.shuffle(self.values)
+
+    def set_color(self, index, color):
+        """
+        give the bar at the index provided its own color.
+        :param index: int.
+        :param color: tuple.
+        :return: None.
+        """
+        if self.colors is None:
+            self.colors = np.empty((len(self.values), 3), dtype=np.uint8)
+            self.colors[:] = self.color
+        self.colors[index] = color
+
+    def reset_colors(self):
+        """
+        give all the bars the color of the array again.
+        :return: None.
+        """
+        self.colors = None
+
+    def get_bar_color(self, index):
+        """
+        return the color of the bar at the index provided.
+        :param index: int.
+        :return: tuple.
+        """
+        if self.colors is None:
+            return self.color
+        return tuple(self.colors[index].tolist())
+
+    def get_bar_x(self, index):
+        """
+        return the x-coordinate of the bar at the index provided.
+        :param index: int.
+        :return: int.
+        """
+        return self.x + index * self.gap
+
+    def get_height(self, index):
+        """
+        return the height in pixels of the bar at the index provided.
+        :param index: int.
+        :return: int.
+        """
+        return int((self.values[index] - self.baseline) * self.scale)
+
+    def get_heights(self):
+        """
+        return the heights in pixels of all the bars.
+        :return: numpy.ndarray.
+        """
+        return ((self.values - self.baseline) * self.scale).astype(np.int64)
+
+    def get_rect(self):
+        """
+        return the rectangle of the display that all the bars can cover.
+        :return: pygame.Rect.
+        """
+        return pygame.Rect(self.x - self.gap // 2, self.top, len(self.values) * self.gap,
+                           self.y + self.width - self.top)
+
+    def get_column_rect(self, index):
+        """
+        return the rectangle of the display that the bar at the index provided can cover.
+        :param index: int.
+        :return: pygame.Rect.
+        """
+        return pygame.Rect(self.get_bar_x(index) - self.gap // 2, self.top, self.gap, self.y + self.width - self.top)
+
+    def draw_bar(self, window, index):
+        """
+        draw the bar at the index provided on the window surface.
+        :param window: pygame.display
+        :param index: int.
+        :return: None.
+        """
+        x = self.get_bar_x(index)
+        pygame.draw.line(window, self.get_bar_color(index), (x, self.y), (x, self.y - self.get_height(index)),
+                         self.width)
+
+    def draw_on_board(self, window):
+        """
+        draw all the bars on the window surface.
+        :param window: pygame.display
+        :return: None.
+        """
+        for index in range(len(self.values)):
+            self.draw_bar(window, index)
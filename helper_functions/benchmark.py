@@ -0,0 +1,82 @@
+import csv
+import json
+import time
+from animation.registry import get_algorithm
+from animation.trace import TracedArray
+from helper_functions.datasets import generate_values
+
+FIELDS = ["algorithm", "distribution", "size", "seed", "seconds", "comparisons", "swaps", "writes", "max_depth", "sorted",
+          "error"]
+
+
+def run_algorithm(name, values):
+    """
+    This function runs a single algorithm without a display and measures it.
+    :param name: str, the name of a registered algorithm.
+    :param values: list.
+    :return: dict, the wall time in seconds, the operation counts, the recursion depth, if the result is sorted and
+    the error (if any).
+    """
+    traced_arr = TracedArray(values)
+    error = ""
+    start = time.perf_counter()
+    try:
+        get_algorithm(name).get_function()(traced_arr)
+    except Exception as exception:
+        # a recursion that went too deep, or an algorithm that can not sort these values (radix sort and floats).
+        error = repr(exception)
+    seconds = time.perf_counter() - start
+    counters = traced_arr.get_counters()
+    return {
+        "seconds": seconds,
+        "comparisons": counters.comparisons,
+        "swaps": counters.swaps,
+        "writes": counters.writes,
+        "max_depth": counters.max_depth,
+        "sorted": not error and traced_arr.values == sorted(values),
+        "error": error,
+    }
+
+
+def run_benchmark(names, sizes, distributions, seed=0, datasets=()):
+    """
+    This function runs every algorithm on every size and distribution provided, and on every dataset loaded from a
+    file.
+    :param names: list of str.
+    :param sizes: list of int.
+    :param distributions: list of str.
+    :param seed: int, seed of the generated inputs, every algorithm sorts the same input.
+    :param datasets: list of tuple (str, list), the name and the values of every loaded dataset.
+    :return: generator of dict, one row per run.
+    """
+    for size in sizes:
+        for distribution in distributions:
+            values = generate_values(size, distribution, seed).tolist()
+            for name in names:
+                row = {"algorithm": name, "distribution": distribution, "size": size, "seed": seed}
+                row.update(run_algorithm(name, values))
+                yield row
+    for dataset, values in datasets:
+        for name in names:
+            row = {"algorithm": name, "distribution": dataset, "size": len(values), "seed": ""}
+            row.update(run_algorithm(name, values))
+            yield row
+
+
+def write_rows(rows, output, output_format):
+    """
+    This function writes the benchmark rows as csv or json.
+    :param rows: iterable of dict.
+    :param output: file object.
+    :param output_format: str, "csv" or "json".
+    :return: None.
+    """
+    if output_format == "json":
+        json.dump(list(rows), output, indent=2)
+        output.write("\n")
+    else:
+        writer = csv.DictWriter(output, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            output.flush()
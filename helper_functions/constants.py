@@ -23,13 +23,39 @@ VALUE_COLOR = (153, 255, 51)
 DARK_PURPLE = (70, 0, 120)
 MAGENTA = (204, 153, 255)
 line_gap = 7
-lines_start = 10
-lines_end = 600
-line_width = 3
-x_start = 250
+y_top = 50
+array_size = 126
+array_distribution = "shuffled"
 y_start = WIN_HEIGHT - line_gap * 5
 x_start_button = 50
 button_width = 100
+button_max_width = 180
 button_height = 50
 y_start_button = 50
 button_gap = 20
+x_start = x_start_button + button_max_width + button_gap
+pixel_backend_threshold = 1000
+hud_width = 130
+hud_margin = 5
+hud_gap = 10
+hud_x = WIN_WIDTH - hud_width - hud_margin
+hud_y = 50
+x_end = hud_x - hud_gap
+hud_line_height = 18
+timeline_y = y_start + 10
+timeline_height = 10
+timeline_memory = 1 << 26
+timeline_min_interval = 1024
+timeline_build_seconds = 0.004
+timeline_seek_build_seconds = 0.03
+frame_rate = 60
+SHUFFLE_BUTTON = "Shuffle Array"
+RACE_BUTTON = "Race"
+race_algorithms = ["Quick Sort", "Merge Sort", "Heap Sort", "Tim Sort"]
+race_columns = 2
+race_lane_gap = 20
+race_label_height = 14
+trace_cache_directory = "~/.cache/sorting_visualization/traces"
+trace_cache_size = 1 << 30
+WORKER_COLORS = [(230, 25, 75), (60, 180, 75), (0, 130, 200), (245, 130, 48), (145, 30, 180), (70, 240, 240),
+                 (240, 50, 230), (128, 128, 0)]
@@ -0,0 +1,331 @@
+import csv
+import itertools
+import os
+import numpy as np
+
+# the number of csv rows parsed into an array at a time, so a large file is never held as Python objects at once.
+CSV_CHUNK = 1 << 16
+# the range of the integers a csv chunk keeps as int64, the chunk holds floats from the first value out of it.
+INT64_MIN = int(np.iinfo(np.int64).min)
+INT64_MAX = int(np.iinfo(np.int64).max)
+# the extensions read as csv, every other extension but .npy is read as raw binary records.
+CSV_EXTENSIONS = [".csv", ".tsv", ".txt"]
+
+
+def uniform(size, rng):
+    """
+    random integers drawn uniformly from [1, size].
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    return rng.integers(1, size + 1, size)
+
+
+def shuffled(size, rng):
+    """
+    the integers 1..size in random order.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    return rng.permutation(np.arange(1, size + 1))
+
+
+def sorted_values(size, rng):
+    """
+    the integers 1..size in ascending order.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    return np.arange(1, size + 1)
+
+
+def reversed_values(size, rng):
+    """
+    the integers 1..size in descending order.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    return np.arange(size, 0, -1)
+
+
+def few_unique(size, rng):
+    """
+    random integers with only a handful of distinct values.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    return rng.integers(1, 9, size) * max(1, size // 8)
+
+
+def nearly_sorted(size, rng):
+    """
+    the integers 1..size in ascending order with about 2% of them swapped with a random partner.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    values = np.arange(1, size + 1)
+    if size > 1:
+        count = max(1, size // 50)
+        first = rng.integers(0, size, count)
+        second = rng.integers(0, size, count)
+        values[first], values[second] = values[second], values[first].copy()
+    return values
+
+
+def sawtooth(size, rng):
+    """
+    ascending runs of about sqrt(size) values that restart from the bottom, every run spans the whole range.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    teeth = max(1, int(np.sqrt(size)))
+    tooth = -(-size // teeth)
+    return (np.arange(size) % tooth) * size // tooth + 1
+
+
+def gaussian(size, rng):
+    """
+    random integers drawn from a normal distribution centered in [1, size], clipped to that range.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    values = np.rint(rng.normal((size + 1) / 2, size / 6, size)).astype(np.int64)
+    return np.clip(values, 1, max(1, size))
+
+
+def organ_pipe(size, rng):
+    """
+    the integers rise to the middle of the array and fall back, like the pipes of an organ.
+    :param size: int.
+    :param rng: numpy.random.Generator.
+    :return: numpy.ndarray.
+    """
+    half = np.arange(size)
+    return np.minimum(half, size - 1 - half) * 2 + 1
+
+
+DISTRIBUTIONS = {
+    "uniform": uniform,
+    "shuffled": shuffled,
+    "sorted": sorted_values,
+    "nearly_sorted": nearly_sorted,
+    "reversed": reversed_values,
+    "few_unique": few_unique,
+    "sawtooth": sawtooth,
+    "gaussian": gaussian,
+    "organ_pipe": organ_pipe,
+}
+
+
+def generate_values(size, distribution="uniform", seed=None):
+    """
+    This function generates an array of values to sort.
+    :param size: int.
+    :param distribution: str, one of the keys of DISTRIBUTIONS.
+    :param seed: int / None, the same seed always generates the same values.
+    :return: numpy.ndarray.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise Exception(f"Unknown distribution: {distribution}")
+    return DISTRIBUTIONS[distribution](size, np.random.default_rng(seed))
+
+
+def get_keys(values):
+    """
+    return the values as keys the algorithms can compare: integers as int64 and everything else as float64.
+    :param values: numpy.ndarray.
+    :return: numpy.ndarray.
+    """
+    if values.dtype.kind in "iub" and (values.size == 0 or values.max() <= np.iinfo(np.int64).max):
+        return np.asarray(values, dtype=np.int64)
+    return np.asarray(values, dtype=np.float64)
+
+
+def parse_number(text):
+    """
+    parse a csv field as an integer or a float.
+    :param text: str.
+    :return: int / float.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def is_number(row, column):
+    """
+    check if the field of a csv row in the column provided is a number, used to tell a header from the first row.
+    :param row: list of str.
+    :param column: int.
+    :return: bool.
+    """
+    try:
+        parse_number(row[column])
+        return True
+    except (ValueError, IndexError):
+        return False
+
+
+def iter_csv(path, column=0, chunk=CSV_CHUNK, limit=None):
+    """
+    This function streams a column of a csv file: the rows are parsed one chunk at a time straight into an array of
+    int64, that becomes an array of float64 at the first value that is not such an integer, so a chunk takes 8
+    bytes per value and a large file is never held as Python objects. The first row is skipped when it is a header,
+    and the column can be its name. Empty fields are skipped.
+    :param path: str.
+    :param column: int / str, the index or the name of the column.
+    :param chunk: int, the most values in an array.
+    :param limit: int / None, the most values to read.
+    :return: generator of numpy.ndarray.
+    """
+    delimiter = "\t" if path.lower().endswith(".tsv") else ","
+    count = 0
+    with open(path, newline="") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        first = next(reader, [])
+        if isinstance(column, str):
+            if column not in first:
+                raise Exception(f"No column {column} in {path}")
+            column = first.index(column)
+            rows = reader
+        else:
+            rows = itertools.chain([first], reader) if is_number(first, column) else reader
+        values = None
+        size = 0
+        for row in rows:
+            if limit is not None and count + size >= limit:
+                break
+            if column >= len(row) or not row[column].strip():
+                continue
+            try:
+                value = parse_number(row[column])
+            except ValueError:
+                raise Exception(f"Not a number on line {reader.line_num} of {path}: {row[column]}")
+            if values is None:
+                # the array of a chunk is only created once the previous one was used and released.
+                values = np.empty(chunk, dtype=np.int64)
+            if values.dtype == np.int64 and not (isinstance(value, int) and INT64_MIN <= value <= INT64_MAX):
+                values = values.astype(np.float64)
+            values[size] = value
+            size += 1
+            if size == chunk:
+                yield values
+                count += size
+                values = None
+                size = 0
+        if size:
+            yield values[:size]
+
+
+def read_csv(path, column=0, limit=None):
+    """
+    This function reads a column of a csv file, streamed by iter_csv.
+    :param path: str.
+    :param column: int / str, the index or the name of the column.
+    :param limit: int / None, the most values to read.
+    :return: numpy.ndarray.
+    """
+    chunks = list(iter_csv(path, column, limit=limit))
+    return get_keys(np.concatenate(chunks)) if chunks else np.empty(0, dtype=np.int64)
+
+
+def map_npy(path, column=0):
+    """
+    This function memory-maps a column of a .npy file, nothing is read from the disk until the values are used.
+    A 2-D array is mapped by column index and a structured array by field name.
+    :param path: str.
+    :param column: int / str, the index or the name of the column, ignored for a 1-D array.
+    :return: numpy.ndarray.
+    """
+    values = np.load(path, mmap_mode="r", allow_pickle=False)
+    if values.dtype.names is not None:
+        return values[column if isinstance(column, str) else values.dtype.names[column]]
+    if values.ndim == 2:
+        return values[:, column]
+    if values.ndim != 1:
+        raise Exception(f"Can not read a {values.ndim}-D array from {path}")
+    return values
+
+
+def map_binary(path, dtype, columns=1, column=0):
+    """
+    This function memory-maps a column of a file of raw binary records, every record being columns values of the
+    type provided. Nothing is read from the disk until the values are used.
+    :param path: str.
+    :param dtype: str / numpy.dtype, the type of the values, for example "<i8" or "<f4".
+    :param columns: int, the number of values in a record.
+    :param column: int, the index of the column.
+    :return: numpy.ndarray.
+    """
+    dtype = np.dtype(dtype)
+    size = os.path.getsize(path) // (dtype.itemsize * columns)
+    if size == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(size, columns))[:, column]
+
+
+def get_column(column):
+    """
+    return the column of the command line as an index if it is a number, as a name otherwise.
+    :param column: int / str.
+    :return: int / str.
+    """
+    return int(column) if isinstance(column, str) and column.isdigit() else column
+
+
+def load_values(path, column=0, limit=None, dtype=None, columns=1):
+    """
+    This function loads the values to sort from a file: csv (.csv, .tsv, .txt), NumPy (.npy) or raw binary
+    (any other extension, the type of the values is needed). The values keep their real keys, integers or floats,
+    the bars are scaled to them when they are drawn. Only the values that are kept are read from a mapped file.
+    :param path: str.
+    :param column: int / str, the index or the name of the column.
+    :param limit: int / None, the most values to read, all of them if None.
+    :param dtype: str / None, the type of the values of a binary file.
+    :param columns: int, the number of values in a record of a binary file.
+    :return: numpy.ndarray.
+    """
+    column = get_column(column)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        return read_csv(path, column, limit)
+    if extension == ".npy":
+        return get_keys(np.array(map_npy(path, column)[:limit]))
+    if dtype is None:
+        raise Exception(f"The type of the values of {path} is needed to read it as a binary file")
+    return get_keys(np.array(map_binary(path, dtype, columns, column)[:limit]))
+
+
+def iter_values(path, chunk, column=0, dtype=None, columns=1):
+    """
+    This function reads the values of a file like load_values, but a chunk at a time, for files too large to be
+    loaded at once. The chunks of a csv file are int64 or float64, the chunks of a mapped file keep its type.
+    :param path: str.
+    :param chunk: int, the most values in a chunk.
+    :param column: int / str, the index or the name of the column.
+    :param dtype: str / None, the type of the values of a binary file.
+    :param columns: int, the number of values in a record of a binary file.
+    :return: generator of numpy.ndarray.
+    """
+    column = get_column(column)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        yield from iter_csv(path, column, chunk)
+        return
+    if extension == ".npy":
+        values = map_npy(path, column)
+    elif dtype is None:
+        raise Exception(f"The type of the values of {path} is needed to read it as a binary file")
+    else:
+        values = map_binary(path, dtype, columns, column)
+    for start in range(0, len(values), chunk):
+        yield np.array(values[start:start + chunk])
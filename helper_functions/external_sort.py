@@ -0,0 +1,163 @@
+import heapq
+import itertools
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from helper_functions.datasets import CSV_EXTENSIONS, get_column, iter_values, map_npy
+
+# the default memory budget of the external sort, in bytes.
+EXTERNAL_MEMORY = 1 << 26
+# the default number of runs merged at once.
+EXTERNAL_FAN_IN = 16
+# the most bytes a value takes while it is merged as a Python object: the object and its pointer in a list.
+PYTHON_VALUE_BYTES = 40
+# the size of the buffer of an open file, the runs are read and written sequentially in blocks of this size.
+FILE_BUFFER = 1 << 20
+
+
+def read_run(path, dtype, block):
+    """
+    This function reads a sorted run back from its file, one block of values at a time.
+    :param path: str.
+    :param dtype: numpy.dtype.
+    :param block: int, the number of values read at a time.
+    :return: generator of int / float.
+    """
+    with open(path, "rb", buffering=FILE_BUFFER) as file:
+        while True:
+            values = np.fromfile(file, dtype=dtype, count=block)
+            if len(values) == 0:
+                return
+            yield from values.tolist()
+
+
+def write_values(file, values, dtype, block):
+    """
+    This function writes the values of an iterator to a file, one block at a time.
+    :param file: file.
+    :param values: iterator of int / float.
+    :param dtype: numpy.dtype.
+    :param block: int, the number of values written at a time.
+    :return: int, the number of values written.
+    """
+    count = 0
+    while True:
+        values_block = np.fromiter(itertools.islice(values, block), dtype=dtype)
+        if len(values_block) == 0:
+            return count
+        values_block.tofile(file)
+        count += len(values_block)
+
+
+def open_output(path, dtype, size):
+    """
+    This function opens the output file of the sort: a .npy file gets its header, any other file holds the raw
+    values.
+    :param path: str.
+    :param dtype: numpy.dtype.
+    :param size: int, the number of values that will be written.
+    :return: file.
+    """
+    file = open(path, "wb", buffering=FILE_BUFFER)
+    if path.lower().endswith(".npy"):
+        np.lib.format.write_array_header_1_0(file, {"descr": np.lib.format.dtype_to_descr(dtype),
+                                                    "fortran_order": False, "shape": (size,)})
+    return file
+
+
+def get_chunk_dtype(dtype, chunk, path):
+    """
+    return the type the runs are stored as, every chunk of a csv file must have the type of the first one.
+    :param dtype: numpy.dtype / None, the type of the previous chunks, None for the first chunk.
+    :param chunk: numpy.ndarray.
+    :param path: str.
+    :return: numpy.dtype.
+    """
+    if dtype is not None and chunk.dtype != dtype:
+        raise Exception(f"The values of {path} change from {dtype} to {chunk.dtype}, "
+                        f"sort it with the type of all its values")
+    return chunk.dtype
+
+
+def external_sort(source, output, memory=EXTERNAL_MEMORY, fan_in=EXTERNAL_FAN_IN, temporary=None, column=0,
+                  dtype=None, columns=1, log=None):
+    """
+    This function sorts a column of a file that may be larger than the memory, with an external merge sort.
+    The input is read in chunks that fit in the memory budget, every chunk is sorted and spilled to a temporary
+    file as a run, then every pass merges groups of fan_in runs with a heap until at most fan_in runs are left, and
+    the last pass merges them into the output. During a merge the budget is shared by the input buffer of every run
+    and the output buffer, and all the files are read and written sequentially.
+    :param source: str, a csv, .npy or raw binary file (see helper_functions.datasets.load_values).
+    :param output: str, a .npy file or a raw binary file of the sorted values.
+    :param memory: int, the memory budget in bytes.
+    :param fan_in: int, the most runs merged at once.
+    :param temporary: str / None, where the runs are spilled, the temporary directory of the system if None.
+    :param column: int / str, the column of the source.
+    :param dtype: str / None, the type of the values of a raw binary source, or of a csv source.
+    :param columns: int, the number of values in a record of a raw binary source.
+    :param log: function / None, called with a line of text after every phase.
+    :return: dict, the number of values, runs and merge passes, the bytes spilled and the seconds of every phase.
+    """
+    if fan_in < 2:
+        raise Exception("The fan-in of an external sort must be at least 2")
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".npy":
+        itemsize = map_npy(source, get_column(column)).dtype.itemsize
+    elif dtype is not None:
+        itemsize = np.dtype(dtype).itemsize
+    else:
+        # the values of a csv file are read as 8-byte integers or floats.
+        itemsize = 8
+    csv_dtype = np.dtype(dtype) if dtype is not None and extension in CSV_EXTENSIONS else None
+    directory = tempfile.mkdtemp(prefix="external_sort_", dir=temporary)
+    stats = {"values": 0, "runs": 0, "passes": 0, "spilled_bytes": 0}
+    log = log if log is not None else (lambda line: None)
+    try:
+        start = time.perf_counter()
+        runs = []
+        run_dtype = None
+        for chunk in iter_values(source, max(1, memory // itemsize), column, dtype, columns):
+            if csv_dtype is not None:
+                chunk = chunk.astype(csv_dtype)
+            run_dtype = get_chunk_dtype(run_dtype, chunk, source)
+            # equal values can not be told apart, so the chunk is sorted in place instead of with a stable sort that
+            # needs a buffer of half its size.
+            chunk.sort()
+            path = os.path.join(directory, f"run_{len(runs)}.bin")
+            chunk.tofile(path)
+            runs.append(path)
+            stats["values"] += len(chunk)
+            stats["spilled_bytes"] += chunk.nbytes
+            # the chunk is released before the next one is read, so only one chunk is in memory at a time.
+            del chunk
+        stats["runs"] = len(runs)
+        stats["run_seconds"] = time.perf_counter() - start
+        log(f"sorted {stats['values']} values into {len(runs)} runs in {stats['run_seconds']:.2f} s")
+        start = time.perf_counter()
+        run_dtype = run_dtype if run_dtype is not None else np.dtype(np.int64)
+        # a block of every run is read as an array and then as Python objects, which cost more than the array.
+        block = max(1, memory // ((fan_in + 1) * (run_dtype.itemsize + PYTHON_VALUE_BYTES)))
+        while len(runs) > fan_in:
+            merged = []
+            for group in range(0, len(runs), fan_in):
+                path = os.path.join(directory, f"run_{stats['passes']}_{len(merged)}.bin")
+                with open(path, "wb", buffering=FILE_BUFFER) as file:
+                    stats["spilled_bytes"] += run_dtype.itemsize * write_values(
+                        file, heapq.merge(*(read_run(run, run_dtype, block) for run in runs[group:group + fan_in])),
+                        run_dtype, block)
+                for run in runs[group:group + fan_in]:
+                    os.remove(run)
+                merged.append(path)
+            stats["passes"] += 1
+            log(f"pass {stats['passes']}: merged {len(runs)} runs into {len(merged)}")
+            runs = merged
+        with open_output(output, run_dtype, stats["values"]) as file:
+            write_values(file, heapq.merge(*(read_run(run, run_dtype, block) for run in runs)), run_dtype, block)
+        stats["passes"] += 1
+        stats["merge_seconds"] = time.perf_counter() - start
+        log(f"pass {stats['passes']}: merged {len(runs)} runs into {output} in {stats['merge_seconds']:.2f} s")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return stats
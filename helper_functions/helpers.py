@@ -1,53 +1,78 @@
-import random
-from geometry.point import Point
-from geometry.line import Line
+from geometry.bar_array import BarArray
 from helper_functions.constants import *
 from shapes.buttons_handler import ButtonsHandler
-from shapes.button import Button
+from shapes.button import Button, get_label_width
+from animation.registry import get_names
+from helper_functions.datasets import generate_values
 
 
 def create_buttons():
     """
-    This function creates the buttons for the animation and holds them together inside a ButtonHandler.
+    This function creates a button for every registered algorithm, the race button and the shuffle button, and holds
+    them together inside a ButtonHandler. The buttons shrink to fit the window when there are many algorithms, and
+    they are as wide as the widest name needs, up to button_max_width.
     :return: ButtonHandler
     """
     buttons = []
-    names = ["Quick Sort", "Merge Sort", "Bubble Sort", "Selection Sort", "Heap Sort", "Insertion Sort",
-             "Bucket Sort", "Radix Sort", "Shuffle Array"]
-    j = 0
+    names = get_names(buttons_only=True) + [RACE_BUTTON, SHUFFLE_BUTTON]
     colors = [RED, LIGHT_RED, GREEN, LIGHT_GREEN, BLUE, LIGHT_BLUE, YELLOW,
               LIGHT_YELLOW, PURPLE, LIGHT_PURPLE, PINK, LIGHT_PINK, ORANGE, LIGHT_ORANGE, CYAN, DARK_CYAN,
               DARK_PURPLE, MAGENTA]
-    for i in range(0, len(colors) - 1, 2):
-        button = Button(x_start_button, y_start_button + button_height * j + button_gap * j, button_width,
-                        button_height, colors[i], colors[i+1], names[j])
+    slot = min(button_height + button_gap, (WIN_HEIGHT - y_start_button) // len(names))
+    height = slot * button_height // (button_height + button_gap)
+    width = min(button_max_width, max([button_width] + [get_label_width(name) for name in names]))
+    for j, name in enumerate(names):
+        i = (j * 2) % len(colors)
+        button = Button(x_start_button, y_start_button + slot * j, width, height, colors[i], colors[i + 1], name)
         buttons.append(button)
-        j += 1
 
     buttons_handler = ButtonsHandler(buttons)
     return buttons_handler
 
 
-def create_arr_and_lines():
+def create_bar_array(size=array_size, distribution=array_distribution, seed=None, values=None):
     """
-    This function creates the lines for the animation.
-    :return: list.
+    This function creates the array of values for the animation, it fills the space between the buttons and the HUD.
+    :param size: int, the number of values.
+    :param distribution: str, one of the distributions of helper_functions.datasets.
+    :param seed: int / None.
+    :param values: numpy.ndarray / None, values loaded from a file, generated from the size, distribution and seed
+    if None.
+    :return: BarArray.
     """
-    numbers = list(range(line_gap - 2, lines_end + line_gap * 5, 5))
-    shuffle_arr(numbers)
-    arr = []
-    for i in range(len(numbers)):
-        start_point = Point(x_start + line_gap * i, y_start)
-        end_point = Point(x_start + line_gap * i, y_start - numbers[i])
-        line = Line(start_point, end_point, VALUE_COLOR, line_width)
-        arr.append(line)
-    return arr
-
-
-def shuffle_arr(arr):
+    if values is None:
+        values = generate_values(size, distribution, seed)
+    return fit_bar_array(values, x_start, x_end, y_top, y_start)
+
+
+def fit_bar_array(values, left, right, top, bottom):
     """
-    Shuffle the array provided in place.
-    :param arr: list.
-    :return: None.
+    This function creates a BarArray that fits the area provided: the spacing and width of the bars are computed
+    from the width of the area, and the heights so the largest value reaches its top. The bars start from zero,
+    unless there are negative values or the values are far from zero compared to their spread (timestamps for
+    example): then the smallest value gets the shortest bar, so the differences between the values stay visible.
+    :param values: numpy.ndarray.
+    :param left: int, x-coordinate of the first bar.
+    :param right: int.
+    :param top: int.
+    :param bottom: int, y-coordinate of the bottom of the bars.
+    :return: BarArray.
     """
-    random.shuffle(arr)
+    size = len(values)
+    available_width = right - left
+    if size <= available_width:
+        gap = available_width // max(1, size)
+        width = max(1, gap * 3 // 7)
+    else:
+        # more bars than pixel columns, the pixel backend draws the tallest bar of every column.
+        gap = available_width / size
+        width = 1
+    smallest = values.min().item() if size else 0
+    largest = values.max().item() if size else 0
+    spread = largest - smallest
+    baseline = 0
+    if smallest < 0 or smallest > spread:
+        baseline = smallest - (spread if spread > 0 else max(1, abs(smallest))) / (bottom - top)
+    scale = (bottom - top) / (largest - baseline) if largest > baseline else 1
+    return BarArray(values, left, bottom, gap, width, VALUE_COLOR, scale, top, baseline)
+
@@ -1,14 +1,26 @@
-from helper_functions.helpers import *
 import os
+# hide the pygame prompt before any module imports pygame, so the benchmark output stays clean.
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+from helper_functions.helpers import *
+from helper_functions.benchmark import run_benchmark, write_rows
+from animation.registry import get_names
+from helper_functions.datasets import DISTRIBUTIONS, generate_values, load_values
+from helper_functions.external_sort import EXTERNAL_FAN_IN, EXTERNAL_MEMORY, external_sort
 from animation.animation import Animation
 from animation.background import BackGround
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+from animation.trace_file import TraceCache
+from animation.export import export_animation
+import argparse
+import sys
+import time
 import pygame
 
 
-def main():
+def main(arguments):
     """
     main function to create the display and run the animation.
+    :param arguments: argparse.Namespace, the size, distribution and seed of the array (or the file it is loaded
+    from), the race algorithms and the trace cache.
     """
     # initializing the pygame display.
     pygame.init()
@@ -16,23 +28,201 @@ def main():
     pygame.display.set_caption("Sorting Algorithms Visualization")
     icon = pygame.image.load(os.path.join("resources/icon.png"))
     pygame.display.set_icon(icon)
-    # crating the lines, background, buttons handler and the animation.
-    lines = create_arr_and_lines()
+    # crating the array, background, buttons handler and the animation.
+    values = load_input(arguments, arguments.input) if arguments.input else None
+    array = create_bar_array(arguments.size, arguments.distribution, arguments.seed, values)
     buttons = create_buttons()
     background = BackGround(WHITE)
-    animation = Animation(buttons, background, lines)
+    cache = None if arguments.no_cache else TraceCache(os.path.expanduser(arguments.cache),
+                                                        max_bytes=parse_size(arguments.cache_size))
+    animation = Animation(buttons, background, array, race_algorithms=arguments.race, cache=cache)
     running = True
-    # running the animation
+    redraw = True
+    hovered = None
+    clock = pygame.time.Clock()
+    # running the animation, a replay advances one frame per iteration so events are handled while it runs.
     while running:
-        for event in pygame.event.get():
-            mouse = pygame.mouse.get_pos()
-            animation.update_display(window, mouse)
+        if animation.is_playing() or redraw:
+            # a replay is moving or the window still has to be redrawn (for example once a replay is over).
+            events = pygame.event.get()
+        else:
+            # nothing is moving, so sleep until an event arrives and take all the events that queued up with it.
+            events = [pygame.event.wait()] + pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                animation.choose_algorithm(window, mouse)
+                animation.choose_algorithm(window, event.pos)
+                redraw = True
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+                redraw = True
+            else:
+                animation.handle_event(event, window)
+        if animation.is_playing():
+            # the scheduler paces the replay, when it is over the buttons need their hover colors again.
+            redraw = not animation.advance()
+            continue
+        # only redraw if the hovered button changed or something else changed the display.
+        mouse = pygame.mouse.get_pos()
+        current = animation.button_handler.get_hovered(mouse)
+        if redraw or current is not hovered:
+            animation.update_display(window, mouse)
+            hovered = current
+            redraw = False
+        clock.tick(frame_rate)
+    # a recording still running in a worker process is stopped with the replay.
+    animation.cancel()
     pygame.quit()
 
 
+def benchmark(arguments):
+    """
+    run the algorithms without a display and write their measurements.
+    :param arguments: argparse.Namespace.
+    :return: None.
+    """
+    datasets = [(path, load_input(arguments, path).tolist()) for path in arguments.input or []]
+    # with input files only the files are measured, unless distributions are requested as well.
+    distributions = arguments.distributions or ([] if datasets else list(DISTRIBUTIONS))
+    rows = run_benchmark(arguments.algorithms, arguments.sizes, distributions, arguments.seed, datasets)
+    if arguments.output:
+        with open(arguments.output, "w", newline="") as output:
+            write_rows(rows, output, arguments.format)
+    else:
+        write_rows(rows, sys.stdout, arguments.format)
+
+
+def export(arguments):
+    """
+    render an algorithm into a video, an animated image or PNG frames without a display.
+    :param arguments: argparse.Namespace.
+    :return: None.
+    """
+    width, height = (int(side) for side in arguments.resolution.lower().split("x"))
+    if arguments.input:
+        values = load_input(arguments, arguments.input).tolist()
+    else:
+        values = generate_values(arguments.size, arguments.distribution, arguments.seed).tolist()
+    start = time.perf_counter()
+    frames = export_animation(arguments.algorithm, values, arguments.output, (width, height), arguments.fps,
+                              arguments.duration, arguments.hold, arguments.workers)
+    print(f"wrote {frames} frames to {arguments.output} in {time.perf_counter() - start:.1f} s")
+
+
+def sort_file(arguments):
+    """
+    sort a column of a file that may not fit in the memory with an external merge sort, without a display.
+    :param arguments: argparse.Namespace.
+    :return: None.
+    """
+    start = time.perf_counter()
+    stats = external_sort(arguments.source, arguments.output, parse_size(arguments.memory), arguments.fan_in,
+                          arguments.temp_dir, arguments.column, arguments.dtype, arguments.columns, print)
+    seconds = time.perf_counter() - start
+    print(f"{stats['values']} values sorted in {seconds:.2f} s ({stats['values'] / max(seconds, 1e-9):.0f} values/s), "
+          f"{stats['runs']} runs, {stats['passes']} merge passes, {stats['spilled_bytes'] / (1 << 20):.1f} MB spilled")
+
+
+def parse_size(text):
+    """
+    parse a number of bytes with an optional K, M or G suffix, for example 64M.
+    :param text: str.
+    :return: int.
+    """
+    text = text.strip().upper().removesuffix("B")
+    multiplier = 1 << (10 * ("KMG".index(text[-1]) + 1)) if text and text[-1] in "KMG" else 1
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+def load_input(arguments, path):
+    """
+    load the values of an input file with the column, limit and binary layout of the command line.
+    :param arguments: argparse.Namespace.
+    :param path: str.
+    :return: numpy.ndarray.
+    """
+    return load_values(path, arguments.column, arguments.limit, arguments.dtype, arguments.columns)
+
+
+def add_input_arguments(parser, several=False):
+    """
+    add the options that load the values from files instead of generating them.
+    :param parser: argparse.ArgumentParser.
+    :param several: bool, True if several files can be provided.
+    :return: None.
+    """
+    parser.add_argument("--input", nargs="+" if several else None,
+                        help="csv (.csv, .tsv, .txt), .npy or raw binary file to load the values from")
+    parser.add_argument("--column", default="0", help="index or name of the column of the input file")
+    parser.add_argument("--limit", type=int, default=None, help="most values read from the input file")
+    parser.add_argument("--dtype", help="type of the values of a raw binary input file, for example <i8 or <f4")
+    parser.add_argument("--columns", type=int, default=1, help="values in a record of a raw binary input file")
+
+
+def parse_arguments():
+    """
+    parse the command line, without a command the animation is opened.
+    :return: argparse.Namespace.
+    """
+    parser = argparse.ArgumentParser(description="Sorting Algorithms Visualization")
+    parser.add_argument("--size", type=int, default=array_size, help="number of values in the animation")
+    parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default=array_distribution,
+                        help="distribution of the values in the animation")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the values in the animation")
+    parser.add_argument("--race", nargs="+", choices=get_names(), default=race_algorithms,
+                        help="algorithms the race button runs side by side")
+    add_input_arguments(parser)
+    parser.add_argument("--cache", default=trace_cache_directory, help="directory the recorded traces are kept in")
+    parser.add_argument("--cache-size", default=str(trace_cache_size), help="most bytes the recorded traces take, "
+                                                                           "with an optional K, M or G suffix")
+    parser.add_argument("--no-cache", action="store_true", help="always run the algorithms instead of replaying "
+                                                                "their recorded traces")
+    commands = parser.add_subparsers(dest="command")
+    benchmark_parser = commands.add_parser("benchmark", help="run the algorithms without a display")
+    benchmark_parser.add_argument("--algorithms", nargs="+", choices=get_names(), default=get_names())
+    benchmark_parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000])
+    benchmark_parser.add_argument("--distributions", nargs="+", choices=list(DISTRIBUTIONS),
+                                  help="all of them by default, unless input files are measured")
+    benchmark_parser.add_argument("--seed", type=int, default=0)
+    benchmark_parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    benchmark_parser.add_argument("--output", help="file to write to, the standard output by default")
+    add_input_arguments(benchmark_parser, several=True)
+    export_parser = commands.add_parser("export", help="render an algorithm into a video or an animated image")
+    export_parser.add_argument("algorithm", choices=get_names())
+    export_parser.add_argument("output", help="the file to write, .png writes numbered frames, .apng an animated png "
+                                              "and other extensions (.mp4, .webm, .gif) are encoded by ffmpeg")
+    export_parser.add_argument("--size", type=int, default=array_size)
+    export_parser.add_argument("--distribution", choices=list(DISTRIBUTIONS), default=array_distribution)
+    export_parser.add_argument("--seed", type=int, default=0)
+    add_input_arguments(export_parser)
+    export_parser.add_argument("--resolution", default=f"{WIN_WIDTH}x{WIN_HEIGHT}", help="width x height of the frames")
+    export_parser.add_argument("--fps", type=int, default=30)
+    export_parser.add_argument("--duration", type=float, default=10, help="seconds the sort takes in the export")
+    export_parser.add_argument("--hold", type=float, default=1, help="seconds the sorted array is shown at the end")
+    export_parser.add_argument("--workers", type=int, default=None, help="processes that encode the frames, the "
+                                                                         "number of cores by default")
+    sort_parser = commands.add_parser("external-sort", help="sort a column of a file larger than the memory into a "
+                                                            ".npy or raw binary file")
+    sort_parser.add_argument("source", help="csv (.csv, .tsv, .txt), .npy or raw binary file to sort")
+    sort_parser.add_argument("output", help="the file to write, .npy or raw binary values of the type of the source")
+    sort_parser.add_argument("--memory", default=str(EXTERNAL_MEMORY), help="memory budget in bytes, with an "
+                                                                            "optional K, M or G suffix")
+    sort_parser.add_argument("--fan-in", type=int, default=EXTERNAL_FAN_IN, help="most runs merged at once")
+    sort_parser.add_argument("--temp-dir", default=None, help="directory the runs are spilled to, the temporary "
+                                                              "directory of the system by default")
+    sort_parser.add_argument("--column", default="0", help="index or name of the column of the source")
+    sort_parser.add_argument("--dtype", help="type of the values of a raw binary source, for example <i8 or <f4")
+    sort_parser.add_argument("--columns", type=int, default=1, help="values in a record of a raw binary source")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
+    arguments = parse_arguments()
+    if arguments.command == "benchmark":
+        benchmark(arguments)
+    elif arguments.command == "export":
+        export(arguments)
+    elif arguments.command == "external-sort":
+        sort_file(arguments)
+    else:
+        main(arguments)
@@ -1,5 +1,35 @@
 import pygame
 
+# fonts are expensive to create, so every size is created once and shared by all the buttons.
+fonts = {}
+# the size of the font of the labels, a label that does not fit in its button is drawn smaller.
+LABEL_FONT_SIZE = 20
+# the smallest size a label is drawn in.
+LABEL_MIN_FONT_SIZE = 8
+# the space left between a label and the sides of its button.
+LABEL_PADDING = 5
+
+
+def get_font(size):
+    """
+    return the default font in the size provided, creating it only the first time it is requested.
+    :param size: int.
+    :return: pygame.font.Font.
+    """
+    if size not in fonts:
+        fonts[size] = pygame.font.Font(None, size)
+    return fonts[size]
+
+
+def get_label_width(name):
+    """
+    return the width a button needs to show the name provided in the font of the labels.
+    :param name: str.
+    :return: int.
+    """
+    return get_font(LABEL_FONT_SIZE).size(name)[0] + 2 * LABEL_PADDING
+
+
 class Button:
     """
     The Button class represents a button on the animation, each button has color, hover color, name, and dimensions -
@@ -40,6 +70,8 @@ class Button:
     self.hover_color : button color if the mouse hovers over it.
     self.display_color : the color of the button when it is being displayed.
     self.name : button name.
+    self.surfaces : the rendered button for every color it was drawn with, so drawing is a single blit.
+    self.cache_key : the label, colors and dimensions the rendered surfaces were made with.
     """
     def __init__(self, x, y, width, height, color, hover_color, name):
         self.x = x
@@ -50,19 +82,54 @@ class Button:
         self.hover_color = hover_color
         self.display_color = self.color
         self.name = name
+        self.surfaces = {}
+        self.cache_key = None
+
+    def get_label_font(self):
+        """
+        return the font of the label, the largest size up to LABEL_FONT_SIZE that fits the name in the button.
+        :return: pygame.font.Font.
+        """
+        size = LABEL_FONT_SIZE
+        while size > LABEL_MIN_FONT_SIZE and get_font(size).size(self.name)[0] > self.width - 2 * LABEL_PADDING:
+            size -= 1
+        return get_font(size)
+
+    def render(self, color):
+        """
+        Render the button with the color provided onto a new surface, first we fill a rect representing the button.
+        then we type the button name centered inside it.
+        :param color: tuple.
+        :return: pygame.Surface.
+        """
+        BLACK = (0, 0, 0)
+        surface = pygame.Surface((self.width, self.height))
+        surface.fill(color)
+        text = self.get_label_font().render(self.name, 1, BLACK)
+        surface.blit(text, ((self.width - text.get_width()) // 2, (self.height - text.get_height()) // 2))
+        return surface
+
+    def get_surface(self):
+        """
+        return the rendered button in its display color, the surfaces are rendered again only if the label, colors
+        or dimensions changed since they were cached.
+        :return: pygame.Surface.
+        """
+        key = (self.name, self.color, self.hover_color, self.x, self.y, self.width, self.height)
+        if key != self.cache_key:
+            self.surfaces = {}
+            self.cache_key = key
+        if self.display_color not in self.surfaces:
+            self.surfaces[self.display_color] = self.render(self.display_color)
+        return self.surfaces[self.display_color]
 
     def draw_on_window(self, window):
         """
-        Draw the button on the display provided, first we draw a rect representing the button.
-        then we type the button name inside it.
+        Draw the button on the display provided by blitting its cached surface.
         :param window: pygame.display
         :return: None.
         """
-        BLACK = (0, 0, 0)
-        pygame.draw.rect(window, self.display_color, (self.x, self.y, self.width, self.height))
-        font = pygame.font.Font(None, 20)
-        text = font.render(self.name, 1, BLACK)
-        window.blit(text, ((self.x + self.width) / 3 + 5, (self.y * 2 + self.height) // 2 - 5))
+        window.blit(self.get_surface(), (self.x, self.y))
 
     def is_hover(self, position, window):
         """
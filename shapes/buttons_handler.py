@@ -74,6 +74,17 @@ class ButtonsHandler:
         for button in self.buttons:
             button.draw_on_window(win)
 
+    def get_hovered(self, position):
+        """
+        return the button the mouse is hovering over.
+        :param position: tuple.
+        :return: Button / None.
+        """
+        for button in self.buttons:
+            if button.clicked_on(position):
+                return button
+        return None
+
     def get_buttons(self):
         """
         return the list of buttons.
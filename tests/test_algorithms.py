@@ -0,0 +1,127 @@
+import random
+import pytest
+from animation import algorithms
+from animation.algorithms import RADIX_BITS
+from animation.registry import get_algorithm, get_names
+from animation.trace import TracedArray
+
+# the size of the arrays the algorithms sort, large enough for the hybrid algorithms to leave their insertion sorts.
+SIZE = 300
+# the algorithms that only sort integers, the radix sorts with every digit width.
+INTEGER_ONLY = [name for name in get_names() if name.endswith("Radix Sort")]
+
+
+def get_inputs():
+    """
+    return the arrays every algorithm is checked on, by name.
+    :return: dict of list.
+    """
+    rng = random.Random(0)
+    return {
+        "random": [rng.randint(-SIZE, SIZE) for _ in range(SIZE)],
+        "reversed": list(range(SIZE, 0, -1)),
+        "few unique": [rng.randint(1, 4) for _ in range(SIZE)],
+        "floats": [rng.uniform(-1, 1) for _ in range(SIZE)],
+        "empty": [],
+        "single": [7],
+    }
+
+
+INPUTS = get_inputs()
+
+
+def get_cases():
+    """
+    return every registered algorithm with every input it can sort.
+    :return: list of tuple (str, str).
+    """
+    return [(name, kind) for name in get_names() for kind in INPUTS
+            if not (name in INTEGER_ONLY and kind == "floats")]
+
+
+@pytest.mark.parametrize("name, kind", get_cases())
+def test_algorithm_sorts(name, kind):
+    values = INPUTS[kind]
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr)
+    assert list(arr.values) == sorted(values)
+
+
+@pytest.mark.parametrize("name, kind", get_cases())
+def test_trace_replays_to_sorted(name, kind):
+    values = INPUTS[kind]
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr)
+    trace = arr.get_trace()
+    replayed = list(trace.get_initial())
+    trace.apply(replayed)
+    assert replayed == sorted(values)
+
+
+@pytest.mark.parametrize("name", INTEGER_ONLY)
+def test_radix_sort_rejects_floats(name):
+    with pytest.raises(ValueError):
+        get_algorithm(name).get_function()(TracedArray(INPUTS["floats"]))
+
+
+@pytest.mark.parametrize("radix_bits", RADIX_BITS)
+@pytest.mark.parametrize("name", ["Radix Sort", "MSD Radix Sort"])
+def test_radix_sort_with_every_radix(name, radix_bits):
+    # values that need several digits of every width, with runs of equal values for the stable passes.
+    rng = random.Random(4)
+    values = [rng.randint(-(1 << 40), 1 << 40) for _ in range(SIZE)] + INPUTS["few unique"]
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr, radix_bits)
+    trace = arr.get_trace()
+    replayed = list(trace.get_initial())
+    trace.apply(replayed)
+    assert list(arr.values) == replayed == sorted(values)
+
+
+@pytest.mark.parametrize("name", ["Radix Sort", "MSD Radix Sort"])
+def test_radix_sort_rejects_unsupported_radix(name):
+    with pytest.raises(ValueError):
+        get_algorithm(name).get_function()(TracedArray(INPUTS["reversed"]), 12)
+
+
+@pytest.mark.parametrize("name, fallback", [("Bucket Sort", "merge"), ("Quick Bucket Sort", "quick"),
+                                            ("Heap Bucket Sort", "heap")])
+@pytest.mark.parametrize("kind", ["int", "float"])
+def test_bucket_sort_fallback_on_skewed_values(monkeypatch, name, fallback, kind):
+    # a few outliers stretch the range, so the clustered values all fall in the first buckets.
+    rng = random.Random(5)
+    cluster = [rng.randint(0, SIZE) if kind == "int" else rng.random() for _ in range(SIZE)]
+    values = cluster + [10 ** 6 + i for i in range(10)]
+    rng.shuffle(values)
+    sizes = []
+    sort_bucket = algorithms.BUCKET_SORT_FALLBACKS[fallback]
+
+    def record_bucket(arr, auxiliary_arr, lo, hi):
+        sizes.append(hi - lo)
+        sort_bucket(arr, auxiliary_arr, lo, hi)
+
+    monkeypatch.setitem(algorithms.BUCKET_SORT_FALLBACKS, fallback, record_bucket)
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr)
+    trace = arr.get_trace()
+    replayed = list(trace.get_initial())
+    trace.apply(replayed)
+    assert list(arr.values) == replayed == sorted(values)
+    assert sizes and max(sizes) > algorithms.BUCKET_SORT_INSERTION_THRESHOLD
+
+
+def test_bucket_sort_rejects_unknown_fallback():
+    with pytest.raises(Exception):
+        get_algorithm("Bucket Sort").get_function()(TracedArray(INPUTS["random"]), "shell")
+
+
+@pytest.mark.parametrize("name", ["Parallel Merge Sort", "Parallel Sample Sort"])
+def test_parallel_algorithm_with_workers(name):
+    values = INPUTS["random"] * 20
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr, 2)
+    trace = arr.get_trace()
+    replayed = list(trace.get_initial())
+    trace.apply(replayed)
+    assert list(arr.values) == replayed == sorted(values)
+    assert {worker for _, worker in trace.get_worker_marks()} == {0, 1}
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from helper_functions.datasets import DISTRIBUTIONS, generate_values, iter_csv, iter_values, load_values
+from helper_functions.datasets import map_binary, map_npy
+
+
+def write_lines(path, lines):
+    """
+    write the lines provided to a text file.
+    :param path: pathlib.Path.
+    :param lines: list of str.
+    :return: str, the path.
+    """
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_generate_values(distribution):
+    values = generate_values(500, distribution, seed=1)
+    assert len(values) == 500
+    assert values.min() >= 1 and values.max() <= 500
+    assert (generate_values(500, distribution, seed=1) == values).all()
+    assert len(generate_values(0, distribution)) == 0
+
+
+def test_generate_values_rejects_unknown_distribution():
+    with pytest.raises(Exception):
+        generate_values(10, "zigzag")
+
+
+def test_iter_csv_chunks_and_header(tmp_path):
+    path = write_lines(tmp_path / "values.csv", ["id,value"] + [f"{i},{100 - i}" for i in range(10)])
+    chunks = list(iter_csv(path, 1, chunk=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(chunk.dtype == np.int64 for chunk in chunks)
+    assert np.concatenate(chunks).tolist() == [100 - i for i in range(10)]
+    assert np.concatenate(list(iter_csv(path, "value", chunk=4))).tolist() == [100 - i for i in range(10)]
+    assert np.concatenate(list(iter_csv(path, 1, chunk=4, limit=5))).tolist() == [100, 99, 98, 97, 96]
+
+
+def test_iter_csv_without_header(tmp_path):
+    path = write_lines(tmp_path / "values.tsv", ["3\ta", "", "1\tb", "\tc", "2\td"])
+    assert np.concatenate(list(iter_csv(path))).tolist() == [3, 1, 2]
+
+
+def test_iter_csv_turns_to_floats(tmp_path):
+    # a float and an integer too large for int64 turn the chunk to float64, the values before them are kept.
+    path = write_lines(tmp_path / "values.csv", ["7", "2.5", "1", str(1 << 70)])
+    chunks = list(iter_csv(path, chunk=2))
+    assert [chunk.dtype for chunk in chunks] == [np.float64, np.float64]
+    assert np.concatenate(chunks).tolist() == [7.0, 2.5, 1.0, float(1 << 70)]
+
+
+def test_iter_csv_errors(tmp_path):
+    path = write_lines(tmp_path / "values.csv", ["value", "1", "two"])
+    with pytest.raises(Exception, match="line 3"):
+        list(iter_csv(path))
+    with pytest.raises(Exception, match="No column"):
+        list(iter_csv(path, "key"))
+
+
+def test_map_npy(tmp_path):
+    path = str(tmp_path / "values.npy")
+    np.save(path, np.arange(10, dtype=np.int32))
+    assert map_npy(path).tolist() == list(range(10))
+    np.save(path, np.arange(12.0).reshape(4, 3))
+    assert map_npy(path, 2).tolist() == [2.0, 5.0, 8.0, 11.0]
+    records = np.array([(1, 0.5), (2, 0.25)], dtype=[("key", "<i8"), ("weight", "<f8")])
+    np.save(path, records)
+    assert map_npy(path, "weight").tolist() == [0.5, 0.25]
+    assert map_npy(path, 0).tolist() == [1, 2]
+    np.save(path, np.zeros((2, 2, 2)))
+    with pytest.raises(Exception):
+        map_npy(path)
+
+
+def test_map_binary(tmp_path):
+    path = tmp_path / "values.bin"
+    path.write_bytes(np.arange(12, dtype="<i4").tobytes())
+    assert map_binary(str(path), "<i4").tolist() == list(range(12))
+    assert map_binary(str(path), "<i4", columns=3, column=1).tolist() == [1, 4, 7, 10]
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert len(map_binary(str(empty), "<f8")) == 0
+
+
+def test_load_values(tmp_path):
+    csv_path = write_lines(tmp_path / "values.csv", ["5", "3", "4"])
+    assert load_values(csv_path).tolist() == [5, 3, 4]
+    assert load_values(csv_path, limit=2).tolist() == [5, 3]
+    npy_path = str(tmp_path / "values.npy")
+    np.save(npy_path, np.array([[1, 2], [3, 4], [5, 6]], dtype=np.uint8))
+    values = load_values(npy_path, "1", limit=2)
+    assert values.dtype == np.int64 and values.tolist() == [2, 4]
+    bin_path = tmp_path / "values.dat"
+    bin_path.write_bytes(np.array([0.5, 1.5, 2.5], dtype="<f4").tobytes())
+    values = load_values(str(bin_path), dtype="<f4")
+    assert values.dtype == np.float64 and values.tolist() == [0.5, 1.5, 2.5]
+    with pytest.raises(Exception):
+        load_values(str(bin_path))
+
+
+def test_iter_values(tmp_path):
+    csv_path = write_lines(tmp_path / "values.csv", [str(i) for i in range(7)])
+    assert [chunk.tolist() for chunk in iter_values(csv_path, 3)] == [[0, 1, 2], [3, 4, 5], [6]]
+    bin_path = tmp_path / "values.bin"
+    bin_path.write_bytes(np.arange(7, dtype="<i8").tobytes())
+    assert [chunk.tolist() for chunk in iter_values(str(bin_path), 4, dtype="<i8")] == [[0, 1, 2, 3], [4, 5, 6]]
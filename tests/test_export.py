@@ -0,0 +1,114 @@
+import shutil
+import struct
+import zlib
+import numpy as np
+import pytest
+from animation.export import APNG_MAX_DELAY, PNG_SIGNATURE, ApngWriter, PngSequenceWriter, create_writer
+from animation.export import export_animation, get_frame_delay
+
+# the resolution of the frames of the tests.
+SIZE = (24, 16)
+
+
+def get_frame(seed):
+    """
+    return the RGB pixels of a random frame.
+    :param seed: int.
+    :return: bytes.
+    """
+    return np.random.default_rng(seed).integers(0, 256, SIZE[0] * SIZE[1] * 3, dtype=np.uint8).tobytes()
+
+
+def read_chunks(path):
+    """
+    return the chunks of a PNG file, after checking its signature and the checksum of every chunk.
+    :param path: str.
+    :return: list of tuple (bytes, bytes), the type and the data of every chunk.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    assert data.startswith(PNG_SIGNATURE)
+    chunks = []
+    offset = len(PNG_SIGNATURE)
+    while offset < len(data):
+        length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        assert struct.unpack(">I", data[offset + 8 + length:offset + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks.append((kind, body))
+        offset += 12 + length
+    return chunks
+
+
+def decode_image(data, size):
+    """
+    return the RGB pixels of the compressed image data of a PNG with the "up" filter on every row.
+    :param data: bytes.
+    :param size: tuple (int, int).
+    :return: bytes.
+    """
+    rows = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(size[1], size[0] * 3 + 1)
+    assert (rows[:, 0] == 2).all()
+    return np.cumsum(rows[:, 1:], axis=0, dtype=np.uint8).tobytes()
+
+
+def test_frame_delay():
+    assert get_frame_delay(1, 30) == (1, 30)
+    assert get_frame_delay(45, 30) == (3, 2)
+    numerator, denominator = get_frame_delay(100003, 99991)
+    assert numerator <= APNG_MAX_DELAY and denominator <= APNG_MAX_DELAY
+    assert numerator / denominator == pytest.approx(100003 / 99991, rel=1e-4)
+    assert get_frame_delay(APNG_MAX_DELAY * 60, 30) == (APNG_MAX_DELAY, 1)
+
+
+def test_png_sequence_writer(tmp_path):
+    writer = PngSequenceWriter(str(tmp_path / "frames.png"), SIZE, 30, 1)
+    frames = [get_frame(seed) for seed in range(3)]
+    for data in frames:
+        writer.add(data, 2)
+    writer.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"frames_0000{i}.png" for i in range(3)]
+    for i, data in enumerate(frames):
+        chunks = read_chunks(str(tmp_path / f"frames_0000{i}.png"))
+        assert [kind for kind, _ in chunks] == [b"IHDR", b"IDAT", b"IEND"]
+        assert struct.unpack(">II", chunks[0][1][:8]) == SIZE
+        assert decode_image(chunks[1][1], SIZE) == data
+
+
+def test_apng_writer(tmp_path):
+    path = str(tmp_path / "animation.apng")
+    writer = ApngWriter(path, SIZE, 30, 1)
+    frames = [get_frame(seed) for seed in range(4)]
+    for data in frames[:-1]:
+        writer.add(data)
+    writer.add(frames[-1], 60)
+    writer.close()
+    chunks = read_chunks(path)
+    assert [kind for kind, _ in chunks] == [b"IHDR", b"acTL", b"fcTL", b"IDAT"] + [b"fcTL", b"fdAT"] * 3 + [b"IEND"]
+    assert struct.unpack(">II", chunks[1][1]) == (4, 0)
+    controls = [struct.unpack(">IIIIIHHBB", body) for kind, body in chunks if kind == b"fcTL"]
+    images = [body for kind, body in chunks if kind in (b"IDAT", b"fdAT")]
+    # the frame chunks share one sequence of numbers, the first image is the IDAT and has none.
+    sequence = [control[0] for control in controls] + [struct.unpack(">I", body[:4])[0] for body in images[1:]]
+    assert sorted(sequence) == list(range(7))
+    assert [control[5:7] for control in controls] == [(1, 30)] * 3 + [(2, 1)]
+    assert [decode_image(body, SIZE) for body in images[:1] + [body[4:] for body in images[1:]]] == frames
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is not None, reason="ffmpeg writes every format")
+def test_create_writer_without_ffmpeg(tmp_path):
+    with pytest.raises(Exception):
+        create_writer(str(tmp_path / "animation.mp4"), SIZE, 30, 1)
+
+
+def test_export_animation(tmp_path):
+    path = str(tmp_path / "sort.apng")
+    values = list(range(40, 0, -1))
+    # 10 frames for the operations and 5 for the hold.
+    frames = export_animation("Heap Sort", values, path, size=(120, 80), fps=10, duration=1.0, hold=0.5, workers=1)
+    assert frames == 15
+    chunks = read_chunks(path)
+    count = struct.unpack(">II", chunks[1][1])[0]
+    controls = [struct.unpack(">IIIIIHHBB", body) for kind, body in chunks if kind == b"fcTL"]
+    assert len(controls) == count == 11
+    # every frame lasts its share of the animation, so the frames add up to the number returned.
+    assert sum(round(control[5] / control[6] * 10) for control in controls) == frames
@@ -0,0 +1,59 @@
+import os
+import numpy as np
+import pytest
+from helper_functions.external_sort import external_sort
+
+
+@pytest.mark.parametrize("dtype", ["<i8", "<f4"])
+def test_external_sort_merges_in_passes(tmp_path, dtype):
+    values = np.random.default_rng(7).integers(-1000, 1000, 1000).astype(dtype)
+    source = tmp_path / "values.bin"
+    source.write_bytes(values.tobytes())
+    output = str(tmp_path / "sorted.npy")
+    temporary = tmp_path / "runs"
+    temporary.mkdir()
+    lines = []
+    # 100 values fit in the memory budget, so there are 10 runs merged 3 at a time: 10 -> 4 -> 2 -> the output.
+    stats = external_sort(str(source), output, memory=100 * values.itemsize, fan_in=3, temporary=str(temporary),
+                          dtype=dtype, log=lines.append)
+    assert stats["values"] == 1000 and stats["runs"] == 10 and stats["passes"] == 3
+    assert len(lines) == 4
+    result = np.load(output)
+    assert result.dtype == values.dtype
+    assert result.tolist() == sorted(values.tolist())
+    # the runs are removed once the output is written.
+    assert os.listdir(temporary) == []
+
+
+def test_external_sort_of_a_csv_column(tmp_path):
+    source = tmp_path / "values.csv"
+    source.write_text("name,value\n" + "".join(f"v{i},{(i * 37) % 101}\n" for i in range(300)))
+    output = tmp_path / "sorted.bin"
+    stats = external_sort(str(source), str(output), memory=8 * 64, fan_in=2, column="value")
+    assert stats["runs"] == 5
+    assert np.fromfile(str(output), dtype=np.int64).tolist() == sorted((i * 37) % 101 for i in range(300))
+
+
+def test_external_sort_of_a_csv_with_a_type(tmp_path):
+    # the first chunk holds integers and the second one floats, so the type of the values is needed to sort them.
+    source = tmp_path / "values.csv"
+    source.write_text("3\n1\n2.5\n0.5\n")
+    output = str(tmp_path / "sorted.npy")
+    with pytest.raises(Exception):
+        external_sort(str(source), output, memory=16)
+    external_sort(str(source), output, memory=16, dtype="<f8")
+    assert np.load(output).tolist() == [0.5, 1.0, 2.5, 3.0]
+
+
+def test_external_sort_of_an_empty_file(tmp_path):
+    source = tmp_path / "empty.npy"
+    np.save(str(source), np.empty(0, dtype=np.int32))
+    output = str(tmp_path / "sorted.npy")
+    stats = external_sort(str(source), output)
+    assert stats["values"] == 0 and stats["runs"] == 0
+    assert len(np.load(output)) == 0
+
+
+def test_external_sort_rejects_small_fan_in(tmp_path):
+    with pytest.raises(Exception):
+        external_sort(str(tmp_path / "values.csv"), str(tmp_path / "sorted.npy"), fan_in=1)
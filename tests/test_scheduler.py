@@ -0,0 +1,64 @@
+import pygame
+import pytest
+from animation.scheduler import Scheduler
+
+
+def press(scheduler, key):
+    """
+    send a key press to the scheduler.
+    :param scheduler: Scheduler.
+    :param key: int.
+    :return: None.
+    """
+    scheduler.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+
+def test_budget_follows_the_speed():
+    scheduler = Scheduler(operations_per_second=256)
+    # a quarter of an operation per frame is kept as credit until it adds up to whole operations.
+    assert [scheduler.get_budget(1 / 1024) for _ in range(8)] == [0, 0, 0, 1, 0, 0, 0, 1]
+    assert scheduler.get_budget(0.5) == 128
+    assert sum(scheduler.get_budget(1 / 60) for _ in range(60)) == pytest.approx(256, abs=1)
+
+
+def test_pause_and_step():
+    scheduler = Scheduler(operations_per_second=100)
+    scheduler.get_budget(0.005)
+    press(scheduler, pygame.K_SPACE)
+    assert scheduler.paused and scheduler.credit == 0
+    assert scheduler.get_budget(1.0) == 0
+    press(scheduler, pygame.K_RIGHT)
+    press(scheduler, pygame.K_RIGHT)
+    assert scheduler.get_budget(1.0) == 2
+    assert scheduler.get_budget(1.0) == 0
+    press(scheduler, pygame.K_SPACE)
+    assert not scheduler.paused
+    assert scheduler.get_budget(0.1) == 10
+
+
+def test_fast_forward_and_speed_keys():
+    scheduler = Scheduler(operations_per_second=100, fast_forward_factor=4)
+    press(scheduler, pygame.K_f)
+    assert scheduler.get_budget(0.1) == 40
+    press(scheduler, pygame.K_f)
+    press(scheduler, pygame.K_UP)
+    assert scheduler.operations_per_second == 200
+    for _ in range(10):
+        press(scheduler, pygame.K_DOWN)
+    # the speed never drops to zero, so a replay always ends.
+    assert scheduler.operations_per_second == 1
+    scheduler.handle_event(pygame.event.Event(pygame.KEYUP, key=pygame.K_UP))
+    assert scheduler.operations_per_second == 1
+    assert scheduler.get_status() == ["speed: 1 ops/s", "state: playing"]
+
+
+def test_reset_keeps_the_speed():
+    scheduler = Scheduler(operations_per_second=300)
+    press(scheduler, pygame.K_f)
+    press(scheduler, pygame.K_SPACE)
+    press(scheduler, pygame.K_RIGHT)
+    assert scheduler.get_status()[1] == "state: paused"
+    scheduler.reset()
+    assert not scheduler.paused and not scheduler.fast_forward
+    assert scheduler.pending_steps == 0 and scheduler.credit == 0
+    assert scheduler.operations_per_second == 300
@@ -0,0 +1,89 @@
+import random
+import pytest
+from animation.registry import get_algorithm
+from animation.timeline import Timeline
+from animation.trace import COMPARE, SWAP, WRITE, TracedArray
+
+
+def record(name, values):
+    """
+    return the trace of a registered algorithm on the values provided.
+    :param name: str.
+    :param values: list.
+    :return: Trace.
+    """
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr)
+    return arr.get_trace()
+
+
+def replay(trace, position):
+    """
+    return the array after the operations of the trace before the position provided, replayed from the start.
+    :param trace: Trace.
+    :param position: int.
+    :return: list.
+    """
+    values = list(trace.get_initial())
+    trace.apply(values, 0, position)
+    return values
+
+
+@pytest.mark.parametrize("name", ["Heap Sort", "Merge Sort"])
+@pytest.mark.parametrize("kind", ["int", "float"])
+def test_timeline_seeks_to_every_position(name, kind):
+    rng = random.Random(6)
+    values = [rng.randint(0, 200) if kind == "int" else rng.random() for _ in range(200)]
+    trace = record(name, values)
+    # room for eight snapshots, so the interval is a fraction of the trace.
+    timeline = Timeline(trace, memory=8 * 8 * len(values), min_interval=16)
+    positions = list(range(0, len(trace) + 1, 7)) + [len(trace)]
+    # the positions are visited out of order, like the seeks of a click on the timeline bar.
+    rng.shuffle(positions)
+    for position in positions:
+        assert timeline.get_values(position) == replay(trace, position)
+    assert timeline.get_values(-5) == values
+    assert timeline.get_values(len(trace) + 5) == sorted(values)
+
+
+def test_timeline_halves_its_snapshots_when_the_trace_grows():
+    values = list(range(100, 0, -1))
+    trace = record("Bubble Sort", values)
+    timeline = Timeline(trace, memory=4 * 8 * len(values), min_interval=8)
+    interval = timeline.interval
+    assert timeline.limit == 4
+    # the trace grows while it is recorded, far past the snapshots the first interval was chosen for.
+    recorded = len(trace)
+    for i in range(5 * recorded):
+        trace.swap(i % 100, (i * 7) % 100)
+    assert timeline.build(None)
+    assert len(timeline.snapshots) <= timeline.limit
+    assert timeline.interval > interval
+    for keyframe, snapshot in enumerate(timeline.snapshots):
+        assert snapshot.tolist() == replay(trace, keyframe * timeline.interval)
+    for position in (recorded, recorded + 1, len(trace) // 2, len(trace)):
+        assert timeline.get_values(position) == replay(trace, position)
+
+
+def test_timeline_builds_ahead_of_the_replay():
+    values = list(range(300, 0, -1))
+    trace = record("Insertion Sort", values)
+    timeline = Timeline(trace, min_interval=64)
+    assert timeline.is_ready(0) and not timeline.is_ready(len(trace))
+    # a slice that is over at once still replays one step, so every frame makes progress.
+    assert not timeline.build(0)
+    assert 0 < timeline.built < len(trace)
+    assert timeline.build(None, 1000)
+    assert timeline.built == 1000
+    assert timeline.is_ready(1000) and not timeline.is_ready(1001)
+    assert timeline.build(None)
+    assert timeline.is_ready(len(trace) + 1)
+
+
+def test_timeline_counts_operations():
+    values = [5, 3, 8, 1, 9, 2, 7]
+    trace = record("Merge Sort", values)
+    timeline = Timeline(trace)
+    for code in (COMPARE, SWAP, WRITE):
+        assert timeline.count(code, len(trace)) == trace.count(code)
+        assert timeline.count(code, 5) == sum(1 for operation in list(trace)[:5] if operation[0] == code)
@@ -0,0 +1,88 @@
+import os
+import random
+import time
+import pytest
+from animation.registry import get_algorithm
+from animation.trace import TracedArray
+from animation.trace_file import COMPRESSIONS, TraceCache, load_trace, lz4, save_trace
+
+
+def record(name, values):
+    """
+    return the trace of a registered algorithm on the values provided and its recursion depth.
+    :param name: str.
+    :param values: list.
+    :return: tuple (Trace, int).
+    """
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr)
+    return arr.get_trace(), arr.max_depth
+
+
+def get_values(kind, size=500):
+    """
+    return shuffled integers or floats.
+    :param kind: str, "int" or "float".
+    :param size: int.
+    :return: list.
+    """
+    rng = random.Random(1)
+    return [rng.randint(0, size) for _ in range(size)] if kind == "int" else [rng.random() for _ in range(size)]
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+@pytest.mark.parametrize("kind", ["int", "float"])
+@pytest.mark.parametrize("name", ["Heap Sort", "Merge Sort", "External Merge Sort"])
+def test_trace_file_round_trip(tmp_path, compression, kind, name):
+    if compression == "lz4" and lz4 is None:
+        pytest.skip("LZ4 compression needs the lz4 package")
+    values = get_values(kind)
+    trace, max_depth = record(name, values)
+    path = str(tmp_path / "sort.trace")
+    save_trace(trace, path, compression, max_depth)
+    loaded = load_trace(path)
+    assert len(loaded) == len(trace)
+    assert list(loaded) == list(trace)
+    assert list(loaded.get_initial()) == values
+    assert [tuple(mark) for mark in loaded.get_worker_marks()] == [tuple(mark) for mark in trace.get_worker_marks()]
+    assert loaded.get_max_depth() == max_depth
+    replayed = list(loaded.get_initial())
+    loaded.apply(replayed)
+    assert replayed == sorted(values)
+
+
+def test_trace_cache_hit_and_version(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    values = get_values("int")
+    assert cache.get("Quick Sort", values) is None
+    trace, max_depth = record("Quick Sort", values)
+    cache.put("Quick Sort", values, trace, max_depth)
+    cached = cache.get("Quick Sort", values)
+    assert cached is not None and list(cached) == list(trace)
+    assert cache.get("Heap Sort", values) is None
+    algorithm = get_algorithm("Quick Sort")
+    version = algorithm.get_version()
+    try:
+        # a change of the code of the algorithm makes its old traces unreachable.
+        algorithm.version = "changed"
+        assert cache.get("Quick Sort", values) is None
+    finally:
+        algorithm.version = version
+
+
+def test_trace_cache_evicts_least_recently_used(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    inputs = [get_values("int")[start:] for start in range(4)]
+    for age, values in enumerate(inputs):
+        path = cache.put("Heap Sort", values, record("Heap Sort", values)[0])
+        # the traces are stored a minute apart, the first one is the oldest.
+        os.utime(path, (time.time() - 600 + 60 * age,) * 2)
+    total = sum(size for _, size, _ in cache.get_files())
+    # the first trace is used again, so the second one becomes the oldest.
+    assert cache.get("Heap Sort", inputs[0]) is not None
+    cache.max_bytes = total - 1
+    assert cache.evict() == 1
+    assert [cache.get("Heap Sort", values) is not None for values in inputs] == [True, False, True, True]
+    cache.max_bytes = 0
+    cache.evict()
+    assert cache.get_files() == []
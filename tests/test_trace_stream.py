@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+import random
+import signal
+import time
+import pytest
+from animation.registry import get_algorithm
+from animation.trace import Trace, TracedArray
+from animation.trace_stream import TraceRecorder, TraceStream, append_records, stop_worker
+
+# the most seconds a worker process may take to sort the values of a test.
+RECORD_TIMEOUT = 60
+
+
+def start_child_and_wait(pids):
+    """
+    This function runs in a worker process: it handles SIGTERM like a recording worker, starts a process of its own
+    (like the pool of a parallel algorithm) and waits to be stopped.
+    :param pids: multiprocessing.Queue, receives the process id of the child.
+    :return: None.
+    """
+    signal.signal(signal.SIGTERM, stop_worker)
+    child = multiprocessing.get_context("spawn").Process(target=time.sleep, args=(RECORD_TIMEOUT,))
+    child.start()
+    pids.put(child.pid)
+    time.sleep(RECORD_TIMEOUT)
+
+
+def record_in_worker(name, values):
+    """
+    record a registered algorithm in a worker process and wait for all its operations.
+    :param name: str.
+    :param values: list.
+    :return: TraceRecorder, stopped.
+    """
+    recorder = TraceRecorder(name, values)
+    recorder.start()
+    deadline = time.perf_counter() + RECORD_TIMEOUT
+    try:
+        while not recorder.is_finished():
+            assert time.perf_counter() < deadline, f"{name} did not finish in {RECORD_TIMEOUT} s"
+            recorder.poll()
+            time.sleep(0.001)
+        recorder.poll()
+    finally:
+        recorder.stop()
+    return recorder
+
+
+@pytest.mark.parametrize("name", ["Quick Sort", "Bucket Sort", "External Merge Sort"])
+@pytest.mark.parametrize("kind", ["int", "float"])
+def test_streamed_trace_matches_recorded_trace(name, kind):
+    rng = random.Random(2)
+    values = [rng.randint(0, 1000) if kind == "int" else rng.random() for _ in range(2000)]
+    recorder = record_in_worker(name, values)
+    arr = TracedArray(list(values))
+    get_algorithm(name).get_function()(arr)
+    expected = arr.get_trace()
+    streamed = recorder.get_trace()
+    assert recorder.get_error() is None
+    assert list(streamed) == list(expected)
+    assert streamed.get_worker_marks() == expected.get_worker_marks()
+    assert recorder.get_max_depth() == arr.max_depth
+
+
+def test_streamed_error_is_reported():
+    recorder = record_in_worker("Radix Sort", [0.5, 0.25, 1.0])
+    assert recorder.has_failed()
+    assert recorder.get_error() == "ValueError: Radix sort can only sort integers"
+
+
+@pytest.mark.parametrize("name", ["Parallel Merge Sort", "Parallel Sample Sort"])
+def test_streamed_worker_operations_keep_their_marks(name):
+    rng = random.Random(3)
+    values = [rng.randint(0, 1000) for _ in range(3000)]
+    expected = TracedArray(list(values))
+    get_algorithm(name).get_function()(expected, 2)
+    # the stream holds the whole trace, so it is written and read in this process without waiting.
+    stream = TraceStream(capacity=len(expected.get_trace()) * 2)
+    get_algorithm(name).get_function()(TracedArray(list(values), stream), 2)
+    stream.flush()
+    streamed = Trace(values)
+    append_records(streamed, stream.take_records(stream.capacity))
+    assert list(streamed) == list(expected.get_trace())
+    assert streamed.get_worker_marks() == expected.get_trace().get_worker_marks()
+
+
+def test_stopped_worker_stops_its_children():
+    context = multiprocessing.get_context("spawn")
+    pids = context.Queue()
+    worker = context.Process(target=start_child_and_wait, args=(pids,))
+    worker.start()
+    pid = pids.get(timeout=RECORD_TIMEOUT)
+    worker.terminate()
+    worker.join(RECORD_TIMEOUT)
+    assert worker.exitcode == 128 + signal.SIGTERM
+    # the worker waited for its child, so the child is gone rather than left running or unreaped.
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)